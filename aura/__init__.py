@@ -1,3 +1,7 @@
 """Aura Frame Downloader package."""
 
 __version__ = "2.0.0"
+
+from .core import Downloader, DownloadPlan, download_photos_from_aura  # noqa: E402
+
+__all__ = ['Downloader', 'DownloadPlan', 'download_photos_from_aura']
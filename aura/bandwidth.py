@@ -0,0 +1,255 @@
+"""Byte-rate limit on downloads, shared by every transfer and optionally following a schedule."""
+
+import datetime
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import FrozenSet, List, Optional, Tuple
+
+from .estimate import format_bytes
+
+LOGGER = logging.getLogger(__name__)
+
+UNLIMITED = 'unlimited'
+DAYS = ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
+# How often the schedule (and a watched schedule file) is re-checked
+CHECK_INTERVAL = 1.0
+
+_UNITS = {'': 1, 'k': 1024, 'm': 1024 ** 2, 'g': 1024 ** 3}
+_RATE_RE = re.compile(r'^(\d+(?:\.\d+)?)\s*([kmg]?)(?:i?b)?(?:/s)?$')
+_RULE_RE = re.compile(
+    r'^(?:(?P<days>[a-z]+(?:-[a-z]+)?)\s+)?'
+    r'(?P<start>\d{1,2}:\d{2})-(?P<end>\d{1,2}:\d{2})\s*=\s*(?P<rate>.+)$'
+)
+
+
+def parse_rate(text: str) -> Optional[float]:
+    """
+    Parse a rate such as '2M', '500K', '1.5MB/s' or 'unlimited'.
+
+    Units are binary (1M = 1024 * 1024 bytes per second).
+
+    Returns:
+        Bytes per second, or None for unlimited
+
+    Raises:
+        ValueError: If the rate is malformed
+    """
+    text = text.strip().lower()
+    if text in (UNLIMITED, 'none', 'off'):
+        return None
+    match = _RATE_RE.match(text)
+    if not match or float(match.group(1)) <= 0:
+        raise ValueError(f"Invalid rate '{text}', expected e.g. 500K, 2M or unlimited")
+    return float(match.group(1)) * _UNITS[match.group(2)]
+
+
+def format_rate(rate: Optional[float]) -> str:
+    """Format a rate for humans, e.g. '2.0 MB/s' or 'unlimited'."""
+    return UNLIMITED if rate is None else format_bytes(rate) + "/s"
+
+
+def _parse_days(text: Optional[str]) -> FrozenSet[int]:
+    if not text:
+        return frozenset()
+    first, _, last = text.partition('-')
+    if first not in DAYS or (last and last not in DAYS):
+        raise ValueError(f"Invalid days '{text}', expected e.g. mon-fri or sat")
+    start = DAYS.index(first)
+    end = DAYS.index(last) if last else start
+    return frozenset((start + offset) % 7 for offset in range((end - start) % 7 + 1))
+
+
+def _parse_time(text: str) -> int:
+    hours, minutes = (int(part) for part in text.split(':'))
+    if hours > 24 or minutes > 59 or (hours == 24 and minutes):
+        raise ValueError(f"Invalid time '{text}', expected HH:MM")
+    return hours * 60 + minutes
+
+
+@dataclass(frozen=True)
+class _Rule:
+    days: FrozenSet[int]
+    start: int
+    end: int
+    rate: Optional[float]
+
+    def matches(self, when: datetime.datetime) -> bool:
+        minute = when.hour * 60 + when.minute
+        if self.start <= self.end:
+            in_window, day = self.start <= minute < self.end, when.weekday()
+        else:
+            # Wraps past midnight; the early-morning part belongs to the previous day's window
+            in_window = minute >= self.start or minute < self.end
+            day = when.weekday() if minute >= self.start else (when.weekday() - 1) % 7
+        return in_window and (not self.days or day in self.days)
+
+
+class BandwidthSchedule:
+    """
+    Rates that depend on the local time of day and day of the week.
+
+    Written as comma-separated rules, the first matching one applying, plus
+    an optional plain rate used outside every rule (unlimited by default):
+
+        2M                                  always 2 MB/s
+        mon-fri 09:00-18:00=2M              2 MB/s in business hours, otherwise unlimited
+        09:00-18:00=2M, 18:00-23:00=8M, 20M
+    """
+
+    def __init__(self, rules: List[_Rule], default: Optional[float] = None, text: str = ''):
+        self.rules = rules
+        self.default = default
+        self.text = text
+
+    @classmethod
+    def parse(cls, text: str) -> "BandwidthSchedule":
+        """
+        Parse a schedule.
+
+        Raises:
+            ValueError: If the schedule is malformed
+        """
+        rules: List[_Rule] = []
+        default: Optional[float] = None
+        for part in text.lower().split(','):
+            part = part.strip()
+            if not part:
+                continue
+            match = _RULE_RE.match(part)
+            if match:
+                rules.append(_Rule(
+                    _parse_days(match.group('days')),
+                    _parse_time(match.group('start')),
+                    _parse_time(match.group('end')),
+                    parse_rate(match.group('rate')),
+                ))
+            else:
+                default = parse_rate(part)
+        return cls(rules, default, text.strip())
+
+    def rate_at(self, when: datetime.datetime) -> Optional[float]:
+        """Bytes per second allowed at a local time, or None for unlimited."""
+        for rule in self.rules:
+            if rule.matches(when):
+                return rule.rate
+        return self.default
+
+
+class BandwidthLimiter:
+    """
+    Caps the combined download rate of every transfer it is shared with.
+
+    Transfers reserve each chunk they read, and reservations are served in
+    arrival order, so concurrent transfers (and frames) share the rate
+    evenly. The limit can be changed at any time with set_schedule(), or by
+    editing a schedule file given to watch().
+    """
+
+    def __init__(self, schedule: Optional[BandwidthSchedule] = None):
+        """
+        Args:
+            schedule: Rates to apply (defaults to unlimited)
+        """
+        self._schedule = schedule or BandwidthSchedule([])
+        self._lock = threading.Lock()
+        self._rate: Optional[float] = None
+        self._next_slot = 0.0
+        self._checked_at: Optional[float] = None
+        self._watched: Optional[Tuple[str, float]] = None
+
+    @classmethod
+    def parse(cls, text: str) -> "BandwidthLimiter":
+        """
+        Build a limiter from a schedule such as '2M' or 'mon-fri 09:00-18:00=2M'.
+
+        Raises:
+            ValueError: If the schedule is malformed
+        """
+        return cls(BandwidthSchedule.parse(text))
+
+    @property
+    def rate(self) -> Optional[float]:
+        """Bytes per second currently allowed, or None for unlimited."""
+        with self._lock:
+            self._refresh(time.monotonic())
+            return self._rate
+
+    def set_schedule(self, schedule: BandwidthSchedule) -> None:
+        """Replace the schedule (and stop watching a file); takes effect from the next chunk."""
+        with self._lock:
+            self._schedule = schedule
+            self._watched = None
+            self._checked_at = None
+
+    def set_rate(self, rate: Optional[float]) -> None:
+        """Apply a constant rate in bytes per second (None for unlimited) from the next chunk."""
+        self.set_schedule(BandwidthSchedule([], rate, format_rate(rate)))
+
+    def watch(self, path: str) -> None:
+        """
+        Take the schedule from a file, re-reading it whenever it changes.
+
+        Raises:
+            OSError: If the file can't be read
+            ValueError: If its schedule is malformed
+        """
+        with open(path, 'r') as f:
+            schedule = BandwidthSchedule.parse(f.read())
+        with self._lock:
+            self._schedule = schedule
+            self._watched = (path, os.path.getmtime(path))
+            self._checked_at = None
+
+    def reserve(self, size: int) -> float:
+        """
+        Claim bandwidth for a chunk.
+
+        Args:
+            size: Bytes just received
+
+        Returns:
+            Seconds the caller must wait before reading more
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refresh(now)
+            if self._rate is None:
+                return 0.0
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + size / self._rate
+            return slot - now
+
+    def _refresh(self, now: float) -> None:
+        """Re-evaluate the schedule (and reload a changed file) at most every CHECK_INTERVAL."""
+        if self._checked_at is not None and now - self._checked_at < CHECK_INTERVAL:
+            return
+        self._checked_at = now
+        if self._watched:
+            self._reload(*self._watched)
+
+        rate = self._schedule.rate_at(datetime.datetime.now())
+        if rate != self._rate:
+            LOGGER.info("Bandwidth limit %s", format_rate(rate))
+            self._rate = rate
+            self._next_slot = now
+
+    def _reload(self, path: str, mtime: float) -> None:
+        try:
+            current = os.path.getmtime(path)
+        except OSError as e:
+            LOGGER.warning("Keeping the current bandwidth schedule, can't read %s: %s", path, e)
+            return
+        if current == mtime:
+            return
+        self._watched = (path, current)
+        try:
+            with open(path, 'r') as f:
+                self._schedule = BandwidthSchedule.parse(f.read())
+        except (OSError, ValueError) as e:
+            LOGGER.warning("Keeping the current bandwidth schedule, can't reload %s: %s", path, e)
+            return
+        LOGGER.info("Reloaded bandwidth schedule from %s: %s", path, self._schedule.text or UNLIMITED)
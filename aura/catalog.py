@@ -0,0 +1,255 @@
+"""Local SQLite catalog of frame listings, for answering questions without the network."""
+
+import collections
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .filters import AssetFilter
+
+LOGGER = logging.getLogger(__name__)
+
+CATALOG_FILENAME = 'catalog.sqlite'
+# Bumped whenever the tables change; older catalogs are rebuilt from the next listing
+SCHEMA_VERSION = 2
+
+YEAR = 'year'
+MONTH = 'month'
+UPLOADER = 'uploader'
+TYPE = 'type'
+# Stats groupings, in the order offered to users
+STATS_GROUPS = (YEAR, MONTH, UPLOADER, TYPE)
+
+_TABLES = ('listings', 'assets', 'counts')
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    frame_id TEXT PRIMARY KEY,
+    listed_at REAL NOT NULL,
+    assets INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS assets (
+    frame_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    asset_id TEXT NOT NULL,
+    taken_at TEXT,
+    taken_key TEXT,
+    user_id TEXT,
+    file_name TEXT,
+    video_url TEXT,
+    video_file_name TEXT,
+    has_photo INTEGER NOT NULL,
+    has_video INTEGER NOT NULL,
+    PRIMARY KEY (frame_id, position)
+);
+CREATE INDEX IF NOT EXISTS assets_taken_key ON assets (frame_id, taken_key);
+CREATE TABLE IF NOT EXISTS counts (
+    frame_id TEXT NOT NULL,
+    grouping TEXT NOT NULL,
+    grp TEXT NOT NULL,
+    assets INTEGER NOT NULL,
+    PRIMARY KEY (frame_id, grouping, grp)
+);
+"""
+
+_COLUMNS = (
+    'asset_id', 'taken_at', 'taken_key', 'user_id', 'file_name', 'video_url', 'video_file_name',
+    'has_photo', 'has_video',
+)
+
+
+def default_catalog_path() -> str:
+    """Get the catalog shared by every frame, in ~/.aura."""
+    return os.path.join(os.path.expanduser('~'), '.aura', CATALOG_FILENAME)
+
+
+def _media_type(has_photo: int, has_video: int) -> str:
+    if has_photo and has_video:
+        return 'photo+video'
+    return 'video' if has_video else ('photo' if has_photo else 'none')
+
+
+def _row(frame_id: str, position: int, item: Dict) -> Tuple:
+    taken_at = item.get('taken_at')
+    video_url = item.get('video_url')
+    video_file_name = item.get('video_file_name')
+    return (
+        frame_id,
+        position,
+        str(item.get('id')),
+        taken_at,
+        # Compared with AssetFilter bounds and grouped on, as AssetFilter.matches() does
+        str(taken_at).replace('T', ' ') if taken_at else None,
+        str(item['user_id']) if item.get('user_id') is not None else None,
+        item.get('file_name'),
+        video_url,
+        video_file_name,
+        int(bool(item.get('file_name'))),
+        int(bool(video_url and video_file_name)),
+    )
+
+
+class Catalog:
+    """
+    Indexed copy of the frame listings seen by the downloader.
+
+    Each frame's latest listing replaces its previous one, unless it is
+    unchanged. Counts per STATS_GROUPS grouping are totalled while ingesting,
+    so stats() reads a handful of rows however large the frame. Connections
+    are opened per call, so one Catalog can be shared by accounts syncing in
+    parallel; SQLite serialises their writes.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: SQLite file (defaults to default_catalog_path()); created on first use
+        """
+        self.path = path or default_catalog_path()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=60)
+        try:
+            # WAL lets --stats and --query read while a sync is replacing a listing
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            if connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                for table in _TABLES:
+                    connection.execute(f"DROP TABLE IF EXISTS {table}")
+                connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            connection.executescript(_SCHEMA)
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def ingest(self, frame_id: str, assets: List[Dict]) -> int:
+        """
+        Replace a frame's catalogued listing.
+
+        Returns:
+            Number of assets stored
+        """
+        started = time.monotonic()
+        counts: Dict[str, collections.Counter] = {grouping: collections.Counter() for grouping in STATS_GROUPS}
+        digest = hashlib.sha1()
+        for position, item in enumerate(assets):
+            row = _row(frame_id, position, item)
+            digest.update(repr(row).encode())
+            taken_at, user_id = row[4], row[5]
+            counts[YEAR][taken_at[:4] if taken_at else 'unknown'] += 1
+            counts[MONTH][taken_at[:7] if taken_at else 'unknown'] += 1
+            counts[UPLOADER][user_id or 'unknown'] += 1
+            counts[TYPE][_media_type(row[9], row[10])] += 1
+        fingerprint = digest.hexdigest()
+
+        with self._connect() as connection:
+            previous = connection.execute(
+                "SELECT fingerprint FROM listings WHERE frame_id = ?", (frame_id,)
+            ).fetchone()
+            if previous and previous[0] == fingerprint:
+                connection.execute("UPDATE listings SET listed_at = ? WHERE frame_id = ?", (time.time(), frame_id))
+                LOGGER.debug("Listing of frame %s is unchanged in the catalog", frame_id)
+                return len(assets)
+
+            for table in ('assets', 'counts'):
+                connection.execute(f"DELETE FROM {table} WHERE frame_id = ?", (frame_id,))
+            connection.executemany(
+                "INSERT INTO assets (frame_id, position, " + ", ".join(_COLUMNS) + ") "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (_row(frame_id, position, item) for position, item in enumerate(assets)),
+            )
+            connection.executemany(
+                "INSERT INTO counts (frame_id, grouping, grp, assets) VALUES (?, ?, ?, ?)",
+                (
+                    (frame_id, grouping, group, number)
+                    for grouping, counter in counts.items() for group, number in counter.items()
+                ),
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO listings (frame_id, listed_at, assets, fingerprint) VALUES (?, ?, ?, ?)",
+                (frame_id, time.time(), len(assets), fingerprint),
+            )
+        LOGGER.debug("Catalogued %i assets of frame %s in %.2fs", len(assets), frame_id, time.monotonic() - started)
+        return len(assets)
+
+    def listed_at(self, frame_id: str) -> Optional[float]:
+        """When a frame was last catalogued (a Unix time), or None if it never was."""
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT listed_at FROM listings WHERE frame_id = ?", (frame_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def stats(self, frame_id: str, by: str) -> List[Tuple[str, int]]:
+        """
+        Count a frame's assets per group.
+
+        Args:
+            frame_id: ID of the frame
+            by: One of STATS_GROUPS
+
+        Returns:
+            (group, count) pairs sorted by group
+
+        Raises:
+            ValueError: If the grouping is unknown
+        """
+        if by not in STATS_GROUPS:
+            raise ValueError(f"Unknown grouping '{by}', expected one of: {', '.join(STATS_GROUPS)}")
+        with self._connect() as connection:
+            return connection.execute(
+                "SELECT grp, assets FROM counts WHERE frame_id = ? AND grouping = ? ORDER BY grp",
+                (frame_id, by),
+            ).fetchall()
+
+    def query(self, frame_id: str, asset_filter: Optional[AssetFilter] = None) -> List[Dict]:
+        """
+        Get a frame's assets matching a filter, in listing order.
+
+        The filter has the same meaning as for a download, limit included.
+
+        Returns:
+            Asset dictionaries with the listing's id, taken_at, user_id, file_name,
+            video_url and video_file_name fields; taken_at is as the API listed it
+        """
+        asset_filter = asset_filter or AssetFilter()
+        clauses = ["frame_id = ?"]
+        params: List = [frame_id]
+        if asset_filter.since:
+            clauses.append("taken_key >= ?")
+            params.append(asset_filter.since)
+        if asset_filter.until:
+            clauses.append("substr(taken_key, 1, ?) <= ?")
+            params.extend((len(asset_filter.until), asset_filter.until))
+        if asset_filter.uploaders:
+            clauses.append(f"user_id IN ({', '.join('?' * len(asset_filter.uploaders))})")
+            params.extend(asset_filter.uploaders)
+        if asset_filter.photos_only:
+            clauses.append("has_photo")
+        if asset_filter.videos_only:
+            clauses.append("has_video")
+        sql = (
+            "SELECT asset_id, taken_at, user_id, file_name, video_url, video_file_name FROM assets "
+            f"WHERE {' AND '.join(clauses)} ORDER BY position"
+        )
+        if asset_filter.limit is not None:
+            sql += " LIMIT ?"
+            params.append(asset_filter.limit)
+
+        with self._connect() as connection:
+            rows = connection.execute(sql, params).fetchall()
+        return [
+            {
+                'id': asset_id, 'taken_at': taken_at, 'user_id': user_id, 'file_name': file_name,
+                'video_url': video_url, 'video_file_name': video_file_name,
+            }
+            for asset_id, taken_at, user_id, file_name, video_url, video_file_name in rows
+        ]
@@ -0,0 +1,226 @@
+"""Self-tuning limit on the number of transfers in flight at once."""
+
+import logging
+import threading
+import time
+from typing import Dict, Optional, Union
+
+from .exceptions import ConfigError
+
+LOGGER = logging.getLogger(__name__)
+
+AUTO = 'auto'
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+class ConcurrencyController:
+    """
+    Gate on in-flight transfers whose limit follows the observed throughput.
+
+    Completed transfers are totalled over windows of `window` seconds. After
+    each window the controller:
+
+    - halves the limit when the error rate exceeds `max_error_rate`
+    - steps down when transfers take `latency_factor` times longer than the
+      fastest window seen
+    - steps back down when the last step up didn't raise aggregate bytes/sec
+      by at least `min_gain`
+    - otherwise steps up, as long as a transfer had to wait for a slot, so
+      the limit rather than the Throttle or the caller held transfers back
+
+    After backing off it holds for `hold_windows` windows before probing again,
+    doubling the hold each time it has to back off without a successful step
+    up in between, so a limit that keeps failing is retried less and less often.
+
+    With minimum == maximum the limit is fixed. One controller is shared by
+    every frame synced with the same account, like the Throttle.
+    """
+
+    def __init__(
+        self,
+        minimum: int = 1,
+        maximum: int = DEFAULT_MAX_CONCURRENCY,
+        initial: Optional[int] = None,
+        window: float = 10.0,
+        min_samples: int = 4,
+        min_gain: float = 0.1,
+        latency_factor: float = 2.0,
+        max_error_rate: float = 0.2,
+        hold_windows: int = 6,
+    ):
+        """
+        Args:
+            minimum: Lowest limit the controller backs off to
+            maximum: Highest limit it probes up to
+            initial: Starting limit (defaults to minimum)
+            window: Seconds of completed transfers judged at a time
+            min_samples: Completed transfers a window needs before it is judged
+            min_gain: Fraction by which a step up must raise throughput to be kept
+            latency_factor: Latency growth, relative to the fastest window, that triggers a step down
+            max_error_rate: Fraction of failed transfers that triggers halving the limit
+            hold_windows: Windows to stay put after first backing off before probing again
+        """
+        if minimum < 1 or maximum < minimum:
+            raise ConfigError(f"Invalid concurrency range {minimum}-{maximum}")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.window = window
+        self.min_samples = min_samples
+        self.min_gain = min_gain
+        self.latency_factor = latency_factor
+        self.max_error_rate = max_error_rate
+        self.hold_windows = hold_windows
+
+        self._limit = min(max(initial or minimum, minimum), maximum)
+        self._in_flight = 0
+        self._condition = threading.Condition()
+        self._throughput: Dict[int, float] = {}
+        self._fastest_latency: Optional[float] = None
+        self._probed = False
+        self._hold = 0
+        self._backoffs = 0
+        self._reset_window()
+
+    @classmethod
+    def fixed(cls, limit: int) -> "ConcurrencyController":
+        """Get a controller that always allows exactly `limit` transfers in flight."""
+        return cls(minimum=limit, maximum=limit)
+
+    @property
+    def limit(self) -> int:
+        """Current number of transfers allowed in flight."""
+        return self._limit
+
+    @property
+    def adaptive(self) -> bool:
+        """True if the limit is tuned at runtime."""
+        return self.minimum != self.maximum
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Claim an in-flight slot.
+
+        Args:
+            timeout: Seconds to wait for a slot (None waits indefinitely)
+
+        Returns:
+            True once a slot is claimed, False if the timeout elapsed first
+        """
+        with self._condition:
+            if self._in_flight >= self._limit:
+                self._contended = True
+            if not self._condition.wait_for(lambda: self._in_flight < self._limit, timeout):
+                return False
+            self._in_flight += 1
+            return True
+
+    def release(self) -> None:
+        """Give back a slot claimed with acquire()."""
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def record(self, size: int, seconds: float, ok: bool = True) -> None:
+        """
+        Account for a finished transfer, re-tuning the limit when a window is complete.
+
+        Args:
+            size: Bytes transferred
+            seconds: Time the transfer took
+            ok: False if the transfer failed
+        """
+        with self._condition:
+            self._bytes += size
+            self._seconds += seconds
+            self._samples += 1
+            if not ok:
+                self._errors += 1
+            elapsed = time.monotonic() - self._started
+            if self.adaptive and elapsed >= self.window and self._samples >= self.min_samples:
+                self._adjust(elapsed)
+
+    def restart_window(self) -> None:
+        """Discard the window in progress, e.g. after a pause that would read as a throughput drop."""
+        with self._condition:
+            self._reset_window()
+
+    def _reset_window(self) -> None:
+        self._started = time.monotonic()
+        self._bytes = 0
+        self._seconds = 0.0
+        self._samples = 0
+        self._errors = 0
+        self._contended = False
+
+    def _adjust(self, elapsed: float) -> None:
+        limit = self._limit
+        throughput = self._bytes / elapsed
+        latency = self._seconds / self._samples
+        error_rate = self._errors / self._samples
+        saturated = self._contended
+        LOGGER.debug(
+            "Concurrency %i: %.0f bytes/s, %.2fs per transfer, %.0f%% errors over %i transfers",
+            limit, throughput, latency, error_rate * 100, self._samples,
+        )
+
+        new_limit, reason = limit, None
+        if error_rate > self.max_error_rate:
+            new_limit = max(limit // 2, self.minimum)
+            reason = f"error rate {error_rate:.0%}"
+        elif self._fastest_latency and latency > self._fastest_latency * self.latency_factor:
+            new_limit = max(limit - 1, self.minimum)
+            reason = f"latency rose to {latency:.2f}s from {self._fastest_latency:.2f}s"
+        elif self._probed and throughput < self._throughput.get(limit - 1, 0) * (1 + self.min_gain):
+            new_limit = limit - 1
+            reason = (
+                f"{throughput / 1024:.0f} KB/s is no better than "
+                f"{self._throughput[limit - 1] / 1024:.0f} KB/s at {limit - 1}"
+            )
+
+        if reason is not None:
+            self._hold = self.hold_windows * 2 ** min(self._backoffs, 5)
+            self._backoffs += 1
+        else:
+            if self._probed:
+                # The last step up paid off
+                self._backoffs = 0
+            if self._hold:
+                self._hold -= 1
+            elif saturated and limit < self.maximum:
+                new_limit = limit + 1
+                reason = f"probing up from {throughput / 1024:.0f} KB/s"
+
+        self._throughput[limit] = throughput
+        if error_rate <= self.max_error_rate:
+            # Let the reference drift up slowly so a shift towards larger files isn't read as congestion
+            self._fastest_latency = min(latency, (self._fastest_latency or latency) * 1.05)
+        self._probed = new_limit > limit
+
+        if new_limit != limit:
+            LOGGER.info("Concurrency %i -> %i: %s", limit, new_limit, reason)
+            self._limit = new_limit
+            self._condition.notify_all()
+        self._reset_window()
+
+
+def parse_concurrency(text: Union[str, int]) -> ConcurrencyController:
+    """
+    Build a controller from a --concurrency value.
+
+    Args:
+        text: 'auto' for a self-tuning limit of 1 to DEFAULT_MAX_CONCURRENCY,
+            'auto:N' to tune up to N, or a number for a fixed limit
+
+    Raises:
+        ValueError: If the value is malformed
+    """
+    text = str(text).strip().lower()
+    name, _, maximum = text.partition(':')
+    if name == AUTO:
+        if not maximum:
+            return ConcurrencyController()
+        if maximum.isdigit() and int(maximum) >= 1:
+            return ConcurrencyController(maximum=int(maximum))
+    elif text.isdigit() and int(text) >= 1:
+        return ConcurrencyController.fixed(int(text))
+    raise ValueError(f"Invalid concurrency '{text}', expected 'auto', 'auto:N' or a number of 1 or more")
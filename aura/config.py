@@ -5,6 +5,10 @@ import os
 from typing import Dict, List, Optional
 
 from .exceptions import ConfigError
+from .throttle import parse_interval
+
+DEFAULT_ACCOUNT = 'login'
+ACCOUNT_SECTION_PREFIX = 'account:'
 
 
 def load_config(config_path: str) -> configparser.ConfigParser:
@@ -29,32 +33,83 @@ def load_config(config_path: str) -> configparser.ConfigParser:
     except Exception as e:
         raise ConfigError(f"Error parsing config file '{config_path}': {e}")
 
-    if not config.has_section('login'):
-        raise ConfigError(f"No [login] section found in file '{config_path}'")
+    if not config.has_section(DEFAULT_ACCOUNT) and not get_account_names(config):
+        raise ConfigError(
+            f"No [login] or [{ACCOUNT_SECTION_PREFIX}<name>] section found in file '{config_path}'"
+        )
 
     return config
 
 
-def get_login_credentials(config: configparser.ConfigParser) -> Dict[str, str]:
+def _is_account_section(section: str) -> bool:
+    return section == DEFAULT_ACCOUNT or section.startswith(ACCOUNT_SECTION_PREFIX)
+
+
+def get_account_names(config: configparser.ConfigParser) -> List[str]:
+    """
+    Get the names of the accounts defined in the config.
+
+    The [login] section is the account named 'login'; every
+    [account:<name>] section defines an account called <name>.
+
+    Args:
+        config: ConfigParser object with loaded configuration
+
+    Returns:
+        List of account names
+    """
+    names = []
+    for section in config.sections():
+        if section == DEFAULT_ACCOUNT:
+            names.append(DEFAULT_ACCOUNT)
+        elif section.startswith(ACCOUNT_SECTION_PREFIX):
+            names.append(section[len(ACCOUNT_SECTION_PREFIX):])
+    return names
+
+
+def get_login_credentials(
+    config: configparser.ConfigParser,
+    account: Optional[str] = None,
+) -> Dict[str, str]:
     """
     Extract login credentials from config.
 
     Args:
         config: ConfigParser object with loaded configuration
+        account: Account name; None or 'login' selects the [login] section
 
     Returns:
-        Dictionary with 'email' and 'password' keys
+        Dictionary with 'email' and 'password' keys, plus 'transport' ('http1'
+        or 'http2') and 'delay' (seconds between transfer starts), each None
+        when the account doesn't set it
 
     Raises:
-        ConfigError: If credentials are missing
+        ConfigError: If the account doesn't exist, credentials are missing or
+            the delay is malformed
     """
+    if account is None or account == DEFAULT_ACCOUNT:
+        section = DEFAULT_ACCOUNT
+    else:
+        section = ACCOUNT_SECTION_PREFIX + account
+
+    if not config.has_section(section):
+        raise ConfigError(f"No account [{section}] found in config file")
+
     try:
-        return {
-            'email': config['login']['email'],
-            'password': config['login']['password']
+        credentials = {
+            'email': config[section]['email'],
+            'password': config[section]['password'],
+            'transport': config[section].get('transport'),
         }
     except KeyError as e:
-        raise ConfigError(f"Missing login credential: {e}")
+        raise ConfigError(f"Missing login credential in [{section}]: {e}")
+
+    delay = config[section].get('delay')
+    try:
+        credentials['delay'] = parse_interval(delay) if delay is not None else None
+    except ValueError as e:
+        raise ConfigError(f"[{section}]: {e}")
+    return credentials
 
 
 def get_frame_config(config: configparser.ConfigParser, frame_name: str) -> Dict[str, str]:
@@ -66,7 +121,9 @@ def get_frame_config(config: configparser.ConfigParser, frame_name: str) -> Dict
         frame_name: Name of the frame section in the config
 
     Returns:
-        Dictionary with 'frame_id' and 'file_path' keys
+        Dictionary with 'frame_id' and 'file_path' keys (file_path may be an
+        s3://bucket/prefix location), plus 'layout' and 's3_endpoint_url' (None
+        when the frame doesn't set them) and 'account' (defaults to 'login')
 
     Raises:
         ConfigError: If frame section doesn't exist or is missing required fields
@@ -77,7 +134,10 @@ def get_frame_config(config: configparser.ConfigParser, frame_name: str) -> Dict
     try:
         return {
             'frame_id': config[frame_name]['frame_id'],
-            'file_path': config[frame_name]['file_path']
+            'file_path': config[frame_name]['file_path'],
+            'layout': config[frame_name].get('layout'),
+            's3_endpoint_url': config[frame_name].get('s3_endpoint_url'),
+            'account': config[frame_name].get('account', DEFAULT_ACCOUNT),
         }
     except KeyError as e:
         raise ConfigError(f"Missing frame configuration: {e}")
@@ -85,7 +145,7 @@ def get_frame_config(config: configparser.ConfigParser, frame_name: str) -> Dict
 
 def get_frame_names(config: configparser.ConfigParser) -> List[str]:
     """
-    Get list of frame names from config (all sections except 'login').
+    Get list of frame names from config (all sections except account sections).
 
     Args:
         config: ConfigParser object with loaded configuration
@@ -93,7 +153,7 @@ def get_frame_names(config: configparser.ConfigParser) -> List[str]:
     Returns:
         List of frame section names
     """
-    return [section for section in config.sections() if section != 'login']
+    return [section for section in config.sections() if not _is_account_section(section)]
 
 
 def get_default_config_path() -> str:
@@ -1,42 +1,303 @@
 """Core download logic for Aura Frame Downloader."""
 
+import heapq
 import json
 import logging
 import os
-import shutil
+import re
+import sqlite3
+import threading
 import time
-from typing import Callable, Dict, List, Optional, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlparse
 
 import requests
 
 from .exceptions import (
+    AuraError,
+    ConfigError,
     DownloadCancelledError,
     DownloadError,
     LoginError,
     NoAssetsError,
 )
+from . import events as ev
+from .bandwidth import BandwidthLimiter
+from .catalog import Catalog
+from .concurrency import AUTO, ConcurrencyController, parse_concurrency
+from .estimate import DEFAULT_HEAD_WORKERS, build_estimate, fetch_sizes, free_space, measure_throughput
+from .filters import AssetFilter
+from .journal import FailureJournal
+from .layout import asset_filename, asset_key, migrate_layout, resolve_layout
+from .postprocess import PostProcessor
+from .retry import CircuitBreaker, RetryPolicy, is_transient_error
+from .shard import asset_in_shard, format_shard
+from .storage import ExistingIndex, StorageBackend, open_storage
+from .summary import DownloadSummary, Estimate, FailedTransfer
+from .throttle import Throttle
+from .transport import new_session
+from .writer import FSYNC_NONE, DiskWriter, WriteHandle
 
 LOGGER = logging.getLogger(__name__)
+# Per-item progress lines, so they can be silenced without losing warnings and totals
+ITEM_LOGGER = logging.getLogger(__name__ + '.items')
 
 # API URLs
 LOGIN_URL = "https://api.pushd.com/v5/login.json"
 FRAME_URL_TEMPLATE = "https://api.pushd.com/v5/frames/{frame_id}/assets.json?side_load_users=false"
 IMAGE_URL_TEMPLATE = "https://imgproxy.pushd.com/{user_id}/{file_name}"
 
+# Transfer tuning
+CHUNK_SIZE = 64 * 1024
+POLL_INTERVAL = 0.2
+DOWNLOAD_DELAY = 2
 
-def create_session(email: str, password: str) -> requests.Session:
+
+@dataclass
+class _Transfer:
+    """A single photo or video component queued for download; path is its storage key."""
+
+    index: int
+    asset_id: str
+    label: str
+    url: str
+    path: str
+    taken_at: Optional[str] = None
+    attempts: int = 0
+    started: float = 0.0
+    paused: float = 0.0
+    seconds: float = 0.0
+
+    def failure(self, error: Exception) -> FailedTransfer:
+        """Describe this transfer as a permanent failure."""
+        return FailedTransfer(
+            asset_id=self.asset_id,
+            component=self.label,
+            url=self.url,
+            path=self.path,
+            error=type(error).__name__,
+            message=str(error),
+            attempts=self.attempts,
+        )
+
+
+def _raise_if_cancelled(cancel_check: Optional[Callable[[], bool]]) -> None:
+    """Raise DownloadCancelledError if cancel_check reports a cancellation."""
+    if cancel_check and cancel_check():
+        LOGGER.info("Download cancelled by user")
+        raise DownloadCancelledError("Download cancelled by user")
+
+
+def _wait_while_paused(
+    cancel_check: Optional[Callable[[], bool]] = None,
+    pause_check: Optional[Callable[[], bool]] = None,
+) -> float:
+    """
+    Block for as long as pause_check reports a pause.
+
+    Returns:
+        Seconds spent paused (0 if there was no pause)
+
+    Raises:
+        DownloadCancelledError: If the download is cancelled while paused
+    """
+    _raise_if_cancelled(cancel_check)
+    if not (pause_check and pause_check()):
+        return 0.0
+
+    LOGGER.info("Download paused")
+    started = time.monotonic()
+    while pause_check():
+        time.sleep(POLL_INTERVAL)
+        _raise_if_cancelled(cancel_check)
+    LOGGER.info("Download resumed")
+    return time.monotonic() - started
+
+
+def _wait(
+    seconds: float,
+    cancel_check: Optional[Callable[[], bool]] = None,
+    pause_check: Optional[Callable[[], bool]] = None,
+) -> float:
+    """
+    Sleep for the given number of seconds, polling for cancellation and pause.
+
+    Returns:
+        Seconds of the wait spent paused
+
+    Raises:
+        DownloadCancelledError: If the download is cancelled during the wait
+    """
+    deadline = time.monotonic() + seconds
+    paused = 0.0
+    while True:
+        paused += _wait_while_paused(cancel_check, pause_check)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return paused
+        time.sleep(min(POLL_INTERVAL, remaining))
+
+
+def _copy_stream(
+    source,
+    handle: WriteHandle,
+    cancel_check: Optional[Callable[[], bool]] = None,
+    pause_check: Optional[Callable[[], bool]] = None,
+    bandwidth: Optional[BandwidthLimiter] = None,
+) -> bool:
+    """
+    Hand a response body to the writer in chunks, at no more than the bandwidth limit.
+
+    Returns:
+        True if the copy stopped early because of a pause, False when complete
+
+    Raises:
+        DownloadCancelledError: If the download is cancelled mid-copy
+    """
+    while True:
+        _raise_if_cancelled(cancel_check)
+        if pause_check and pause_check():
+            return True
+        chunk = source.read(CHUNK_SIZE)
+        if not chunk:
+            return False
+        handle.write(chunk)
+        if bandwidth is not None:
+            delay = bandwidth.reserve(len(chunk))
+            if delay:
+                _wait(delay, cancel_check)
+
+
+# Content-Range of a 206 ('bytes 100-199/1000') or a 416 ('bytes */1000')
+_CONTENT_RANGE_RE = re.compile(r'^\s*bytes\s+(?:(\d+)-\d+|\*)/(\d+|\*)\s*$', re.IGNORECASE)
+
+
+def _content_range(response: requests.Response) -> Tuple[Optional[int], Optional[int]]:
+    """Get the first byte and total size a response's Content-Range gives, each None if not given."""
+    match = _CONTENT_RANGE_RE.match(response.headers.get('Content-Range') or '')
+    if not match:
+        return None, None
+    start, total = match.groups()
+    return int(start) if start else None, int(total) if total != '*' else None
+
+
+def _download_to_file(
+    url: str,
+    storage: StorageBackend,
+    key: str,
+    writer: DiskWriter,
+    cancel_check: Optional[Callable[[], bool]] = None,
+    pause_check: Optional[Callable[[], bool]] = None,
+    session: Optional[requests.Session] = None,
+    bandwidth: Optional[BandwidthLimiter] = None,
+    resume_callback: Optional[Callable[[float], None]] = None,
+) -> Future:
+    """
+    Stream a URL into storage, resuming from a partial object if the backend kept one.
+
+    The response body goes straight to the writer, which publishes the object
+    under its key once complete (a renamed .part file locally, a multipart
+    upload on S3). A pause closes the connection but keeps the object open,
+    and the transfer continues with a Range request once resumed;
+    resume_callback, if given, is then called with the seconds spent paused.
+    A resumed response whose Content-Range doesn't continue the partial
+    object, or whose object changed (If-Range, when the server sent a strong
+    ETag), makes the transfer start over rather than splice two bodies.
+
+    If a session is given its connection pool is reused for the request. If a
+    bandwidth limiter is given the body is read no faster than it allows.
+
+    Returns:
+        Future from the writer, resolved once the object is in place
+
+    Raises:
+        DownloadCancelledError: If the download is cancelled; resumable partial data is kept
+        requests.RequestException: If the request fails
+    """
+    offset = storage.partial_size(key)
+    handle = None
+    etag = None
+    try:
+        while True:
+            if handle is not None:
+                offset = handle.size
+            headers = {}
+            if offset:
+                headers['Range'] = f'bytes={offset}-'
+                if etag:
+                    # The server sends the whole object instead if it changed since
+                    headers['If-Range'] = etag
+                LOGGER.debug("Resuming %s at byte %i", os.path.basename(key), offset)
+
+            response = (session or requests).get(url, stream=True, timeout=90, headers=headers)
+            try:
+                if offset and response.status_code == 416:
+                    start_over = _content_range(response)[1] != offset
+                    if not start_over:
+                        # The partial object already holds the whole body
+                        paused = False
+                else:
+                    response.raise_for_status()
+                    # A 200 means the server ignored the Range header (or If-Range found a new object)
+                    start_over = bool(offset) and (
+                        response.status_code != 206 or _content_range(response)[0] != offset
+                    )
+                if start_over:
+                    LOGGER.debug(
+                        "Partial %s doesn't match the server's object (%i), starting over",
+                        os.path.basename(key), response.status_code,
+                    )
+                    offset = 0
+                    if handle is not None:
+                        handle.close().exception()
+                        handle = None
+                    if response.status_code != 200:
+                        continue
+                if response.status_code != 416:
+                    tag = response.headers.get('ETag')
+                    if tag and not tag.startswith('W/'):
+                        # If-Range only accepts strong validators
+                        etag = tag
+                    if handle is None:
+                        handle = writer.open(storage, key, offset)
+                    paused = _copy_stream(response.raw, handle, cancel_check, pause_check, bandwidth)
+            finally:
+                response.close()
+
+            if not paused:
+                break
+            seconds = _wait_while_paused(cancel_check, pause_check)
+            if resume_callback:
+                resume_callback(seconds)
+
+        if handle is None:
+            handle = writer.open(storage, key, offset)
+    except BaseException:
+        if handle is not None:
+            # Let queued chunks land so a retry resumes after them
+            handle.close().exception()
+        raise
+
+    return handle.commit()
+
+
+def create_session(email: str, password: str, transport: Optional[str] = None) -> requests.Session:
     """
     Create an authenticated session with the Aura API.
 
     Args:
         email: User's email address
         password: User's password
+        transport: 'http1' (the default) or 'http2'; see aura.transport
 
     Returns:
         Authenticated requests.Session object
 
     Raises:
         LoginError: If authentication fails
+        ConfigError: If the transport is unknown or unavailable
     """
     login_payload = {
         "identifier_for_vendor": "does-not-matter",
@@ -49,7 +310,7 @@ def create_session(email: str, password: str) -> requests.Session:
         }
     }
 
-    session = requests.Session()
+    session = new_session(transport)
     response = session.post(LOGIN_URL, json=login_payload)
 
     if response.status_code != 200:
@@ -101,6 +362,861 @@ def get_frame_assets(
     return json_data["assets"]
 
 
+class _TransferRunner:
+    """Runs transfers, re-queueing transient failures and journaling permanent ones."""
+
+    def __init__(
+        self,
+        summary: DownloadSummary,
+        journal: FailureJournal,
+        storage: StorageBackend,
+        retry_policy: Optional[RetryPolicy] = None,
+        progress_callback: Optional[Callable[[int, int, str], None]] = None,
+        cancel_check: Optional[Callable[[], bool]] = None,
+        pause_check: Optional[Callable[[], bool]] = None,
+        throttle: Optional[Throttle] = None,
+        media_session: Optional[requests.Session] = None,
+        post_processor: Optional[PostProcessor] = None,
+        writer: Optional[DiskWriter] = None,
+        fsync: str = FSYNC_NONE,
+        events: Optional[ev.EventSink] = None,
+        existing: Optional[ExistingIndex] = None,
+        concurrency: Optional[ConcurrencyController] = None,
+        bandwidth: Optional[BandwidthLimiter] = None,
+    ):
+        self.summary = summary
+        self.journal = journal
+        self.storage = storage
+        self.existing = existing or ExistingIndex(storage)
+        self.policy = retry_policy or RetryPolicy()
+        self.progress_callback = progress_callback
+        self.cancel_check = cancel_check
+        self.pause_check = pause_check
+        self.throttle = throttle or Throttle(DOWNLOAD_DELAY)
+        self.media_session = media_session or requests.Session()
+        self.post_processor = post_processor
+        self.events = events
+        self.concurrency = concurrency or ConcurrencyController.fixed(1)
+        self.bandwidth = bandwidth
+        self._owns_writer = writer is None
+        self.writer = writer or DiskWriter(fsync=fsync)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._stopping = False
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._retry_queue: List[Tuple[float, int, _Transfer]] = []
+        self._fetches: List[Tuple[Future, _Transfer, CircuitBreaker, bool]] = []
+        self._commits: List[Tuple[Future, _Transfer]] = []
+
+    def wait_while_paused(self) -> None:
+        """Block while paused, raising DownloadCancelledError on cancellation."""
+        self._resumed(_wait_while_paused(self.cancel_check, self.pause_check))
+
+    def wait(self, seconds: float) -> None:
+        """Sleep, blocking while paused and raising DownloadCancelledError on cancellation."""
+        self._resumed(_wait(seconds, self.cancel_check, self.pause_check))
+
+    def _resumed(self, paused: float) -> None:
+        if paused:
+            # Throughput measured across a pause says nothing about the limit
+            self.concurrency.restart_window()
+
+    def report_progress(self, current: int, filename: str) -> None:
+        """Forward a progress update to the caller's callback."""
+        if self.progress_callback:
+            self.progress_callback(current, self.summary.total, filename)
+
+    def emit(self, event: str, **fields: Any) -> None:
+        """Send an event to the caller's event sink, if any."""
+        if self.events:
+            self.events.emit(event, **fields)
+
+    def fail(self, failure: FailedTransfer) -> None:
+        """Record a permanent failure."""
+        self.summary.failed.append(failure)
+        self.journal.record(failure)
+        self.emit(
+            ev.TRANSFER_DONE, asset_id=failure.asset_id, component=failure.component, key=failure.path,
+            ok=False, error=failure.error, message=failure.message, attempts=failure.attempts,
+        )
+
+    def skip(self, transfer: _Transfer) -> None:
+        """Count a transfer whose file is already present."""
+        self.summary.skipped += 1
+        self.journal.resolve(transfer.asset_id, transfer.label)
+        self.emit(
+            ev.SKIP, index=transfer.index, asset_id=transfer.asset_id,
+            component=transfer.label, key=transfer.path,
+        )
+
+    def _cancelled(self) -> bool:
+        return self._stopping or bool(self.cancel_check and self.cancel_check())
+
+    def _acquire_slot(self) -> None:
+        """Wait for an in-flight slot, handling finished transfers meanwhile."""
+        while not self.concurrency.acquire(timeout=POLL_INTERVAL):
+            self.wait_while_paused()
+            self.collect_fetches()
+
+    def attempt(self, transfer: _Transfer) -> None:
+        """Start one attempt of a transfer; its network part runs on the transfer pool."""
+        host = urlparse(transfer.url).netloc
+        breaker = self._breakers.setdefault(host, CircuitBreaker(host))
+        while not breaker.allow():
+            # Open, or half-open with the trial still in flight; its outcome is recorded by collect_fetches()
+            self.wait(breaker.remaining() or POLL_INTERVAL)
+            self.collect_fetches()
+        trial = breaker.is_open
+
+        # Throttle first, so the concurrency limit only sees transfers held back by the limit itself
+        self.wait(self.throttle.reserve())
+        self._acquire_slot()
+
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.concurrency.maximum,
+                thread_name_prefix=threading.current_thread().name + "-transfer",
+            )
+        transfer.attempts += 1
+        transfer.started = time.monotonic()
+        transfer.paused = 0.0
+        self.emit(
+            ev.TRANSFER_START, index=transfer.index, asset_id=transfer.asset_id,
+            component=transfer.label, key=transfer.path, attempt=transfer.attempts,
+        )
+        self._fetches.append((self._pool.submit(self._fetch, transfer), transfer, breaker, trial))
+        self.collect_fetches()
+
+    def _fetch(self, transfer: _Transfer) -> Future:
+        """Stream a transfer to the writer; runs on the transfer pool."""
+        def resumed(paused: float) -> None:
+            transfer.paused += paused
+            self._resumed(paused)
+
+        try:
+            return _download_to_file(
+                transfer.url, self.storage, transfer.path, self.writer,
+                self._cancelled, self.pause_check, self.media_session, self.bandwidth, resumed,
+            )
+        finally:
+            # Time spent paused is not the transfer's latency
+            transfer.seconds = time.monotonic() - transfer.started - transfer.paused
+            self.concurrency.release()
+
+    def collect_fetches(self, block: bool = False) -> None:
+        """
+        Account for attempts whose network part has finished.
+
+        Transient failures are queued for retry and permanent ones journaled.
+
+        Args:
+            block: If True, wait for every attempt in flight
+
+        Raises:
+            DownloadCancelledError: If an attempt was cancelled
+        """
+        pending = []
+        for fetch, transfer, breaker, trial in self._fetches:
+            if not block and not fetch.done():
+                pending.append((fetch, transfer, breaker, trial))
+                continue
+            error = fetch.exception()
+            if error is None:
+                breaker.record_success(trial)
+                self._commits.append((fetch.result(), transfer))
+                continue
+            if isinstance(error, DownloadCancelledError):
+                raise error
+
+            transient = is_transient_error(error)
+            self.concurrency.record(0, transfer.seconds, ok=not transient)
+            if transient:
+                breaker.record_failure(trial)
+            elif trial:
+                # The host answered, if only with a permanent error
+                breaker.record_success(trial)
+            if self.policy.should_retry(error, transfer.attempts):
+                delay = self.policy.delay(transfer.attempts)
+                LOGGER.warning(
+                    "%i: %s %s failed (%s), retry %i/%i in %.0fs",
+                    transfer.index, transfer.label, os.path.basename(transfer.path), error,
+                    transfer.attempts, self.policy.max_attempts - 1, delay,
+                )
+                heapq.heappush(self._retry_queue, (time.monotonic() + delay, transfer.index, transfer))
+                self.emit(
+                    ev.RETRY, index=transfer.index, asset_id=transfer.asset_id, component=transfer.label,
+                    key=transfer.path, attempt=transfer.attempts, delay=round(delay, 1),
+                    error=type(error).__name__, message=str(error),
+                )
+            else:
+                LOGGER.error("Item %i failed to download: %s", transfer.index, str(error))
+                self.fail(transfer.failure(error))
+        self._fetches = pending
+        self.collect_commits()
+
+    def collect_commits(self, block: bool = False) -> None:
+        """
+        Account for files the writer has finished putting in place.
+
+        Args:
+            block: If True, wait for every outstanding file
+        """
+        pending = []
+        for commit, transfer in self._commits:
+            if not block and not commit.done():
+                pending.append((commit, transfer))
+                continue
+            error = commit.exception()
+            if error is not None:
+                LOGGER.error("Item %i failed to write: %s", transfer.index, str(error))
+                self.fail(transfer.failure(error))
+                continue
+            self.summary.downloaded += 1
+            self.existing.add(transfer.path)
+            self.concurrency.record(commit.result(), transfer.seconds)
+            self.emit(
+                ev.TRANSFER_DONE, index=transfer.index, asset_id=transfer.asset_id,
+                component=transfer.label, key=transfer.path, ok=True, attempts=transfer.attempts,
+                bytes=commit.result(), seconds=round(transfer.seconds, 3),
+            )
+            self.journal.resolve(transfer.asset_id, transfer.label)
+            local_path = self.storage.local_path(transfer.path)
+            if self.post_processor and local_path:
+                self.post_processor.submit(local_path, transfer.taken_at)
+        self._commits = pending
+
+    def run_due_retries(self, block: bool = False) -> None:
+        """
+        Attempt queued retries whose backoff has elapsed.
+
+        Args:
+            block: If True, wait for and drain every queued retry
+        """
+        while self._retry_queue:
+            ready_at = self._retry_queue[0][0]
+            if ready_at > time.monotonic():
+                if not block:
+                    return
+                self.wait(ready_at - time.monotonic())
+            _, _, transfer = heapq.heappop(self._retry_queue)
+            basename = os.path.basename(transfer.path)
+            self.report_progress(transfer.index, basename)
+            ITEM_LOGGER.info("%i: Retrying %s %s", transfer.index, transfer.label, basename)
+            self.attempt(transfer)
+
+    def finish(self) -> DownloadSummary:
+        """Wait for transfers in flight, drain the retry queue and report transfers that never succeeded."""
+        while True:
+            self.collect_fetches(block=True)
+            if not self._retry_queue:
+                break
+            self.run_due_retries(block=True)
+        self.collect_commits(block=True)
+
+        if self.summary.failed:
+            LOGGER.warning("%i transfers never succeeded:", len(self.summary.failed))
+            for failure in self.summary.failed:
+                LOGGER.warning(
+                    "  %s %s: %s (%s) after %i attempts",
+                    failure.asset_id, failure.component, failure.error, failure.message, failure.attempts,
+                )
+            LOGGER.warning("Failures were recorded in %s", self.journal.path)
+
+        return self.summary
+
+    def close(self) -> None:
+        """Stop transfers still in flight, then flush and stop the disk writer if this runner created it."""
+        self._stopping = True
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+        if self._owns_writer:
+            self.writer.close()
+
+
+def _retry_journaled_failures(runner: _TransferRunner) -> DownloadSummary:
+    """Retry only the transfers recorded in the failure journal."""
+    entries = runner.journal.entries()
+    runner.summary.total = len(entries)
+    LOGGER.info("Retrying %i journaled failures", len(entries))
+
+    for index, entry in enumerate(entries, 1):
+        runner.wait_while_paused()
+        runner.run_due_retries()
+
+        if not entry.url or not entry.path:
+            # Failed before a URL was known; only a full run can retry it
+            ITEM_LOGGER.info("%i: Skipping asset %s, needs a full run to retry", index, entry.asset_id)
+            continue
+
+        transfer = _Transfer(index, entry.asset_id, entry.component, entry.url, entry.path)
+        basename = os.path.basename(transfer.path)
+        runner.report_progress(index, basename)
+
+        if runner.storage.exists(transfer.path):
+            ITEM_LOGGER.info("%i: Skipping %s %s, already downloaded", index, transfer.label, basename)
+            runner.skip(transfer)
+            continue
+
+        ITEM_LOGGER.info("%i: Downloading %s %s", index, transfer.label, basename)
+        runner.attempt(transfer)
+
+    summary = runner.finish()
+    # Drop the lines of everything retried, resolved or recorded again
+    runner.journal.compact()
+    return summary
+
+
+def _plan_asset(
+    index: int,
+    item: Dict,
+    layout: str,
+    videos_only: bool = False,
+    photos_only: bool = False,
+) -> List[_Transfer]:
+    """
+    Build the transfers for one asset.
+
+    Each asset may have a still image, a video (Live Photo / video clip), or both;
+    a transfer is planned for whichever components are present and selected.
+
+    Raises:
+        KeyError: If the asset lacks a field needed to name its files
+    """
+    clean_time = item['taken_at'].replace(':', '-')
+    transfers = []
+
+    still_name = item.get('file_name')
+    if still_name and not videos_only:
+        still_url = IMAGE_URL_TEMPLATE.format(
+            user_id=item['user_id'],
+            file_name=still_name,
+        )
+        still_filename = asset_filename(clean_time, item['id'], still_name)
+        transfers.append(
+            _Transfer(
+                index, item['id'], 'photo', still_url,
+                asset_key(layout, clean_time, item['id'], still_filename), item['taken_at'],
+            )
+        )
+
+    video_url = item.get('video_url')
+    video_name = item.get('video_file_name')
+    if video_url and video_name and not photos_only:
+        video_filename = asset_filename(clean_time, item['id'], video_name)
+        transfers.append(
+            _Transfer(
+                index, item['id'], 'video', video_url,
+                asset_key(layout, clean_time, item['id'], video_filename), item['taken_at'],
+            )
+        )
+
+    return transfers
+
+
+def _estimate_transfers(
+    transfers: List[_Transfer],
+    storage: StorageBackend,
+    existing: ExistingIndex,
+    media_session: requests.Session,
+    start_interval: float,
+    max_workers: int = DEFAULT_HEAD_WORKERS,
+    cancel_check: Optional[Callable[[], bool]] = None,
+) -> Estimate:
+    """Size up the planned transfers whose files aren't stored yet, without downloading."""
+    pending = [transfer for transfer in transfers if transfer.path not in existing]
+    _raise_if_cancelled(cancel_check)
+
+    LOGGER.info("Checking the size of %i files", len(pending))
+    sizes = fetch_sizes([transfer.url for transfer in pending], media_session, max_workers, cancel_check)
+    _raise_if_cancelled(cancel_check)
+
+    # Sample the largest files so the projection reflects sustained transfer speed
+    by_size = sorted(zip(sizes, pending), key=lambda pair: pair[0] or 0, reverse=True)
+    throughput = measure_throughput((transfer.url for _, transfer in by_size), media_session)
+
+    root = storage.local_path('')
+    return build_estimate(
+        ((transfer.label, transfer.taken_at, size) for transfer, size in zip(pending, sizes)),
+        free_space(root) if root else None,
+        throughput,
+        start_interval,
+    )
+
+
+def _run_transfers(runner: _TransferRunner, transfers: List[_Transfer]) -> DownloadSummary:
+    """Run planned transfers, skipping those whose files are already stored."""
+    known_dirs = {''}
+
+    for transfer in transfers:
+        # Check for cancellation and pause
+        runner.wait_while_paused()
+        runner.run_due_retries()
+
+        out_dir = transfer.path.rpartition('/')[0]
+        if out_dir not in known_dirs:
+            LOGGER.debug("Using directory: %s", runner.storage.describe(out_dir))
+            try:
+                runner.storage.makedirs(out_dir)
+            except Exception as e:  # pylint: disable=broad-except
+                LOGGER.error("Item %i failed to download: %s", transfer.index, str(e))
+                runner.fail(transfer.failure(e))
+                continue
+            known_dirs.add(out_dir)
+
+        basename = os.path.basename(transfer.path)
+        runner.report_progress(transfer.index, basename)
+
+        if transfer.path in runner.existing:
+            ITEM_LOGGER.info("%i: Skipping %s %s, already downloaded", transfer.index, transfer.label, basename)
+            runner.skip(transfer)
+            continue
+
+        ITEM_LOGGER.info("%i: Downloading %s %s", transfer.index, transfer.label, basename)
+        runner.attempt(transfer)
+
+    return runner.finish()
+
+
+def migrate_archive(
+    file_path: str,
+    layout: str,
+    storage: Optional[StorageBackend] = None,
+) -> Tuple[int, int]:
+    """
+    Move an existing download directory into a new layout.
+
+    Nothing is downloaded; the failure journal is updated to the new paths.
+
+    Args:
+        file_path: The frame's download directory (or s3://bucket/prefix)
+        layout: Target layout, a key of aura.layout.LAYOUTS
+        storage: Backend for file_path (defaults to open_storage(file_path))
+
+    Returns:
+        Tuple of (moved_count, unchanged_count)
+
+    Raises:
+        ConfigError: If the layout is unknown or the storage can't be opened
+    """
+    layout = resolve_layout(layout)
+    storage = storage or open_storage(file_path)
+    moved: Dict[str, str] = {}
+
+    def relocated(source: str, target: str) -> None:
+        moved[source] = target
+        # Journals written by older versions hold absolute paths
+        local_path = storage.local_path(source)
+        if local_path:
+            moved[local_path] = target
+
+    result = migrate_layout(storage, layout, relocated=relocated)
+    for journal in FailureJournal.find_in_directory(storage.state_dir()):
+        journal.relocate(moved)
+    return result
+
+
+@dataclass
+class DownloadPlan:
+    """The transfers a sync of one frame would run; built by Downloader.plan()."""
+
+    frame_id: str
+    storage: StorageBackend
+    layout: str
+    total: int
+    transfers: List[_Transfer]
+    failed: List[FailedTransfer]
+    shard: Optional[Tuple[int, int]] = None
+
+    @property
+    def shards(self) -> List[str]:
+        """Shard labels for the summary."""
+        return [format_shard(self.shard)] if self.shard else []
+
+
+class Downloader:
+    """
+    Reusable downloader for long-lived programs such as sync services.
+
+    Keeps the login session, the media connection pool, the disk writer, a
+    cache of frame listings and an index of stored files alive across calls,
+    so repeated syncs skip the login, the listing request and the storage scan.
+    A sync is split into list(), plan() and execute(); download_photos_from_aura
+    wraps all three for one-off use.
+
+    Not thread-safe; use one Downloader per thread (or per account).
+    """
+
+    def __init__(
+        self,
+        email: Optional[str] = None,
+        password: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        media_session: Optional[requests.Session] = None,
+        throttle: Optional[Throttle] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        post_processor: Optional[PostProcessor] = None,
+        fsync: str = FSYNC_NONE,
+        events: Optional[ev.EventSink] = None,
+        listing_ttl: float = 300,
+        concurrency: Union[ConcurrencyController, str, int, None] = None,
+        bandwidth: Optional[BandwidthLimiter] = None,
+        catalog: Optional[Catalog] = None,
+        transport: Optional[str] = None,
+        delay: Optional[float] = None,
+    ):
+        """
+        Args:
+            email: User's email address (not needed with session or for retry_failed())
+            password: User's password
+            session: Already authenticated session to use instead of logging in
+            media_session: Session whose connection pool is used for photo and video fetches
+            throttle: Request budget, shareable with other Downloaders of the same account
+                (defaults to one transfer start every DOWNLOAD_DELAY seconds)
+            retry_policy: Backoff settings for transient failures (defaults to RetryPolicy())
+            post_processor: Optional PostProcessor each newly downloaded file is handed
+                to as soon as it is written; the caller closes it
+            fsync: When downloaded files are synced to disk: 'none', 'file' or 'batch'
+            events: Optional EventSink for structured progress events (see aura.events)
+            listing_ttl: Seconds a frame listing is reused before list() fetches it again
+            concurrency: Limit on transfers in flight: a ConcurrencyController (shareable
+                with other Downloaders of the same account), 'auto', 'auto:N' or a fixed
+                number (defaults to 'auto', tuned between 1 and 8 at runtime)
+            bandwidth: Optional cap on the combined download rate; share one
+                BandwidthLimiter between Downloaders to cap them together
+            catalog: Optional Catalog that every fetched listing is stored in
+            transport: 'http1' (the default) or 'http2', for the login session and,
+                unless media_session is given, the photo and video fetches
+            delay: Seconds between transfer starts when no throttle is given
+                (defaults to DOWNLOAD_DELAY); 0 leaves pacing to the concurrency limit
+
+        Raises:
+            ValueError: If concurrency is malformed
+            ConfigError: If the transport is unknown or unavailable
+        """
+        self.email = email
+        self.password = password
+        self.session = session
+        self.transport = transport
+        self._owns_session = session is None
+        self._owns_media_session = media_session is None
+        self.media_session = media_session or new_session(transport)
+        self.throttle = throttle or Throttle(DOWNLOAD_DELAY if delay is None else delay)
+        self.retry_policy = retry_policy
+        self.post_processor = post_processor
+        self.events = events
+        self.listing_ttl = listing_ttl
+        self.fsync = fsync
+        if not isinstance(concurrency, ConcurrencyController):
+            concurrency = parse_concurrency(concurrency or AUTO)
+        self.concurrency = concurrency
+        self.bandwidth = bandwidth
+        self.catalog = catalog
+        self._writer: Optional[DiskWriter] = None
+        self._listings: Dict[str, Tuple[float, List[Dict]]] = {}
+        self._storages: Dict[str, StorageBackend] = {}
+        self._indexes: Dict[str, ExistingIndex] = {}
+
+    def __enter__(self) -> "Downloader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Flush pending writes, stop the disk writer and close the sessions that were created here."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._owns_session and self.session is not None:
+            self.session.close()
+            self.session = None
+        if self._owns_media_session:
+            self.media_session.close()
+
+    @property
+    def writer(self) -> DiskWriter:
+        """The disk writer shared by every execute(), started on first use."""
+        if self._writer is None:
+            self._writer = DiskWriter(fsync=self.fsync)
+        return self._writer
+
+    def _emit(self, event: str, frame_id: Optional[str] = None, **fields: Any) -> None:
+        if self.events:
+            if frame_id is not None:
+                fields['frame_id'] = frame_id
+            self.events.emit(event, **fields)
+
+    def login(self) -> requests.Session:
+        """
+        Get the authenticated session, logging in on first use.
+
+        Raises:
+            LoginError: If authentication fails
+        """
+        if self.session is None:
+            try:
+                self.session = create_session(self.email, self.password, self.transport)
+            except LoginError:
+                self._emit(ev.LOGIN, ok=False)
+                raise
+            self._emit(ev.LOGIN, ok=True)
+        return self.session
+
+    def storage_for(self, file_path: str, storage: Optional[StorageBackend] = None) -> StorageBackend:
+        """Get the (cached) storage backend for a frame's file_path."""
+        if storage is not None:
+            self._storages.setdefault(storage.location, storage)
+            return self._storages[storage.location]
+        if file_path not in self._storages:
+            self._storages[file_path] = open_storage(file_path)
+        return self._storages[file_path]
+
+    def index_for(self, storage: StorageBackend) -> ExistingIndex:
+        """Get the cached index of files already in a storage backend."""
+        if storage.location not in self._indexes:
+            self._indexes[storage.location] = ExistingIndex(storage)
+        return self._indexes[storage.location]
+
+    def forget(self, frame_id: Optional[str] = None, file_path: Optional[str] = None) -> None:
+        """
+        Drop cached state so the next call fetches it again.
+
+        Args:
+            frame_id: Drop this frame's listing (all listings if neither argument is given)
+            file_path: Drop the index of files stored here, e.g. after deleting some
+        """
+        if frame_id is None and file_path is None:
+            self._listings.clear()
+            self._indexes.clear()
+            return
+        if frame_id is not None:
+            self._listings.pop(frame_id, None)
+        if file_path is not None:
+            self._indexes.pop(self.storage_for(file_path).location, None)
+
+    def list(
+        self,
+        frame_id: str,
+        refresh: bool = False,
+        save_assets_path: Optional[str] = None,
+    ) -> List[Dict]:
+        """
+        Get a frame's assets, reusing a recent listing.
+
+        Args:
+            frame_id: ID of the frame
+            refresh: If True, ignore the cached listing
+            save_assets_path: If set, fetch afresh and write the raw JSON to this path
+
+        Raises:
+            LoginError: If authentication fails
+            NoAssetsError: If no assets are found
+        """
+        cached = self._listings.get(frame_id)
+        if cached and not refresh and not save_assets_path and time.monotonic() - cached[0] < self.listing_ttl:
+            LOGGER.debug("Reusing listing of frame %s", frame_id)
+            return cached[1]
+
+        assets = get_frame_assets(self.login(), frame_id, save_raw_response_path=save_assets_path)
+        LOGGER.info("Found %s photos", len(assets))
+        self._listings[frame_id] = (time.monotonic(), assets)
+        if self.catalog:
+            try:
+                self.catalog.ingest(frame_id, assets)
+            except (sqlite3.Error, OSError) as e:
+                LOGGER.warning("Couldn't update the catalog %s: %s", self.catalog.path, e)
+        return assets
+
+    def plan(
+        self,
+        frame_id: str,
+        file_path: str,
+        layout: Optional[str] = None,
+        organize_by_year: bool = False,
+        videos_only: bool = False,
+        photos_only: bool = False,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        uploaders: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        shard: Optional[Tuple[int, int]] = None,
+        storage: Optional[StorageBackend] = None,
+        assets: Optional[List[Dict]] = None,
+    ) -> DownloadPlan:
+        """
+        Work out the transfers for a frame without touching storage or the network
+        (beyond listing the frame if it isn't cached).
+
+        Args:
+            frame_id: ID of the frame
+            file_path: Directory to save photos to, or an s3://bucket/prefix location
+            assets: Listing to plan from (defaults to list(frame_id))
+            (other arguments as for download_photos_from_aura)
+
+        Raises:
+            ConfigError: If the layout or a filter is invalid, or the storage can't be opened
+        """
+        layout = resolve_layout(layout, organize_by_year)
+        asset_filter = AssetFilter(
+            since=since, until=until, uploaders=list(uploaders or []),
+            photos_only=photos_only, videos_only=videos_only, limit=limit,
+        )
+        storage = self.storage_for(file_path, storage)
+        if assets is None:
+            assets = self.list(frame_id)
+        listed_count = len(assets)
+
+        if shard:
+            assets = [item for item in assets if asset_in_shard(str(item.get('id')), shard)]
+            LOGGER.info("Shard %s has %s photos", format_shard(shard), len(assets))
+
+        # Narrow the listing before any per-asset storage or network work
+        if asset_filter:
+            assets = asset_filter.apply(assets)
+            LOGGER.info("Selected %s photos", len(assets))
+
+        transfers: List[_Transfer] = []
+        failed: List[FailedTransfer] = []
+        for index, item in enumerate(assets, 1):
+            try:
+                transfers.extend(_plan_asset(index, item, layout, videos_only, photos_only))
+            except Exception as e:  # pylint: disable=broad-except
+                LOGGER.error("Item %i failed to download: %s", index, str(e))
+                failed.append(FailedTransfer(
+                    asset_id=str(item.get('id')) if isinstance(item, dict) else '',
+                    component='asset',
+                    url=None,
+                    path=None,
+                    error=type(e).__name__,
+                    message=str(e),
+                    attempts=0,
+                ))
+
+        plan = DownloadPlan(frame_id, storage, layout, len(assets), transfers, failed, shard)
+        self._emit(ev.LISTING, frame_id, assets=listed_count, selected=len(assets))
+        self._emit(
+            ev.PLAN, frame_id, assets=len(assets), transfers=len(transfers),
+            layout=layout, storage=storage.location, shards=plan.shards,
+        )
+        return plan
+
+    def _runner(
+        self,
+        summary: DownloadSummary,
+        storage: StorageBackend,
+        shard: Optional[Tuple[int, int]],
+        frame_id: Optional[str],
+        progress_callback: Optional[Callable[[int, int, str], None]],
+        cancel_check: Optional[Callable[[], bool]],
+        pause_check: Optional[Callable[[], bool]],
+    ) -> _TransferRunner:
+        if self.post_processor and storage.local_path('') is None:
+            LOGGER.warning("Post-processing only runs on local storage, skipping it for %s", storage.location)
+        return _TransferRunner(
+            summary,
+            FailureJournal.for_directory(storage.state_dir(), shard),
+            storage,
+            retry_policy=self.retry_policy,
+            progress_callback=progress_callback,
+            cancel_check=cancel_check,
+            pause_check=pause_check,
+            throttle=self.throttle,
+            media_session=self.media_session,
+            post_processor=self.post_processor,
+            writer=self.writer,
+            events=self.events.bind(frame_id=frame_id) if self.events and frame_id else self.events,
+            existing=self.index_for(storage),
+            concurrency=self.concurrency,
+            bandwidth=self.bandwidth,
+        )
+
+    def _finished(self, summary: DownloadSummary, frame_id: Optional[str] = None) -> DownloadSummary:
+        self._emit(ev.SUMMARY, frame_id, **summary.to_dict())
+        return summary
+
+    def execute(
+        self,
+        plan: DownloadPlan,
+        progress_callback: Optional[Callable[[int, int, str], None]] = None,
+        cancel_check: Optional[Callable[[], bool]] = None,
+        pause_check: Optional[Callable[[], bool]] = None,
+    ) -> DownloadSummary:
+        """
+        Run a plan's transfers, skipping files that are already stored.
+
+        Returns:
+            DownloadSummary of the run
+
+        Raises:
+            DownloadCancelledError: If download is cancelled via cancel_check
+        """
+        root = plan.storage.local_path('')
+        if root and not os.path.isdir(root):
+            LOGGER.info("Creating new images directory: %s", root)
+        plan.storage.makedirs('')
+
+        LOGGER.info("Starting download process")
+        runner = self._runner(
+            DownloadSummary(total=plan.total, shards=plan.shards), plan.storage, plan.shard,
+            plan.frame_id, progress_callback, cancel_check, pause_check,
+        )
+        try:
+            for failure in plan.failed:
+                runner.fail(failure)
+            return self._finished(_run_transfers(runner, plan.transfers), plan.frame_id)
+        finally:
+            runner.close()
+
+    def estimate(
+        self,
+        plan: DownloadPlan,
+        max_workers: int = DEFAULT_HEAD_WORKERS,
+        cancel_check: Optional[Callable[[], bool]] = None,
+    ) -> DownloadSummary:
+        """
+        Size up a plan without downloading: HEAD every file still to fetch concurrently.
+
+        Returns:
+            DownloadSummary whose `estimate` attribute holds the totals, free space and
+            projected time
+        """
+        estimate = _estimate_transfers(
+            plan.transfers, plan.storage, self.index_for(plan.storage), self.media_session,
+            self.throttle.interval, max_workers, cancel_check,
+        )
+        summary = DownloadSummary(total=plan.total, shards=plan.shards, estimate=estimate)
+        return self._finished(summary, plan.frame_id)
+
+    def count(self, plan: DownloadPlan) -> DownloadSummary:
+        """Summarize how many assets a plan covers, without transferring anything."""
+        return self._finished(DownloadSummary(total=plan.total, shards=plan.shards), plan.frame_id)
+
+    def retry_failed(
+        self,
+        file_path: str,
+        shard: Optional[Tuple[int, int]] = None,
+        storage: Optional[StorageBackend] = None,
+        progress_callback: Optional[Callable[[int, int, str], None]] = None,
+        cancel_check: Optional[Callable[[], bool]] = None,
+        pause_check: Optional[Callable[[], bool]] = None,
+        frame_id: Optional[str] = None,
+    ) -> DownloadSummary:
+        """
+        Retry only the transfers recorded in the failure journal, without logging in or listing.
+
+        Args:
+            frame_id: Only used to tag events
+        """
+        storage = self.storage_for(file_path, storage)
+        runner = self._runner(
+            DownloadSummary(shards=[format_shard(shard)] if shard else []), storage, shard,
+            frame_id, progress_callback, cancel_check, pause_check,
+        )
+        try:
+            return self._finished(_retry_journaled_failures(runner), frame_id)
+        finally:
+            runner.close()
+
+
 def download_photos_from_aura(
     email: str,
     password: str,
@@ -112,7 +1228,30 @@ def download_photos_from_aura(
     save_assets_path: Optional[str] = None,
     progress_callback: Optional[Callable[[int, int, str], None]] = None,
     cancel_check: Optional[Callable[[], bool]] = None,
-) -> Tuple[int, int, int]:
+    pause_check: Optional[Callable[[], bool]] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    retry_failed: bool = False,
+    layout: Optional[str] = None,
+    session: Optional[requests.Session] = None,
+    throttle: Optional[Throttle] = None,
+    media_session: Optional[requests.Session] = None,
+    shard: Optional[Tuple[int, int]] = None,
+    post_processor: Optional[PostProcessor] = None,
+    fsync: str = FSYNC_NONE,
+    storage: Optional[StorageBackend] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    uploaders: Optional[List[str]] = None,
+    photos_only: bool = False,
+    limit: Optional[int] = None,
+    estimate: bool = False,
+    events: Optional[ev.EventSink] = None,
+    concurrency: Union[ConcurrencyController, str, int, None] = None,
+    bandwidth: Optional[BandwidthLimiter] = None,
+    catalog: Optional[Catalog] = None,
+    transport: Optional[str] = None,
+    delay: Optional[float] = None,
+) -> DownloadSummary:
     """
     Download photos from an Aura frame.
 
@@ -120,109 +1259,237 @@ def download_photos_from_aura(
         email: User's email address
         password: User's password
         frame_id: ID of the frame to download from
-        file_path: Directory to save photos to
+        file_path: Directory to save photos to, or an s3://bucket/prefix location
         organize_by_year: If True, organize photos into year subdirectories
+            (shorthand for layout='year')
         count_only: If True, return count without downloading
         videos_only: If True, only download video clips, skip still photos
         save_assets_path: If set, write the raw assets JSON returned by the API to this path
         progress_callback: Optional callback(current, total, filename) for progress updates
         cancel_check: Optional callback() that returns True if download should be cancelled
+        pause_check: Optional callback() that returns True while the download should be paused
+        retry_policy: Backoff settings for transient failures (defaults to RetryPolicy())
+        retry_failed: If True, skip login and listing and only retry the transfers
+            recorded in the failure journal in file_path
+        layout: Output layout, a key of aura.layout.LAYOUTS; overrides organize_by_year
+        session: Already authenticated session to reuse instead of logging in
+        throttle: Request budget shared with other frames of the same account
+            (defaults to one transfer start every DOWNLOAD_DELAY seconds)
+        media_session: Session whose connection pool is used for photo and video fetches
+        shard: Optional (index, count), 1-based, as returned by aura.shard.parse_shard;
+            only assets whose id hashes into this shard are handled, so several
+            machines can split a frame without coordinating
+        post_processor: Optional PostProcessor that each newly downloaded file is
+            handed to as soon as it is written; the caller closes it
+        fsync: When downloaded files are synced to disk: 'none', 'file' (each
+            file before it is renamed into place) or 'batch' (groups of files)
+        storage: Backend to store files in (defaults to open_storage(file_path));
+            pass aura.storage.S3Storage to set a custom endpoint or client
+        since: Only assets taken at or after this date ('YYYY[-MM[-DD[THH:MM[:SS]]]]')
+        until: Only assets taken at or before this date, inclusive at its precision
+        uploaders: Only assets uploaded by these user ids
+        photos_only: If True, only download still photos, skip videos
+        limit: Download at most this many assets (after the other filters)
+        estimate: If True, download nothing; HEAD every planned file concurrently and
+            return the total size, free space and projected time in the summary's
+            `estimate` attribute
+        events: Optional EventSink that receives structured login, listing, plan,
+            per-transfer and summary events (see aura.events)
+        concurrency: Limit on transfers in flight: 'auto' (the default) tunes it between
+            1 and 8 from the observed throughput, latency and errors; 'auto:N' tunes up
+            to N; a number fixes it. A ConcurrencyController can be shared between frames
+        bandwidth: Optional BandwidthLimiter capping the combined bytes/sec of every
+            transfer (and every frame) it is passed to; see aura.bandwidth
+        catalog: Optional Catalog the frame's listing is stored in, for later
+            queries without the network; see aura.catalog
+        transport: 'http1' (the default, requests' connection pool) or 'http2' to
+            multiplex the listing and media fetches over a few HTTP/2 connections
+            (needs httpx[http2]); see aura.transport
+        delay: Seconds between transfer starts when no throttle is given (defaults
+            to DOWNLOAD_DELAY); 0 lets the concurrency limit alone pace transfers
 
     Returns:
-        Tuple of (downloaded_count, skipped_count, total_count)
+        DownloadSummary, which unpacks as (downloaded_count, skipped_count, total_count)
+        and lists the transfers that never succeeded in its `failed` attribute
 
     Raises:
         LoginError: If authentication fails
         NoAssetsError: If no assets are found
         DownloadCancelledError: If download is cancelled via cancel_check
         DownloadError: If a critical download error occurs
+        ConfigError: If the layout or a filter is invalid, the storage can't be opened
+            or the transport is unavailable
+        ValueError: If concurrency is malformed
     """
-    # Create authenticated session
-    session = create_session(email, password)
+    downloader = Downloader(
+        email, password,
+        session=session,
+        media_session=media_session,
+        throttle=throttle,
+        retry_policy=retry_policy,
+        post_processor=post_processor,
+        fsync=fsync,
+        events=events,
+        concurrency=concurrency,
+        bandwidth=bandwidth,
+        catalog=catalog,
+        transport=transport,
+        delay=delay,
+    )
+    try:
+        if retry_failed:
+            return downloader.retry_failed(
+                file_path, shard, storage, progress_callback, cancel_check, pause_check, frame_id
+            )
 
-    # Get frame assets
-    assets = get_frame_assets(session, frame_id, save_raw_response_path=save_assets_path)
-    total_count = len(assets)
-    LOGGER.info("Found %s photos", total_count)
+        assets = downloader.list(frame_id, save_assets_path=save_assets_path)
+        plan = downloader.plan(
+            frame_id, file_path,
+            layout=layout,
+            organize_by_year=organize_by_year,
+            videos_only=videos_only,
+            photos_only=photos_only,
+            since=since,
+            until=until,
+            uploaders=uploaders,
+            limit=limit,
+            shard=shard,
+            storage=storage,
+            assets=assets,
+        )
 
-    if count_only:
-        return (0, 0, total_count)
+        if count_only:
+            return downloader.count(plan)
 
-    # Ensure output directory exists
-    if not os.path.isdir(file_path):
-        LOGGER.info("Creating new images directory: %s", file_path)
-        os.makedirs(file_path)
+        if estimate:
+            return downloader.estimate(plan, cancel_check=cancel_check)
 
-    LOGGER.info("Starting download process")
+        return downloader.execute(plan, progress_callback, cancel_check, pause_check)
+    finally:
+        downloader.close()
 
-    downloaded_count = 0
-    skipped_count = 0
-    current = 0
 
-    for item in assets:
-        current += 1
+@dataclass
+class FrameJob:
+    """A frame to sync together with the credentials of the account that owns it."""
 
-        # Check for cancellation
-        if cancel_check and cancel_check():
-            LOGGER.info("Download cancelled by user")
-            raise DownloadCancelledError("Download cancelled by user")
+    name: str
+    account: str
+    email: str
+    password: str
+    frame_id: str
+    file_path: str
+    layout: Optional[str] = None
+    s3_endpoint_url: Optional[str] = None
+    transport: Optional[str] = None
+    delay: Optional[float] = None
 
-        try:
-            clean_time = item['taken_at'].replace(':', '-')
-
-            if organize_by_year:
-                out_dir = os.path.join(file_path, clean_time[:4])
-                if not os.path.isdir(out_dir):
-                    LOGGER.debug("Creating new year directory: %s", out_dir)
-                    os.makedirs(out_dir)
-            else:
-                out_dir = file_path
 
-            # Each asset may have a still image, a video (Live Photo / video clip), or both.
-            # Build a list of (label, url, target_path) for whichever components are present.
-            downloads = []
+def _sync_account(
+    account: str,
+    jobs: List[FrameJob],
+    options: Dict[str, Any],
+) -> Dict[str, Union[DownloadSummary, AuraError]]:
+    """Sync one account's frames in order, sharing its session, throttle and concurrency limit."""
+    threading.current_thread().name = account
+    # Frames of one account share its config section, and so its transport and delay
+    transport = jobs[0].transport if jobs else None
+    delay = jobs[0].delay if jobs else None
+    throttle = Throttle(DOWNLOAD_DELAY if delay is None else delay)
+    concurrency = options.get('concurrency')
+    if not isinstance(concurrency, ConcurrencyController):
+        concurrency = parse_concurrency(concurrency or AUTO)
+    options = {**options, 'concurrency': concurrency}
+    try:
+        media_session = new_session(transport)
+    except ConfigError as e:
+        LOGGER.error("Account %s: %s", account, e)
+        return {job.name: e for job in jobs}
+    session = None
+    results: Dict[str, Union[DownloadSummary, AuraError]] = {}
 
-            still_name = item.get('file_name')
-            if still_name and not videos_only:
-                still_url = IMAGE_URL_TEMPLATE.format(
-                    user_id=item['user_id'],
-                    file_name=still_name,
+    try:
+        for job in jobs:
+            try:
+                if session is None and not options.get('retry_failed'):
+                    session = create_session(job.email, job.password, transport)
+                    if options.get('events'):
+                        options['events'].emit(ev.LOGIN, account=account, ok=True)
+                LOGGER.info("Syncing frame %s", job.name)
+                results[job.name] = download_photos_from_aura(
+                    email=job.email,
+                    password=job.password,
+                    frame_id=job.frame_id,
+                    file_path=job.file_path,
+                    layout=job.layout,
+                    storage=open_storage(job.file_path, job.s3_endpoint_url),
+                    session=session,
+                    throttle=throttle,
+                    media_session=media_session,
+                    transport=transport,
+                    **options,
                 )
-                still_filename = clean_time + "_" + item['id'] + os.path.splitext(still_name)[1]
-                downloads.append(('photo', still_url, os.path.join(out_dir, still_filename)))
+            except DownloadCancelledError:
+                raise
+            except LoginError as e:
+                LOGGER.error("Account %s: %s", account, e)
+                if options.get('events'):
+                    options['events'].emit(ev.LOGIN, account=account, ok=False)
+                for remaining in jobs[jobs.index(job):]:
+                    results[remaining.name] = e
+                break
+            except AuraError as e:
+                LOGGER.error("Frame %s: %s", job.name, e)
+                results[job.name] = e
+            except Exception as e:  # pylint: disable=broad-except
+                # A disk or catalog error stops this frame only, not the other frames and accounts
+                LOGGER.exception("Frame %s failed", job.name)
+                results[job.name] = DownloadError(f"{type(e).__name__}: {e}")
+                results[job.name].__cause__ = e
+    finally:
+        if session is not None:
+            session.close()
+        media_session.close()
 
-            video_url = item.get('video_url')
-            video_name = item.get('video_file_name')
-            if video_url and video_name:
-                video_filename = clean_time + "_" + item['id'] + os.path.splitext(video_name)[1]
-                downloads.append(('video', video_url, os.path.join(out_dir, video_filename)))
+    return results
 
-            for label, url, file_to_write in downloads:
-                basename = os.path.basename(file_to_write)
 
-                if progress_callback:
-                    progress_callback(current, total_count, basename)
-
-                if os.path.isfile(file_to_write):
-                    LOGGER.info("%i: Skipping %s %s, already downloaded", current, label, basename)
-                    skipped_count += 1
-                    continue
+def download_frames(
+    jobs: List[FrameJob],
+    **options: Any,
+) -> Dict[str, Union[DownloadSummary, AuraError]]:
+    """
+    Sync several frames, running each account in parallel.
 
-                LOGGER.info("%i: Downloading %s %s", current, label, basename)
-                response = requests.get(url, stream=True, timeout=90)
+    Frames of the same account run one after another with a single login, a
+    shared throttle and a shared concurrency limit; different accounts each get
+    their own session, throttle budget and concurrency limit and sync concurrently.
 
-                with open(file_to_write, 'wb') as out_file:
-                    shutil.copyfileobj(response.raw, out_file)
-                del response
+    Args:
+        jobs: Frames to sync
+        **options: Extra keyword arguments for download_photos_from_aura
+            (organize_by_year, count_only, videos_only, cancel_check, ...);
+            a concurrency spec such as 'auto' gives each account its own limit,
+            while a bandwidth limiter is shared by every account
 
-                downloaded_count += 1
+    Returns:
+        Mapping of frame name to its DownloadSummary, or to the AuraError that stopped it
+        (any other exception is logged and reported as a DownloadError)
 
-                time.sleep(2)
+    Raises:
+        DownloadCancelledError: If the download is cancelled via cancel_check
+    """
+    by_account: Dict[str, List[FrameJob]] = {}
+    for job in jobs:
+        by_account.setdefault(job.account, []).append(job)
 
-        except DownloadCancelledError:
-            raise
-        except Exception as e:
-            LOGGER.error("Item %i failed to download: %s", current, str(e))
-            time.sleep(10)
+    results: Dict[str, Union[DownloadSummary, AuraError]] = {}
+    with ThreadPoolExecutor(max_workers=max(len(by_account), 1)) as executor:
+        futures = [
+            executor.submit(_sync_account, account, account_jobs, options)
+            for account, account_jobs in by_account.items()
+        ]
+        for future in futures:
+            results.update(future.result())
 
-    return (downloaded_count, skipped_count, total_count)
+    return {job.name: results[job.name] for job in jobs}
@@ -0,0 +1,200 @@
+"""Pre-flight size, disk-space and duration estimates, made before anything is downloaded."""
+
+import logging
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+import requests
+
+from .summary import Estimate
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_HEAD_WORKERS = 8
+HEAD_TIMEOUT = 30
+SAMPLE_BYTES = 1024 * 1024
+SAMPLE_COUNT = 3
+
+
+def head_size(url: str, session: requests.Session) -> Optional[int]:
+    """
+    Get the size of a URL's body with a HEAD request.
+
+    Returns:
+        Content-Length in bytes, or None if the server didn't report one
+    """
+    try:
+        response = session.head(url, allow_redirects=True, timeout=HEAD_TIMEOUT)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        LOGGER.debug("HEAD %s failed: %s", url, e)
+        return None
+    length = response.headers.get('Content-Length')
+    return int(length) if length and length.isdigit() else None
+
+
+def fetch_sizes(
+    urls: Sequence[str],
+    session: requests.Session,
+    max_workers: int = DEFAULT_HEAD_WORKERS,
+    cancel_check: Optional[Callable[[], bool]] = None,
+) -> List[Optional[int]]:
+    """
+    Get the sizes of many URLs with at most max_workers HEAD requests in flight.
+
+    Returns:
+        Sizes in the order of urls (None where unknown, or once cancelled)
+    """
+    def size_of(url: str) -> Optional[int]:
+        if cancel_check and cancel_check():
+            return None
+        return head_size(url, session)
+
+    with ThreadPoolExecutor(max_workers=max(max_workers, 1), thread_name_prefix="aura-head") as executor:
+        return list(executor.map(size_of, urls))
+
+
+def measure_throughput(
+    urls: Iterable[str],
+    session: requests.Session,
+    sample_bytes: int = SAMPLE_BYTES,
+    samples: int = SAMPLE_COUNT,
+) -> Optional[float]:
+    """
+    Time ranged GETs of the first sample_bytes of a few URLs.
+
+    Returns:
+        Observed bytes per second, or None if nothing could be fetched
+    """
+    received = 0
+    elapsed = 0.0
+    for url in list(urls)[:samples]:
+        started = time.monotonic()
+        try:
+            response = session.get(
+                url, stream=True, timeout=HEAD_TIMEOUT, headers={'Range': f'bytes=0-{sample_bytes - 1}'}
+            )
+            try:
+                response.raise_for_status()
+                sampled = 0
+                # Stop at sample_bytes even if the server ignores the Range header
+                for chunk in response.iter_content(64 * 1024):
+                    sampled += len(chunk)
+                    if sampled >= sample_bytes:
+                        break
+                received += sampled
+            finally:
+                response.close()
+        except requests.RequestException as e:
+            LOGGER.debug("Throughput sample of %s failed: %s", url, e)
+            continue
+        elapsed += time.monotonic() - started
+    if not received or elapsed <= 0:
+        return None
+    return received / elapsed
+
+
+def free_space(path: str) -> Optional[int]:
+    """Free bytes on the filesystem holding path (or its nearest existing parent)."""
+    path = os.path.abspath(path)
+    while not os.path.exists(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+    return shutil.disk_usage(path).free
+
+
+def project_seconds(sizes: Sequence[int], throughput: float, start_interval: float) -> float:
+    """
+    Project the wall-clock time of transferring files of the given sizes one after another.
+
+    Each transfer takes as long as its bytes need at the observed throughput,
+    but no less than the throttle's interval between transfer starts.
+    """
+    return sum(max(size / throughput, start_interval) for size in sizes)
+
+
+def build_estimate(
+    planned: Iterable[Tuple[str, str, Optional[int]]],
+    free_bytes: Optional[int],
+    throughput: Optional[float],
+    start_interval: float,
+) -> Estimate:
+    """
+    Total up sizes per media type and per year.
+
+    Args:
+        planned: (label, taken_at, size) for every planned transfer; size None if unknown
+        free_bytes: Free space at the destination, if known
+        throughput: Observed bytes per second, if measured
+        start_interval: Minimum seconds between transfer starts (the throttle)
+
+    Returns:
+        Estimate; files of unknown size are counted at the average known size
+        for the time projection but not in the byte totals
+    """
+    estimate = Estimate(free_bytes=free_bytes, throughput=throughput)
+    known: List[int] = []
+    for label, taken_at, size in planned:
+        estimate.files += 1
+        if size is None:
+            estimate.unknown += 1
+            continue
+        known.append(size)
+        estimate.bytes += size
+        estimate.by_type[label] = estimate.by_type.get(label, 0) + size
+        year = (taken_at or '')[:4] or 'unknown'
+        estimate.by_year[year] = estimate.by_year.get(year, 0) + size
+
+    if throughput:
+        average = sum(known) / len(known) if known else 0
+        estimate.seconds = project_seconds(known + [average] * estimate.unknown, throughput, start_interval)
+    return estimate
+
+
+def format_bytes(count: float) -> str:
+    """Format a byte count for humans, e.g. '1.5 GB'."""
+    for unit in ('B', 'KB', 'MB', 'GB', 'TB'):
+        if abs(count) < 1024 or unit == 'TB':
+            return f"{count:.0f} {unit}" if unit == 'B' else f"{count:.1f} {unit}"
+        count /= 1024
+    return f"{count:.1f} TB"
+
+
+def format_duration(seconds: float) -> str:
+    """Format a duration for humans, e.g. '2h 05m'."""
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h {minutes:02d}m"
+    if minutes:
+        return f"{minutes}m {secs:02d}s"
+    return f"{secs}s"
+
+
+def log_estimate(estimate: Estimate, prefix: str = '') -> None:
+    """Log an estimate as a short report."""
+    LOGGER.info(
+        "%s%i files to download, %s%s", prefix, estimate.files, format_bytes(estimate.bytes),
+        f" ({estimate.unknown} of unknown size)" if estimate.unknown else '',
+    )
+    for label, size in sorted(estimate.by_type.items()):
+        LOGGER.info("%s  %s: %s", prefix, label, format_bytes(size))
+    for year, size in sorted(estimate.by_year.items()):
+        LOGGER.info("%s  %s: %s", prefix, year, format_bytes(size))
+    if estimate.free_bytes is not None:
+        LOGGER.info("%sFree space: %s", prefix, format_bytes(estimate.free_bytes))
+    if estimate.seconds is not None:
+        LOGGER.info(
+            "%sProjected time: %s at %s/s", prefix, format_duration(estimate.seconds),
+            format_bytes(estimate.throughput),
+        )
+    if estimate.fits is False:
+        LOGGER.error(
+            "%sNot enough free space: %s needed, %s free", prefix,
+            format_bytes(estimate.bytes), format_bytes(estimate.free_bytes),
+        )
@@ -0,0 +1,70 @@
+"""Structured progress events for programs that drive the downloader."""
+
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, TextIO
+
+# Event names, in the order a run emits them
+LOGIN = 'login'
+LISTING = 'listing'
+PLAN = 'plan'
+TRANSFER_START = 'transfer-start'
+TRANSFER_DONE = 'transfer-done'
+SKIP = 'skip'
+RETRY = 'retry'
+SUMMARY = 'summary'
+
+EVENT_FORMATS = ('jsonl',)
+
+
+class EventSink(ABC):
+    """
+    Receives structured events from a run.
+
+    Subclass and implement emit() to forward events elsewhere. Sinks may be
+    called from several threads when frames of different accounts sync in
+    parallel.
+    """
+
+    @abstractmethod
+    def emit(self, event: str, **fields: Any) -> None:
+        """
+        Handle one event.
+
+        Args:
+            event: One of the event names in this module
+            **fields: JSON-serialisable details of the event
+        """
+
+    def bind(self, **context: Any) -> "EventSink":
+        """Get a sink that adds the given fields (e.g. frame=...) to every event."""
+        return _BoundEventSink(self, context)
+
+
+class _BoundEventSink(EventSink):
+    def __init__(self, parent: EventSink, context: Dict[str, Any]):
+        self._parent = parent
+        self._context = context
+
+    def emit(self, event: str, **fields: Any) -> None:
+        self._parent.emit(event, **{**self._context, **fields})
+
+
+class JsonLinesEventSink(EventSink):
+    """Writes each event as one JSON object per line, flushed immediately."""
+
+    def __init__(self, stream: TextIO):
+        """
+        Args:
+            stream: Text stream to write to, e.g. sys.stdout or an open file
+        """
+        self._stream = stream
+        self._lock = threading.Lock()
+
+    def emit(self, event: str, **fields: Any) -> None:
+        line = json.dumps({'event': event, 'time': round(time.time(), 3), **fields}, default=str)
+        with self._lock:
+            self._stream.write(line + "\n")
+            self._stream.flush()
@@ -0,0 +1,105 @@
+"""Asset selection applied right after listing, before any storage or network work."""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from .exceptions import ConfigError
+
+_BOUND_RE = re.compile(r'^\d{4}(-\d{2}(-\d{2}([ T]\d{2}(:\d{2}(:\d{2})?)?)?)?)?$')
+
+
+def parse_bound(text: str) -> str:
+    """
+    Validate a --since/--until bound.
+
+    Bounds are a prefix of an ISO timestamp: a year, year-month, date or date
+    and time, e.g. '2024', '2024-05', '2024-05-31' or '2024-05-31T18:00'.
+
+    Returns:
+        The bound, normalised to use a space between date and time
+
+    Raises:
+        ValueError: If the bound is malformed
+    """
+    text = text.strip()
+    if not _BOUND_RE.match(text):
+        raise ValueError(f"Invalid date '{text}', expected YYYY[-MM[-DD[THH[:MM[:SS]]]]]")
+    return text.replace('T', ' ')
+
+
+def _has_photo(item: Dict) -> bool:
+    return bool(item.get('file_name'))
+
+
+def _has_video(item: Dict) -> bool:
+    return bool(item.get('video_url') and item.get('video_file_name'))
+
+
+@dataclass
+class AssetFilter:
+    """
+    Selects the assets of a frame listing worth planning transfers for.
+
+    Date bounds are inclusive at their own precision, so until='2024-05'
+    includes every asset taken in May 2024.
+    """
+
+    since: Optional[str] = None
+    until: Optional[str] = None
+    uploaders: List[str] = field(default_factory=list)
+    photos_only: bool = False
+    videos_only: bool = False
+    limit: Optional[int] = None
+
+    def __post_init__(self):
+        if self.photos_only and self.videos_only:
+            raise ConfigError("photos_only and videos_only can't be combined")
+        if self.limit is not None and self.limit < 0:
+            raise ConfigError(f"Invalid limit {self.limit}, expected 0 or more")
+        try:
+            self.since = parse_bound(self.since) if self.since else None
+            self.until = parse_bound(self.until) if self.until else None
+        except ValueError as e:
+            raise ConfigError(str(e))
+
+    def __bool__(self) -> bool:
+        return bool(
+            self.since or self.until or self.uploaders
+            or self.photos_only or self.videos_only or self.limit is not None
+        )
+
+    def matches(self, item: Dict) -> bool:
+        """Check one asset against every filter except the limit."""
+        if self.since or self.until:
+            taken_at = str(item.get('taken_at') or '').replace('T', ' ')
+            if not taken_at:
+                return False
+            if self.since and taken_at[:len(self.since)] < self.since:
+                return False
+            if self.until and taken_at[:len(self.until)] > self.until:
+                return False
+        if self.uploaders and str(item.get('user_id')) not in self.uploaders:
+            return False
+        if self.photos_only and not _has_photo(item):
+            return False
+        if self.videos_only and not _has_video(item):
+            return False
+        return True
+
+    def apply(self, assets: Iterable[Dict]) -> List[Dict]:
+        """
+        Select matching assets in listing order, stopping once the limit is reached.
+
+        Returns:
+            The selected assets
+        """
+        selected = []
+        if self.limit == 0:
+            return selected
+        for item in assets:
+            if self.matches(item):
+                selected.append(item)
+                if self.limit is not None and len(selected) >= self.limit:
+                    break
+        return selected
@@ -2,7 +2,8 @@
 
 from PyQt6.QtCore import QThread, pyqtSignal
 
-from ..core import download_photos_from_aura
+from ..core import Downloader
+from ..events import EventSink
 from ..exceptions import (
     AuraError,
     DownloadCancelledError,
@@ -17,7 +18,8 @@ class DownloadWorker(QThread):
     # Signals
     progress_updated = pyqtSignal(int, int, str)  # current, total, filename
     status_changed = pyqtSignal(str)  # status message
-    download_complete = pyqtSignal(int, int, int)  # downloaded, skipped, total
+    plan_ready = pyqtSignal(object)  # list of (asset_id, component, key), in download order
+    download_complete = pyqtSignal(int, int, int, int)  # downloaded, skipped, failed, total
     error_occurred = pyqtSignal(str)  # error message
 
     def __init__(
@@ -27,8 +29,10 @@ class DownloadWorker(QThread):
         frame_id: str,
         file_path: str,
         organize_by_year: bool = False,
+        layout: str = None,
         videos_only: bool = False,
         save_assets_path: str = None,
+        events: EventSink = None,
         parent=None
     ):
         super().__init__(parent)
@@ -37,18 +41,39 @@ class DownloadWorker(QThread):
         self.frame_id = frame_id
         self.file_path = file_path
         self.organize_by_year = organize_by_year
+        self.layout = layout
         self.videos_only = videos_only
         self.save_assets_path = save_assets_path
+        self.events = events
         self._cancelled = False
+        self._paused = False
 
     def cancel(self):
         """Request cancellation of the download."""
         self._cancelled = True
 
+    def pause(self):
+        """Request a pause; the partially downloaded file is kept."""
+        self._paused = True
+        self.status_changed.emit("Paused")
+
+    def resume(self):
+        """Resume a paused download."""
+        self._paused = False
+        self.status_changed.emit("Resuming...")
+
+    def is_paused(self) -> bool:
+        """Return True if the download is paused."""
+        return self._paused
+
     def _check_cancelled(self) -> bool:
         """Check if download has been cancelled."""
         return self._cancelled
 
+    def _check_paused(self) -> bool:
+        """Check if download has been paused."""
+        return self._paused
+
     def _progress_callback(self, current: int, total: int, filename: str):
         """Emit progress signal."""
         self.progress_updated.emit(current, total, filename)
@@ -58,21 +83,31 @@ class DownloadWorker(QThread):
         try:
             self.status_changed.emit("Logging in...")
 
-            downloaded, skipped, total = download_photos_from_aura(
-                email=self.email,
-                password=self.password,
-                frame_id=self.frame_id,
-                file_path=self.file_path,
-                organize_by_year=self.organize_by_year,
-                count_only=False,
-                videos_only=self.videos_only,
-                save_assets_path=self.save_assets_path,
-                progress_callback=self._progress_callback,
-                cancel_check=self._check_cancelled,
-            )
+            with Downloader(self.email, self.password, events=self.events) as downloader:
+                assets = downloader.list(self.frame_id, save_assets_path=self.save_assets_path)
+                plan = downloader.plan(
+                    self.frame_id,
+                    self.file_path,
+                    layout=self.layout,
+                    organize_by_year=self.organize_by_year,
+                    videos_only=self.videos_only,
+                    assets=assets,
+                )
+                self.plan_ready.emit([
+                    (transfer.asset_id, transfer.label, transfer.path) for transfer in plan.transfers
+                ])
+                self.status_changed.emit("Downloading...")
+                summary = downloader.execute(
+                    plan,
+                    progress_callback=self._progress_callback,
+                    cancel_check=self._check_cancelled,
+                    pause_check=self._check_paused,
+                )
 
             self.status_changed.emit("Download complete")
-            self.download_complete.emit(downloaded, skipped, total)
+            self.download_complete.emit(
+                summary.downloaded, summary.skipped, len(summary.failed), summary.total
+            )
 
         except DownloadCancelledError:
             self.status_changed.emit("Download cancelled")
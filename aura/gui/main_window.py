@@ -11,6 +11,7 @@ from PyQt6.QtWidgets import (
     QFormLayout,
     QGroupBox,
     QHBoxLayout,
+    QHeaderView,
     QLabel,
     QLineEdit,
     QListWidget,
@@ -19,13 +20,16 @@ from PyQt6.QtWidgets import (
     QMessageBox,
     QProgressBar,
     QPushButton,
+    QTableView,
     QVBoxLayout,
     QWidget,
     QDialog,
     QDialogButtonBox,
 )
 
+from ..layout import FLAT, LAYOUTS, YEAR
 from .download_worker import DownloadWorker
+from .transfer_model import SIZE_COLUMN, SPEED_COLUMN, STATES, TransferFilterProxy, TransferTableModel
 
 
 class FrameDialog(QDialog):
@@ -186,9 +190,15 @@ class MainWindow(QMainWindow):
         frame_select_layout.addStretch()
         options_layout.addLayout(frame_select_layout)
 
-        # Organize by year
-        self.year_checkbox = QCheckBox("Organize photos by year")
-        options_layout.addWidget(self.year_checkbox)
+        # Folder layout
+        layout_select_layout = QHBoxLayout()
+        layout_select_layout.addWidget(QLabel("Folder layout:"))
+        self.layout_combo = QComboBox()
+        for name, description in LAYOUTS.items():
+            self.layout_combo.addItem(description.capitalize(), name)
+        layout_select_layout.addWidget(self.layout_combo)
+        layout_select_layout.addStretch()
+        options_layout.addLayout(layout_select_layout)
 
         # Videos only
         self.videos_only_checkbox = QCheckBox("Only download video clips (skip still photos)")
@@ -213,23 +223,71 @@ class MainWindow(QMainWindow):
         self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(self.status_label)
 
-        # Start/Stop button
+        # Transfer table
+        transfers_group = QGroupBox("Transfers")
+        transfers_layout = QVBoxLayout(transfers_group)
+
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("Show:"))
+        self.state_filter_combo = QComboBox()
+        self.state_filter_combo.addItem("All", None)
+        for state in STATES:
+            self.state_filter_combo.addItem(state, state)
+        self.state_filter_combo.currentIndexChanged.connect(self._on_state_filter_changed)
+        filter_layout.addWidget(self.state_filter_combo)
+        filter_layout.addStretch()
+        self.transfer_counts_label = QLabel("")
+        filter_layout.addWidget(self.transfer_counts_label)
+        transfers_layout.addLayout(filter_layout)
+
+        self.transfer_model = TransferTableModel(self)
+        self.transfer_model.counts_changed.connect(self._on_transfer_counts_changed)
+        self.transfer_proxy = TransferFilterProxy(self)
+        self.transfer_proxy.setSourceModel(self.transfer_model)
+
+        self.transfer_table = QTableView()
+        self.transfer_table.setModel(self.transfer_proxy)
+        self.transfer_table.setMinimumHeight(180)
+        self.transfer_table.setAlternatingRowColors(True)
+        self.transfer_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.transfer_table.setWordWrap(False)
+        # Fixed row heights and column widths keep the view from measuring every row
+        vertical_header = self.transfer_table.verticalHeader()
+        vertical_header.setVisible(False)
+        vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical_header.setDefaultSectionSize(self.fontMetrics().height() + 6)
+        horizontal_header = self.transfer_table.horizontalHeader()
+        horizontal_header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        horizontal_header.setStretchLastSection(False)
+        horizontal_header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        horizontal_header.resizeSection(SIZE_COLUMN, 80)
+        horizontal_header.resizeSection(SPEED_COLUMN, 90)
+        transfers_layout.addWidget(self.transfer_table)
+
+        layout.addWidget(transfers_group, 1)
+
+        # Start/Stop and Pause/Resume buttons
         button_layout = QHBoxLayout()
         button_layout.addStretch()
         self.start_btn = QPushButton("Start Download")
         self.start_btn.setMinimumWidth(150)
         self.start_btn.clicked.connect(self._toggle_download)
         button_layout.addWidget(self.start_btn)
+        self.pause_btn = QPushButton("Pause")
+        self.pause_btn.setMinimumWidth(100)
+        self.pause_btn.setEnabled(False)
+        self.pause_btn.clicked.connect(self._toggle_pause)
+        button_layout.addWidget(self.pause_btn)
         button_layout.addStretch()
         layout.addLayout(button_layout)
 
-        layout.addStretch()
-
     def _load_settings(self):
         """Load saved settings."""
         self.email_input.setText(self.settings.value("email", ""))
         self.password_input.setText(self.settings.value("password", ""))
-        self.year_checkbox.setChecked(self.settings.value("organize_by_year", False, type=bool))
+        default_layout = YEAR if self.settings.value("organize_by_year", False, type=bool) else FLAT
+        layout_index = self.layout_combo.findData(self.settings.value("layout", default_layout))
+        self.layout_combo.setCurrentIndex(max(layout_index, 0))
         self.videos_only_checkbox.setChecked(self.settings.value("videos_only", False, type=bool))
         self.save_assets_checkbox.setChecked(self.settings.value("save_assets", False, type=bool))
 
@@ -253,7 +311,7 @@ class MainWindow(QMainWindow):
         """Save current settings."""
         self.settings.setValue("email", self.email_input.text())
         self.settings.setValue("password", self.password_input.text())
-        self.settings.setValue("organize_by_year", self.year_checkbox.isChecked())
+        self.settings.setValue("layout", self.layout_combo.currentData())
         self.settings.setValue("videos_only", self.videos_only_checkbox.isChecked())
         self.settings.setValue("save_assets", self.save_assets_checkbox.isChecked())
         self.settings.setValue("frames", json.dumps(self.frames))
@@ -334,10 +392,22 @@ class MainWindow(QMainWindow):
         if self.worker and self.worker.isRunning():
             self.worker.cancel()
             self.start_btn.setEnabled(False)
+            self.pause_btn.setEnabled(False)
             self.status_label.setText("Stopping download...")
         else:
             self._start_download()
 
+    def _toggle_pause(self):
+        """Pause or resume the running download."""
+        if not (self.worker and self.worker.isRunning()):
+            return
+        if self.worker.is_paused():
+            self.worker.resume()
+            self.pause_btn.setText("Pause")
+        else:
+            self.worker.pause()
+            self.pause_btn.setText("Resume")
+
     def _start_download(self):
         """Start the download process."""
         email = self.email_input.text().strip()
@@ -389,14 +459,16 @@ class MainWindow(QMainWindow):
             password=password,
             frame_id=selected_frame['frame_id'],
             file_path=download_path,
-            organize_by_year=self.year_checkbox.isChecked(),
+            layout=self.layout_combo.currentData(),
             videos_only=self.videos_only_checkbox.isChecked(),
             save_assets_path=save_assets_path,
+            events=self.transfer_model.sink,
             parent=self
         )
 
         # Connect signals
         self.worker.progress_updated.connect(self._on_progress_updated)
+        self.worker.plan_ready.connect(self.transfer_model.set_plan)
         self.worker.status_changed.connect(self._on_status_changed)
         self.worker.download_complete.connect(self._on_download_complete)
         self.worker.error_occurred.connect(self._on_error)
@@ -404,8 +476,11 @@ class MainWindow(QMainWindow):
 
         # Update UI
         self.start_btn.setText("Stop Download")
+        self.pause_btn.setText("Pause")
+        self.pause_btn.setEnabled(True)
         self._set_controls_enabled(False)
         self.progress_bar.setValue(0)
+        self.transfer_model.clear()
 
         self.worker.start()
 
@@ -418,7 +493,7 @@ class MainWindow(QMainWindow):
         self.edit_frame_btn.setEnabled(enabled)
         self.remove_frame_btn.setEnabled(enabled)
         self.frame_combo.setEnabled(enabled)
-        self.year_checkbox.setEnabled(enabled)
+        self.layout_combo.setEnabled(enabled)
         self.videos_only_checkbox.setEnabled(enabled)
         self.save_assets_checkbox.setEnabled(enabled)
 
@@ -432,23 +507,36 @@ class MainWindow(QMainWindow):
 
     def _on_progress_updated(self, current: int, total: int, filename: str):
         """Handle progress update from worker."""
+        if self.worker and self.worker.is_paused():
+            return
         if total > 0:
             percent = int((current / total) * 100)
             self.progress_bar.setValue(percent)
         display_name = self._truncate_filename(filename)
         self.status_label.setText(f"Downloading: {display_name} ({current}/{total})")
 
+    def _on_state_filter_changed(self, _index: int):
+        """Show only the transfers in the chosen state."""
+        self.transfer_proxy.set_state(self.state_filter_combo.currentData())
+
+    def _on_transfer_counts_changed(self):
+        """Summarize the transfer table's states."""
+        counts = self.transfer_model.counts()
+        self.transfer_counts_label.setText(
+            ", ".join(f"{count} {state.lower()}" for state, count in counts.items() if count)
+        )
+
     def _on_status_changed(self, status: str):
         """Handle status change from worker."""
         self.status_label.setText(status)
 
-    def _on_download_complete(self, downloaded: int, skipped: int, total: int):
+    def _on_download_complete(self, downloaded: int, skipped: int, failed: int, total: int):
         """Handle download completion."""
         self.progress_bar.setValue(100)
         QMessageBox.information(
             self,
             "Download Complete",
-            f"Downloaded: {downloaded}\nSkipped: {skipped}\nTotal: {total}"
+            f"Downloaded: {downloaded}\nSkipped: {skipped}\nFailed: {failed}\nTotal: {total}"
         )
 
     def _on_error(self, error_msg: str):
@@ -458,7 +546,10 @@ class MainWindow(QMainWindow):
 
     def _on_worker_finished(self):
         """Handle worker thread completion."""
+        self.transfer_model.apply_pending()
         self.start_btn.setText("Start Download")
         self.start_btn.setEnabled(True)
+        self.pause_btn.setText("Pause")
+        self.pause_btn.setEnabled(False)
         self._set_controls_enabled(True)
         self.worker = None
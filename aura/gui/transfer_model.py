@@ -0,0 +1,252 @@
+"""Table model of a download's transfers, fed in batches by the worker's events."""
+
+import collections
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Qt, QTimer, pyqtSignal
+
+from .. import events as ev
+from ..estimate import format_bytes
+
+# Transfer states, in the order offered by the filter
+QUEUED = 'Queued'
+ACTIVE = 'Active'
+RETRYING = 'Retrying'
+DONE = 'Done'
+SKIPPED = 'Skipped'
+FAILED = 'Failed'
+STATES = (QUEUED, ACTIVE, RETRYING, DONE, SKIPPED, FAILED)
+
+COLUMNS = ('Name', 'Type', 'State', 'Size', 'Speed')
+NAME_COLUMN, TYPE_COLUMN, STATE_COLUMN, SIZE_COLUMN, SPEED_COLUMN = range(len(COLUMNS))
+
+# How often queued events are applied to the view
+UPDATE_INTERVAL_MS = 250
+
+
+class _Row:
+    """One transfer; slots keep six-figure row counts small."""
+
+    __slots__ = ('asset_id', 'component', 'name', 'state', 'size', 'speed', 'message')
+
+    def __init__(self, asset_id: str, component: str, name: str, state: str = QUEUED):
+        self.asset_id = asset_id
+        self.component = component
+        self.name = name
+        self.state = state
+        self.size: Optional[int] = None
+        self.speed: Optional[float] = None
+        self.message = ''
+
+
+class TransferEventSink(ev.EventSink):
+    """
+    Collects events on the worker thread for the model to apply on the GUI thread.
+
+    emit() only appends to a deque, so the download never waits on the GUI.
+    """
+
+    def __init__(self):
+        self._pending: Deque[Tuple[str, Dict[str, Any]]] = collections.deque()
+
+    def emit(self, event: str, **fields: Any) -> None:
+        self._pending.append((event, fields))
+
+    def drain(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Take every event queued so far."""
+        drained = []
+        while True:
+            try:
+                drained.append(self._pending.popleft())
+            except IndexError:
+                return drained
+
+
+class TransferTableModel(QAbstractTableModel):
+    """
+    Rows for every planned transfer, updated from a TransferEventSink.
+
+    Events are applied on a timer, so a burst of updates turns into one row
+    insertion and one dataChanged range per tick rather than a repaint per
+    transfer. Cell text is only formatted when the view asks for a visible row.
+    """
+
+    counts_changed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.sink = TransferEventSink()
+        self._rows: List[_Row] = []
+        self._by_key: Dict[Tuple[str, str], int] = {}
+        self._counts: Dict[str, int] = dict.fromkeys(STATES, 0)
+        self._timer = QTimer(self)
+        self._timer.setInterval(UPDATE_INTERVAL_MS)
+        self._timer.timeout.connect(self.apply_pending)
+        self._timer.start()
+
+    # Qt model interface
+
+    def rowCount(self, parent=QModelIndex()):  # pylint: disable=invalid-name
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):  # pylint: disable=invalid-name
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):  # pylint: disable=invalid-name
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        column = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == NAME_COLUMN:
+                return row.name
+            if column == TYPE_COLUMN:
+                return row.component
+            if column == STATE_COLUMN:
+                return row.state
+            if column == SIZE_COLUMN:
+                return format_bytes(row.size) if row.size is not None else ''
+            if column == SPEED_COLUMN:
+                return format_bytes(row.speed) + "/s" if row.speed else ''
+        elif role == Qt.ItemDataRole.ToolTipRole:
+            return row.message or row.name
+        elif role == Qt.ItemDataRole.TextAlignmentRole and column in (SIZE_COLUMN, SPEED_COLUMN):
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    # Feeding the model
+
+    def state_at(self, row: int) -> str:
+        """Get the state of a row without formatting any cell."""
+        return self._rows[row].state
+
+    def counts(self) -> Dict[str, int]:
+        """Get the number of transfers in each state."""
+        return dict(self._counts)
+
+    def clear(self) -> None:
+        """Remove every row and drop queued events."""
+        self.sink.drain()
+        self.beginResetModel()
+        self._rows = []
+        self._by_key = {}
+        self._counts = dict.fromkeys(STATES, 0)
+        self.endResetModel()
+        self.counts_changed.emit()
+
+    def set_plan(self, planned: List[Tuple[str, str, str]]) -> None:
+        """
+        Show every planned transfer as queued.
+
+        Args:
+            planned: (asset_id, component, key) for each transfer, in download order
+        """
+        # Events can overtake the plan on its way from the worker; keep what they reported
+        self.apply_pending()
+        seen = {(row.asset_id, row.component): row for row in self._rows}
+        rows = [
+            seen.pop((asset_id, component), None) or _Row(asset_id, component, key.rpartition('/')[2])
+            for asset_id, component, key in planned
+        ]
+        rows.extend(seen.values())
+
+        self.beginResetModel()
+        self._rows = rows
+        self._by_key = {(row.asset_id, row.component): number for number, row in enumerate(rows)}
+        self._counts = dict.fromkeys(STATES, 0)
+        for row in rows:
+            self._counts[row.state] += 1
+        self.endResetModel()
+        self.counts_changed.emit()
+
+    def apply_pending(self) -> None:
+        """Apply the events queued since the last tick as one batch of model updates."""
+        pending = self.sink.drain()
+        if not pending:
+            return
+
+        existing = len(self._rows)
+        added: List[_Row] = []
+        first_changed = existing
+        last_changed = -1
+
+        for event, fields in pending:
+            key = (str(fields.get('asset_id', '')), str(fields.get('component', '')))
+            number = self._by_key.get(key)
+            if number is None:
+                if event not in (ev.TRANSFER_START, ev.TRANSFER_DONE, ev.SKIP, ev.RETRY):
+                    continue
+                row = _Row(key[0], key[1], (fields.get('key') or key[0]).rpartition('/')[2])
+                self._counts[row.state] += 1
+                number = existing + len(added)
+                self._by_key[key] = number
+                added.append(row)
+            else:
+                row = self._rows[number] if number < existing else added[number - existing]
+
+            if not self._update_row(row, event, fields):
+                continue
+            if number < existing:
+                first_changed = min(first_changed, number)
+                last_changed = max(last_changed, number)
+
+        if added:
+            self.beginInsertRows(QModelIndex(), existing, existing + len(added) - 1)
+            self._rows.extend(added)
+            self.endInsertRows()
+        if last_changed >= 0:
+            self.dataChanged.emit(
+                self.index(first_changed, 0), self.index(last_changed, len(COLUMNS) - 1)
+            )
+        self.counts_changed.emit()
+
+    def _update_row(self, row: _Row, event: str, fields: Dict[str, Any]) -> bool:
+        """Apply one event to a row; returns False if the event doesn't concern rows."""
+        if event == ev.TRANSFER_START:
+            state = ACTIVE
+        elif event == ev.RETRY:
+            state = RETRYING
+            row.message = fields.get('message', '')
+        elif event == ev.SKIP:
+            state = SKIPPED
+        elif event == ev.TRANSFER_DONE:
+            if fields.get('ok'):
+                state = DONE
+                row.size = fields.get('bytes')
+                seconds = fields.get('seconds') or 0
+                row.speed = row.size / seconds if row.size and seconds > 0 else None
+                row.message = ''
+            else:
+                state = FAILED
+                row.message = fields.get('message', '')
+        else:
+            return False
+
+        self._counts[row.state] -= 1
+        self._counts[state] += 1
+        row.state = state
+        return True
+
+
+class TransferFilterProxy(QSortFilterProxyModel):
+    """Shows only the transfers in one state (or all of them)."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._state: Optional[str] = None
+
+    def set_state(self, state: Optional[str]) -> None:
+        """Filter to a state from STATES, or None for every transfer."""
+        self._state = state
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):  # pylint: disable=invalid-name
+        if self._state is None:
+            return True
+        return self.sourceModel().state_at(source_row) == self._state
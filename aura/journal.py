@@ -0,0 +1,142 @@
+"""Persistent journal of transfers that failed permanently."""
+
+import json
+import logging
+import os
+from dataclasses import asdict, replace
+from typing import Dict, List, Optional, Tuple
+
+from .summary import FailedTransfer
+
+LOGGER = logging.getLogger(__name__)
+
+JOURNAL_FILENAME = ".aura-failures.jsonl"
+
+
+class FailureJournal:
+    """
+    JSON-lines record of failed transfers, keyed by (asset_id, component).
+
+    Each failure and each resolution is appended as one line, so recording
+    stays cheap however many transfers fail; later lines override earlier
+    ones when the file is loaded, and a line cut short by a crash is skipped.
+    compact() rewrites the file atomically with only the open entries.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Location of the journal file; it is created on first write
+        """
+        self.path = path
+        self._entries: Dict[Tuple[str, str], FailedTransfer] = {}
+        if os.path.isfile(path):
+            self._load()
+
+    @classmethod
+    def for_directory(cls, file_path: str, shard: Optional[Tuple[int, int]] = None) -> "FailureJournal":
+        """
+        Open the journal kept in a frame's download directory.
+
+        Args:
+            file_path: The frame's download directory
+            shard: When sharding, each shard keeps its own journal so nodes
+                sharing the directory don't overwrite each other's entries
+        """
+        filename = JOURNAL_FILENAME
+        if shard is not None:
+            filename = JOURNAL_FILENAME.replace('.jsonl', f".shard-{shard[0]}-of-{shard[1]}.jsonl")
+        return cls(os.path.join(file_path, filename))
+
+    @classmethod
+    def find_in_directory(cls, file_path: str) -> List["FailureJournal"]:
+        """Open every journal (including per-shard journals) in a download directory."""
+        prefix = JOURNAL_FILENAME[:-len('.jsonl')]
+        if not os.path.isdir(file_path):
+            return []
+        return [
+            cls(os.path.join(file_path, filename))
+            for filename in sorted(os.listdir(file_path))
+            if filename.startswith(prefix) and filename.endswith('.jsonl')
+        ]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def entries(self) -> List[FailedTransfer]:
+        """Get all journaled failures, oldest first."""
+        return list(self._entries.values())
+
+    def record(self, failure: FailedTransfer) -> None:
+        """Add or update a failure, accumulating attempts across runs."""
+        key = (failure.asset_id, failure.component)
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            failure = replace(failure, attempts=failure.attempts + previous.attempts)
+        self._entries[key] = failure
+        self._append(asdict(failure))
+
+    def resolve(self, asset_id: str, component: str) -> None:
+        """Remove an entry once its transfer has succeeded."""
+        if self._entries.pop((asset_id, component), None) is None:
+            return
+        if self._entries:
+            self._append({'asset_id': asset_id, 'component': component, 'resolved': True})
+        else:
+            self._save()
+
+    def compact(self) -> None:
+        """Rewrite the file with one line per open entry, dropping superseded lines and resolutions."""
+        self._save()
+
+    def relocate(self, moved: Dict[str, str]) -> None:
+        """
+        Point entries at new file locations after files were moved.
+
+        Args:
+            moved: Mapping of old path to new path
+        """
+        changed = False
+        for key, failure in self._entries.items():
+            if failure.path in moved:
+                self._entries[key] = replace(failure, path=moved[failure.path])
+                changed = True
+        if changed:
+            self._save()
+
+    def _load(self) -> None:
+        with open(self.path, 'r') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    data = json.loads(line)
+                    if data.get('resolved'):
+                        self._entries.pop((data['asset_id'], data['component']), None)
+                        continue
+                    failure = FailedTransfer(**data)
+                except (AttributeError, KeyError, TypeError, ValueError) as e:
+                    LOGGER.warning("Ignoring bad journal line %i in %s: %s", line_number, self.path, e)
+                    continue
+                key = (failure.asset_id, failure.component)
+                self._entries.pop(key, None)
+                self._entries[key] = failure
+
+    def _append(self, line: Dict) -> None:
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(line) + "\n")
+
+    def _save(self) -> None:
+        if not self._entries:
+            if os.path.isfile(self.path):
+                os.remove(self.path)
+            return
+
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            for failure in self._entries.values():
+                f.write(json.dumps(asdict(failure)) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
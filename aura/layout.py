@@ -0,0 +1,162 @@
+"""Output directory layouts and migration between them."""
+
+import hashlib
+import logging
+import os
+import re
+from typing import Callable, Dict, Optional, Tuple
+
+from .exceptions import ConfigError
+from .storage import PARTIAL_SUFFIX, StorageBackend
+
+LOGGER = logging.getLogger(__name__)
+
+FLAT = 'flat'
+YEAR = 'year'
+YEAR_MONTH = 'year-month'
+HASH = 'hash'
+HASH2 = 'hash2'
+
+# Layout name -> description, in the order offered to users
+LAYOUTS: Dict[str, str] = {
+    FLAT: "all files in one folder",
+    YEAR: "one folder per year",
+    YEAR_MONTH: "year/month folders",
+    HASH: "256 folders keyed by a hash of the asset id",
+    HASH2: "65536 folders (two levels) keyed by a hash of the asset id",
+}
+
+# Start of the clean_time asset_filename puts in front of every name: the date taken
+_CLEAN_TIME_RE = re.compile(r'^\d{4}-\d{2}-\d{2}')
+
+
+def resolve_layout(layout: Optional[str] = None, organize_by_year: bool = False) -> str:
+    """
+    Pick the layout to use, honouring the legacy organize_by_year flag.
+
+    Args:
+        layout: Layout name, or None to fall back to organize_by_year
+        organize_by_year: Legacy flag; selects the 'year' layout when layout is None
+
+    Returns:
+        A key of LAYOUTS
+
+    Raises:
+        ConfigError: If the layout name is unknown
+    """
+    if layout is None:
+        return YEAR if organize_by_year else FLAT
+    if layout not in LAYOUTS:
+        raise ConfigError(f"Unknown layout '{layout}', expected one of: {', '.join(LAYOUTS)}")
+    return layout
+
+
+def asset_filename(clean_time: str, asset_id: str, source_name: str) -> str:
+    """Build the output filename for an asset component."""
+    return clean_time + "_" + asset_id + os.path.splitext(source_name)[1]
+
+
+def parse_filename(filename: str) -> Optional[Tuple[str, str]]:
+    """
+    Recover (clean_time, asset_id) from a filename built by asset_filename.
+
+    Returns:
+        The parsed tuple, or None if the name doesn't look like a downloaded asset
+        (such as a user's own IMG_1234.JPG)
+    """
+    stem = os.path.splitext(filename)[0]
+    clean_time, sep, asset_id = stem.rpartition('_')
+    if not sep or not asset_id or not _CLEAN_TIME_RE.match(clean_time):
+        return None
+    return clean_time, asset_id
+
+
+def asset_subdir(layout: str, clean_time: str, asset_id: str) -> str:
+    """
+    Get the directory, relative to the frame's file_path, for an asset.
+
+    Directories are separated by '/' so the result can be used as a storage key prefix.
+
+    Args:
+        layout: A key of LAYOUTS
+        clean_time: The asset's taken_at with ':' replaced by '-'
+        asset_id: The asset's id
+
+    Returns:
+        Relative directory path ('' for the flat layout)
+    """
+    if layout == YEAR:
+        return clean_time[:4]
+    if layout == YEAR_MONTH:
+        return clean_time[:4] + '/' + clean_time[5:7]
+    if layout in (HASH, HASH2):
+        digest = hashlib.sha1(asset_id.encode('utf-8')).hexdigest()
+        if layout == HASH:
+            return digest[:2]
+        return digest[:2] + '/' + digest[2:4]
+    return ''
+
+
+def asset_key(layout: str, clean_time: str, asset_id: str, filename: str) -> str:
+    """Get the storage key, relative to the frame's file_path, of an output file."""
+    subdir = asset_subdir(layout, clean_time, asset_id)
+    return subdir + '/' + filename if subdir else filename
+
+
+def migrate_layout(
+    storage: StorageBackend,
+    layout: str,
+    relocated: Optional[Callable[[str, str], None]] = None,
+) -> Tuple[int, int]:
+    """
+    Move an existing archive into a layout without downloading anything.
+
+    Every file whose name matches the downloader's naming scheme is moved to
+    where `layout` would place it. Partial downloads move with their files;
+    hidden files such as the failure journal are left alone and directories
+    emptied by the move are removed.
+
+    Args:
+        storage: The frame's storage backend
+        layout: Target layout, a key of LAYOUTS
+        relocated: Optional callback(old_key, new_key) for every moved file
+
+    Returns:
+        Tuple of (moved_count, unchanged_count)
+    """
+    moved = 0
+    unchanged = 0
+
+    # Collect first so files moved into a not-yet-visited directory aren't seen twice
+    found = list(storage.list_keys(include_partial=True))
+    existing = set(found)
+
+    for source in found:
+        filename = source.rpartition('/')[2]
+        # Partial downloads follow their final name
+        name = filename[:-len(PARTIAL_SUFFIX)] if filename.endswith(PARTIAL_SUFFIX) else filename
+        parsed = parse_filename(name)
+        if parsed is None:
+            LOGGER.debug("Leaving unrecognised file %s in place", storage.describe(source))
+            continue
+
+        target = asset_key(layout, parsed[0], parsed[1], filename)
+        if source == target:
+            unchanged += 1
+            continue
+        if target in existing:
+            LOGGER.warning("Not moving %s, %s already exists", storage.describe(source), storage.describe(target))
+            continue
+
+        storage.move(source, target)
+        existing.add(target)
+        if relocated:
+            relocated(source, target)
+        moved += 1
+
+    storage.remove_empty_directories()
+
+    LOGGER.info(
+        "Migrated %s to the '%s' layout: %i moved, %i already in place", storage.location, layout, moved, unchanged
+    )
+    return moved, unchanged
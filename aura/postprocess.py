@@ -0,0 +1,181 @@
+"""Optional CPU-bound post-processing of freshly downloaded files."""
+
+import calendar
+import importlib.util
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .exceptions import ConfigError
+from .layout import parse_filename
+
+LOGGER = logging.getLogger(__name__)
+
+THUMBNAIL_DIR = '.thumbnails'
+THUMBNAIL_SIZE = (320, 320)
+
+_TIMESTAMP_RE = re.compile(r'(\d{4})-(\d{2})-(\d{2})[T ](\d{2})[:-](\d{2})[:-](\d{2})')
+_VIDEO_EXTENSIONS = frozenset({'.mov', '.mp4', '.m4v', '.avi', '.3gp'})
+
+
+def _taken_at_timestamp(path: str, taken_at: Optional[str]) -> Optional[float]:
+    """Get a POSIX timestamp from taken_at, falling back to the file's name."""
+    if not taken_at:
+        parsed = parse_filename(os.path.basename(path))
+        taken_at = parsed[0] if parsed else ''
+    match = _TIMESTAMP_RE.search(taken_at)
+    if not match:
+        return None
+    fields = tuple(int(value) for value in match.groups()) + (0, 0, -1)
+    if taken_at.endswith('Z'):
+        return float(calendar.timegm(fields))
+    return time.mktime(fields)
+
+
+def set_mtime(path: str, info: Dict[str, Optional[str]]) -> None:
+    """Set the file's access and modification times to when the photo was taken."""
+    timestamp = _taken_at_timestamp(path, info.get('taken_at'))
+    if timestamp is not None:
+        os.utime(path, (timestamp, timestamp))
+
+
+def make_thumbnail(path: str, info: Dict[str, Optional[str]]) -> None:
+    """Write a JPEG thumbnail of a still photo to a hidden .thumbnails folder beside it."""
+    from PIL import Image  # pylint: disable=import-outside-toplevel
+
+    if os.path.splitext(path)[1].lower() in _VIDEO_EXTENSIONS:
+        return
+    if os.path.splitext(path)[1].lower() in ('.heic', '.heif'):
+        try:
+            _register_heif_opener()
+        except ImportError:
+            return
+
+    thumb_dir = os.path.join(os.path.dirname(path), THUMBNAIL_DIR)
+    os.makedirs(thumb_dir, exist_ok=True)
+    with Image.open(path) as image:
+        image.thumbnail(THUMBNAIL_SIZE)
+        image.convert('RGB').save(
+            os.path.join(thumb_dir, os.path.splitext(os.path.basename(path))[0] + '.jpg'), 'JPEG'
+        )
+
+
+def convert_heic(path: str, info: Dict[str, Optional[str]]) -> None:
+    """Write a JPEG copy next to every HEIC/HEIF still."""
+    from PIL import Image  # pylint: disable=import-outside-toplevel
+
+    if os.path.splitext(path)[1].lower() not in ('.heic', '.heif'):
+        return
+    _register_heif_opener()
+
+    jpeg_path = os.path.splitext(path)[0] + '.jpg'
+    with Image.open(path) as image:
+        image.convert('RGB').save(jpeg_path, 'JPEG', quality=92)
+    mtime = os.stat(path).st_mtime
+    os.utime(jpeg_path, (mtime, mtime))
+
+
+def _register_heif_opener() -> None:
+    from pillow_heif import register_heif_opener  # pylint: disable=import-outside-toplevel
+    register_heif_opener()
+
+
+# Processor name -> (function, (module, pip package) pairs it needs)
+PROCESSORS: Dict[str, Tuple[Callable, Tuple[Tuple[str, str], ...]]] = {
+    'set-mtime': (set_mtime, ()),
+    'thumbnail': (make_thumbnail, (('PIL', 'Pillow'),)),
+    'heic-to-jpeg': (convert_heic, (('PIL', 'Pillow'), ('pillow_heif', 'pillow-heif'))),
+}
+
+
+def _run_processors(names: List[str], path: str, info: Dict[str, Optional[str]]) -> None:
+    """Run the named processors on one file; executed in a worker process."""
+    for name in names:
+        PROCESSORS[name][0](path, info)
+
+
+class PostProcessor:
+    """
+    Runs processors on downloaded files in a process pool.
+
+    submit() blocks once `max_pending` files are queued, so a slow processor
+    holds back the downloads feeding it instead of buffering without bound.
+    One PostProcessor can be shared by concurrent downloads.
+    """
+
+    def __init__(
+        self,
+        processors: List[str],
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+    ):
+        """
+        Args:
+            processors: Names of processors to run, in order (keys of PROCESSORS)
+            max_workers: Size of the process pool (defaults to the CPU count)
+            max_pending: Files allowed to wait for a worker (defaults to 2 per worker)
+
+        Raises:
+            ConfigError: If a processor is unknown or its optional dependency is missing,
+                or max_workers is less than 1
+        """
+        if max_workers is not None and max_workers < 1:
+            raise ConfigError(f"Invalid number of post-processing workers {max_workers}, expected 1 or more")
+        for name in processors:
+            if name not in PROCESSORS:
+                raise ConfigError(
+                    f"Unknown post-processor '{name}', expected one of: {', '.join(PROCESSORS)}"
+                )
+            for module, package in PROCESSORS[name][1]:
+                if importlib.util.find_spec(module) is None:
+                    raise ConfigError(f"Post-processor '{name}' requires {package} (pip install {package})")
+
+        workers = max_workers or os.cpu_count() or 1
+        self.processors = list(processors)
+        self._executor = ProcessPoolExecutor(max_workers=workers)
+        self._slots = threading.BoundedSemaphore(max_pending or 2 * workers)
+        self._lock = threading.Lock()
+        self.processed = 0
+        self.failed = 0
+
+    def __enter__(self) -> "PostProcessor":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def submit(self, path: str, taken_at: Optional[str] = None) -> None:
+        """
+        Queue a freshly written file, blocking while the queue is full.
+
+        Args:
+            path: The downloaded file
+            taken_at: The asset's taken_at, if known
+        """
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(_run_processors, self.processors, path, {'taken_at': taken_at})
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda done: self._finished(path, done))
+
+    def _finished(self, path: str, future: Future) -> None:
+        self._slots.release()
+        error = future.exception()
+        with self._lock:
+            if error is None:
+                self.processed += 1
+            else:
+                self.failed += 1
+        if error is not None:
+            LOGGER.error("Post-processing %s failed: %s", os.path.basename(path), error)
+
+    def close(self) -> None:
+        """Wait for queued files to finish and shut the pool down."""
+        self._executor.shutdown(wait=True)
+        LOGGER.info("Post-processed %i files (%i failed)", self.processed, self.failed)
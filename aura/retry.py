@@ -0,0 +1,178 @@
+"""Retry policy, error classification and circuit breaker for transfers."""
+
+import logging
+import random
+import threading
+import time
+from typing import Optional
+
+import requests
+
+LOGGER = logging.getLogger(__name__)
+
+# HTTP status codes worth retrying: timeouts, throttling and server-side errors
+TRANSIENT_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    Classify an exception raised during a transfer.
+
+    Args:
+        error: The exception raised while downloading
+
+    Returns:
+        True if retrying later may succeed, False if the failure is permanent
+    """
+    if isinstance(error, requests.HTTPError):
+        response = error.response
+        return response is not None and response.status_code in TRANSIENT_STATUS_CODES
+    if isinstance(error, (
+        requests.ConnectionError,
+        requests.Timeout,
+        requests.exceptions.ChunkedEncodingError,
+        requests.exceptions.ContentDecodingError,
+    )):
+        return True
+    return False
+
+
+class RetryPolicy:
+    """Capped exponential backoff with jitter."""
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        base_delay: float = 5.0,
+        max_delay: float = 300.0,
+        jitter: float = 0.5,
+    ):
+        """
+        Args:
+            max_attempts: Total attempts per transfer, including the first one
+            base_delay: Delay in seconds before the first retry
+            max_delay: Upper bound on any single delay
+            jitter: Fraction of each delay that is randomised (0 disables jitter)
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    def should_retry(self, error: Exception, attempts: int) -> bool:
+        """Return True if a transfer that has failed `attempts` times should be re-queued."""
+        return attempts < self.max_attempts and is_transient_error(error)
+
+    def delay(self, attempts: int) -> float:
+        """
+        Get the backoff delay after a given number of failed attempts.
+
+        Args:
+            attempts: Number of attempts made so far (1 after the first failure)
+
+        Returns:
+            Delay in seconds
+        """
+        delay = min(self.max_delay, self.base_delay * (2 ** max(attempts - 1, 0)))
+        spread = delay * self.jitter
+        return delay - spread + random.uniform(0, spread)
+
+
+class CircuitBreaker:
+    """
+    Stop sending requests to a host after repeated transient failures.
+
+    After `failure_threshold` consecutive failures the circuit opens for
+    `reset_timeout` seconds. Once the timeout elapses allow() lets exactly one
+    trial request through and turns every other caller away until its outcome
+    is recorded; success closes the circuit, failure opens it again with the
+    timeout doubled (up to `max_reset_timeout`).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 60.0,
+        max_reset_timeout: float = 900.0,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self._failures = 0
+        self._timeout = reset_timeout
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """True while the circuit is open (including the half-open trial period)."""
+        return self._opened_at is not None
+
+    def remaining(self) -> float:
+        """Seconds until the reset timeout elapses (0 once it has, even while a trial is in flight)."""
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self._opened_at + self._timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """
+        Claim permission to send a request.
+
+        Returns:
+            True while the circuit is closed, or for the one caller whose request
+            becomes the half-open trial (is_open is still True for it); False
+            while the circuit is open and for everyone else during the trial
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial_in_flight or self.remaining():
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self, trial: bool = False) -> None:
+        """
+        Close the circuit after a successful request.
+
+        Args:
+            trial: True if the request was the half-open trial
+        """
+        with self._lock:
+            if self._opened_at is not None:
+                LOGGER.info("Circuit for %s closed", self.name)
+            self._failures = 0
+            self._timeout = self.reset_timeout
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self, trial: bool = False) -> None:
+        """
+        Count a transient failure, opening the circuit when the threshold is reached.
+
+        Args:
+            trial: True if the request was the half-open trial; other failures
+                while the circuit is open come from requests sent before it
+                opened and change nothing
+        """
+        with self._lock:
+            if self._opened_at is not None:
+                if not trial:
+                    return
+                # The half-open trial failed
+                self._trial_in_flight = False
+                self._failures += 1
+                self._timeout = min(self._timeout * 2, self.max_reset_timeout)
+            else:
+                self._failures += 1
+                if self._failures < self.failure_threshold:
+                    return
+
+            self._opened_at = time.monotonic()
+            LOGGER.warning(
+                "Circuit for %s opened after %i consecutive failures, pausing for %.0fs",
+                self.name, self._failures, self._timeout,
+            )
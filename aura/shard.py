@@ -0,0 +1,52 @@
+"""Deterministic splitting of a frame's assets across machines."""
+
+import hashlib
+from typing import Tuple
+
+
+def parse_shard(text: str) -> Tuple[int, int]:
+    """
+    Parse a shard specification of the form 'i/N'.
+
+    Shards are numbered from 1, so '1/3', '2/3' and '3/3' together cover a frame.
+
+    Args:
+        text: The shard specification
+
+    Returns:
+        Tuple of (index, count)
+
+    Raises:
+        ValueError: If the specification is malformed or out of range
+    """
+    index_text, sep, count_text = text.partition('/')
+    if not sep:
+        raise ValueError(f"Invalid shard '{text}', expected i/N")
+    index, count = int(index_text), int(count_text)
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard '{text}', expected 1 <= i <= N")
+    return index, count
+
+
+def format_shard(shard: Tuple[int, int]) -> str:
+    """Format a shard as 'i/N'."""
+    return f"{shard[0]}/{shard[1]}"
+
+
+def asset_in_shard(asset_id: str, shard: Tuple[int, int]) -> bool:
+    """
+    Check whether an asset belongs to a shard.
+
+    The split depends only on the asset id, so every node computes the same
+    disjoint partition without coordinating.
+
+    Args:
+        asset_id: The asset's id
+        shard: Tuple of (index, count) as returned by parse_shard
+
+    Returns:
+        True if the asset is handled by this shard
+    """
+    index, count = shard
+    digest = hashlib.sha1(asset_id.encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % count == index - 1
@@ -0,0 +1,382 @@
+"""Storage backends for downloaded files: the local filesystem or an S3-compatible bucket."""
+
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, List, Optional, Set
+
+from .exceptions import ConfigError
+
+LOGGER = logging.getLogger(__name__)
+
+PARTIAL_SUFFIX = ".part"
+S3_SCHEME = "s3://"
+S3_PART_SIZE = 8 * 1024 * 1024
+
+
+class Sink(ABC):
+    """An object being written to a backend; see StorageBackend.open_sink()."""
+
+    @abstractmethod
+    def write(self, chunk: bytes) -> None:
+        """Append a chunk."""
+
+    def sync(self) -> None:
+        """Make the data written so far durable (a no-op where the backend already is)."""
+
+    @abstractmethod
+    def commit(self) -> None:
+        """Publish the object under its final key."""
+
+    @abstractmethod
+    def abort(self) -> None:
+        """Stop writing; whatever the backend can resume from is kept."""
+
+
+class StorageBackend(ABC):
+    """
+    Where a frame's files are kept.
+
+    Keys are paths relative to the frame's root using '/' separators, as
+    produced by the layout functions.
+    """
+
+    #: Location shown in log messages
+    location = ''
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """Return True if a complete object exists under key."""
+
+    @abstractmethod
+    def list_keys(self, prefix: str = '', include_partial: bool = False) -> Iterator[str]:
+        """
+        Yield the keys of objects under a directory prefix, recursively.
+
+        Args:
+            prefix: Directory prefix ('' for everything)
+            include_partial: Also yield the keys of resumable partial objects
+                (their final key plus PARTIAL_SUFFIX), where the backend keeps any
+        """
+
+    def list_directory(self, prefix: str) -> Set[str]:
+        """Get the keys of complete objects directly under a directory prefix."""
+        prefix = prefix.rstrip('/')
+        return {
+            key for key in self.list_keys(prefix)
+            if key.rpartition('/')[0] == prefix
+        }
+
+    def partial_size(self, key: str) -> int:
+        """Bytes of an interrupted transfer that can be resumed (0 if none or unsupported)."""
+        return 0
+
+    @abstractmethod
+    def open_sink(self, key: str, offset: int = 0) -> Sink:
+        """
+        Start writing an object.
+
+        Args:
+            key: Final key of the object
+            offset: Resume after this many bytes of a partial object (see partial_size)
+        """
+
+    @abstractmethod
+    def move(self, source_key: str, target_key: str) -> None:
+        """Rename an object."""
+
+    def makedirs(self, prefix: str) -> None:
+        """Make sure a directory prefix can be written to."""
+
+    def sync_directories(self, keys: List[str]) -> None:
+        """Make renames of the given keys durable."""
+
+    def remove_empty_directories(self) -> None:
+        """Remove directories left empty by moves (a no-op where directories aren't real)."""
+
+    def local_path(self, key: str) -> Optional[str]:
+        """Filesystem path of a key, or None for remote backends."""
+        return None
+
+    @abstractmethod
+    def state_dir(self) -> str:
+        """Local directory for bookkeeping such as the failure journal."""
+
+    def describe(self, key: str) -> str:
+        """Human-readable location of a key."""
+        return self.location.rstrip('/') + '/' + key
+
+
+class _LocalSink(Sink):
+    def __init__(self, path: str, offset: int):
+        self.path = path
+        self.part_path = path + PARTIAL_SUFFIX
+        self._file = open(self.part_path, 'ab' if offset else 'wb')
+        if offset:
+            self._file.truncate(offset)
+
+    def write(self, chunk: bytes) -> None:
+        self._file.write(chunk)
+
+    def sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def commit(self) -> None:
+        self._file.close()
+        os.replace(self.part_path, self.path)
+
+    def abort(self) -> None:
+        self._file.close()
+
+
+class LocalStorage(StorageBackend):
+    """Files in a local (or mounted network) directory."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.location = root
+
+    def _path(self, key: str) -> str:
+        if os.path.isabs(key):
+            # Journals written before storage keys were relative hold absolute paths
+            return key
+        return os.path.join(self.root, *key.split('/')) if key else self.root
+
+    def exists(self, key: str) -> bool:
+        return os.path.isfile(self._path(key))
+
+    def list_keys(self, prefix: str = '', include_partial: bool = False) -> Iterator[str]:
+        for dirpath, dirnames, filenames in os.walk(self._path(prefix)):
+            dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+            relative = os.path.relpath(dirpath, self.root).replace(os.sep, '/')
+            relative = '' if relative == '.' else relative + '/'
+            for filename in filenames:
+                if filename.startswith('.'):
+                    continue
+                if include_partial or not filename.endswith(PARTIAL_SUFFIX):
+                    yield relative + filename
+
+    def list_directory(self, prefix: str) -> Set[str]:
+        prefix = prefix.rstrip('/')
+        try:
+            entries = os.listdir(self._path(prefix))
+        except FileNotFoundError:
+            return set()
+        base = prefix + '/' if prefix else ''
+        return {base + name for name in entries if not name.endswith(PARTIAL_SUFFIX)}
+
+    def partial_size(self, key: str) -> int:
+        try:
+            return os.path.getsize(self._path(key) + PARTIAL_SUFFIX)
+        except OSError:
+            return 0
+
+    def open_sink(self, key: str, offset: int = 0) -> Sink:
+        return _LocalSink(self._path(key), offset)
+
+    def move(self, source_key: str, target_key: str) -> None:
+        target = self._path(target_key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(self._path(source_key), target)
+
+    def makedirs(self, prefix: str) -> None:
+        os.makedirs(self._path(prefix), exist_ok=True)
+
+    def sync_directories(self, keys: List[str]) -> None:
+        for directory in {os.path.dirname(self._path(key)) for key in keys}:
+            try:
+                fd = os.open(directory, os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                os.fsync(fd)
+            except OSError:
+                pass
+            finally:
+                os.close(fd)
+
+    def remove_empty_directories(self) -> None:
+        for dirpath, _, _ in sorted(os.walk(self.root), key=lambda entry: len(entry[0]), reverse=True):
+            if os.path.normpath(dirpath) != os.path.normpath(self.root) and not os.listdir(dirpath):
+                os.rmdir(dirpath)
+
+    def local_path(self, key: str) -> Optional[str]:
+        return self._path(key)
+
+    def state_dir(self) -> str:
+        return self.root
+
+    def describe(self, key: str) -> str:
+        return self._path(key)
+
+
+class _S3Sink(Sink):
+    """Streams an object to S3 as a multipart upload, falling back to one PUT for small objects."""
+
+    def __init__(self, client, bucket: str, key: str):
+        self._client = client
+        self._bucket = bucket
+        self._key = key
+        self._buffer = bytearray()
+        self._upload_id: Optional[str] = None
+        self._parts: List[Dict] = []
+
+    def write(self, chunk: bytes) -> None:
+        self._buffer.extend(chunk)
+        if len(self._buffer) >= S3_PART_SIZE:
+            self._upload_part()
+
+    def _upload_part(self) -> None:
+        if self._upload_id is None:
+            self._upload_id = self._client.create_multipart_upload(
+                Bucket=self._bucket, Key=self._key
+            )['UploadId']
+        number = len(self._parts) + 1
+        response = self._client.upload_part(
+            Bucket=self._bucket, Key=self._key, UploadId=self._upload_id,
+            PartNumber=number, Body=bytes(self._buffer),
+        )
+        self._parts.append({'ETag': response['ETag'], 'PartNumber': number})
+        self._buffer.clear()
+
+    def commit(self) -> None:
+        if self._upload_id is None:
+            self._client.put_object(Bucket=self._bucket, Key=self._key, Body=bytes(self._buffer))
+            return
+        if self._buffer:
+            self._upload_part()
+        self._client.complete_multipart_upload(
+            Bucket=self._bucket, Key=self._key, UploadId=self._upload_id,
+            MultipartUpload={'Parts': self._parts},
+        )
+
+    def abort(self) -> None:
+        if self._upload_id is not None:
+            self._client.abort_multipart_upload(
+                Bucket=self._bucket, Key=self._key, UploadId=self._upload_id
+            )
+        self._buffer.clear()
+
+
+class S3Storage(StorageBackend):
+    """
+    Objects in an S3-compatible bucket (AWS S3, MinIO, ...).
+
+    Credentials come from the usual boto3 sources (environment, ~/.aws).
+    Interrupted uploads are aborted, so transfers restart rather than resume
+    across runs; a pause within a run keeps the upload open.
+    """
+
+    def __init__(self, url: str, endpoint_url: Optional[str] = None, client=None):
+        """
+        Args:
+            url: Location of the form s3://bucket/prefix
+            endpoint_url: Custom endpoint, e.g. http://localhost:9000 for MinIO
+            client: Optional preconfigured boto3 S3 client
+
+        Raises:
+            ConfigError: If boto3 is not installed or the URL is malformed
+        """
+        bucket, _, prefix = url[len(S3_SCHEME):].partition('/')
+        if not bucket:
+            raise ConfigError(f"Invalid S3 location '{url}', expected s3://bucket/prefix")
+        if client is None:
+            try:
+                import boto3  # pylint: disable=import-outside-toplevel
+            except ImportError:
+                raise ConfigError("S3 storage requires boto3 (pip install boto3)")
+            client = boto3.client('s3', endpoint_url=endpoint_url)
+
+        self.bucket = bucket
+        self.prefix = prefix.strip('/')
+        self.location = url
+        self._client = client
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def exists(self, key: str) -> bool:
+        try:
+            self._client.head_object(Bucket=self.bucket, Key=self._key(key))
+        except self._client.exceptions.ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return False
+            raise
+        return True
+
+    def list_keys(self, prefix: str = '', include_partial: bool = False) -> Iterator[str]:
+        full_prefix = self._key(prefix.rstrip('/')) if prefix else self.prefix
+        if full_prefix:
+            full_prefix += '/'
+        strip = len(self.prefix) + 1 if self.prefix else 0
+        paginator = self._client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=full_prefix):
+            for entry in page.get('Contents', []):
+                yield entry['Key'][strip:]
+
+    def list_directory(self, prefix: str) -> Set[str]:
+        prefix = prefix.rstrip('/')
+        full_prefix = self._key(prefix) + '/' if prefix else (self.prefix + '/' if self.prefix else '')
+        strip = len(self.prefix) + 1 if self.prefix else 0
+        keys = set()
+        paginator = self._client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=full_prefix, Delimiter='/'):
+            keys.update(entry['Key'][strip:] for entry in page.get('Contents', []))
+        return keys
+
+    def open_sink(self, key: str, offset: int = 0) -> Sink:
+        return _S3Sink(self._client, self.bucket, self._key(key))
+
+    def move(self, source_key: str, target_key: str) -> None:
+        self._client.copy(
+            {'Bucket': self.bucket, 'Key': self._key(source_key)}, self.bucket, self._key(target_key)
+        )
+        self._client.delete_object(Bucket=self.bucket, Key=self._key(source_key))
+
+    def state_dir(self) -> str:
+        path = os.path.join(os.path.expanduser('~'), '.aura', 's3', self.bucket, *self.prefix.split('/'))
+        os.makedirs(path, exist_ok=True)
+        return path
+
+
+def open_storage(file_path: str, endpoint_url: Optional[str] = None) -> StorageBackend:
+    """
+    Get the backend for a frame's file_path.
+
+    Args:
+        file_path: A local directory, or s3://bucket/prefix
+        endpoint_url: S3 endpoint override (ignored for local paths)
+
+    Returns:
+        StorageBackend instance
+    """
+    if file_path.startswith(S3_SCHEME):
+        return S3Storage(file_path, endpoint_url=endpoint_url)
+    return LocalStorage(file_path)
+
+
+class ExistingIndex:
+    """
+    Answers "is this key already stored?" from one listing per directory.
+
+    Replaces a stat (or HEAD request) per file with a single listing of each
+    directory the first time it is asked about.
+    """
+
+    def __init__(self, backend: StorageBackend):
+        self.backend = backend
+        self._listings: Dict[str, Set[str]] = {}
+
+    def __contains__(self, key: str) -> bool:
+        directory = key.rpartition('/')[0]
+        listing = self._listings.get(directory)
+        if listing is None:
+            listing = self._listings[directory] = self.backend.list_directory(directory)
+        return key in listing
+
+    def add(self, key: str) -> None:
+        """Record a key that was just written."""
+        directory = key.rpartition('/')[0]
+        if directory in self._listings:
+            self._listings[directory].add(key)
@@ -0,0 +1,126 @@
+"""Result types returned by the downloader."""
+
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+
+@dataclass
+class FailedTransfer:
+    """A transfer that did not succeed by the end of a run."""
+
+    asset_id: str
+    component: str
+    url: Optional[str]
+    path: Optional[str]
+    error: str
+    message: str
+    attempts: int
+
+
+@dataclass
+class Estimate:
+    """Pre-flight estimate of what a sync would transfer; see aura.estimate."""
+
+    files: int = 0
+    bytes: int = 0
+    unknown: int = 0
+    by_type: Dict[str, int] = field(default_factory=dict)
+    by_year: Dict[str, int] = field(default_factory=dict)
+    free_bytes: Optional[int] = None
+    throughput: Optional[float] = None
+    seconds: Optional[float] = None
+
+    @property
+    def fits(self) -> Optional[bool]:
+        """True if the bytes fit in the free space, None when free space is unknown."""
+        if self.free_bytes is None:
+            return None
+        return self.bytes <= self.free_bytes
+
+    @classmethod
+    def merge(cls, estimates: Iterable["Estimate"]) -> "Estimate":
+        """
+        Combine the estimates of disjoint runs that go side by side, such as the shards of one frame.
+
+        Returns:
+            An estimate with files, bytes and breakdowns summed, the least free
+            space of any run, their combined throughput and the longest projected time
+        """
+        merged = cls()
+        free, throughput, seconds = [], [], []
+        for estimate in estimates:
+            merged.files += estimate.files
+            merged.bytes += estimate.bytes
+            merged.unknown += estimate.unknown
+            for totals, counts in ((merged.by_type, estimate.by_type), (merged.by_year, estimate.by_year)):
+                for group, count in counts.items():
+                    totals[group] = totals.get(group, 0) + count
+            if estimate.free_bytes is not None:
+                free.append(estimate.free_bytes)
+            if estimate.throughput is not None:
+                throughput.append(estimate.throughput)
+            if estimate.seconds is not None:
+                seconds.append(estimate.seconds)
+        merged.free_bytes = min(free) if free else None
+        merged.throughput = sum(throughput) if throughput else None
+        merged.seconds = max(seconds) if seconds else None
+        return merged
+
+
+@dataclass
+class DownloadSummary:
+    """
+    Outcome of a download run.
+
+    Iterating yields (downloaded, skipped, total), so existing callers can keep
+    unpacking the result as a 3-tuple.
+    """
+
+    downloaded: int = 0
+    skipped: int = 0
+    total: int = 0
+    failed: List[FailedTransfer] = field(default_factory=list)
+    shards: List[str] = field(default_factory=list)
+    estimate: Optional[Estimate] = None
+
+    def __iter__(self):
+        return iter((self.downloaded, self.skipped, self.total))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serialisable dictionary."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DownloadSummary":
+        """Rebuild a summary written by to_dict."""
+        return cls(
+            downloaded=data.get('downloaded', 0),
+            skipped=data.get('skipped', 0),
+            total=data.get('total', 0),
+            failed=[FailedTransfer(**failure) for failure in data.get('failed', [])],
+            shards=list(data.get('shards', [])),
+            estimate=Estimate(**data['estimate']) if data.get('estimate') else None,
+        )
+
+    @classmethod
+    def merge(cls, summaries: Iterable["DownloadSummary"]) -> "DownloadSummary":
+        """
+        Combine the summaries of disjoint runs, such as the shards of one frame.
+
+        Returns:
+            A summary with counts summed, failures and shard labels concatenated
+            and estimates combined by Estimate.merge (None if no run estimated)
+        """
+        merged = cls()
+        estimates = []
+        for summary in summaries:
+            merged.downloaded += summary.downloaded
+            merged.skipped += summary.skipped
+            merged.total += summary.total
+            merged.failed.extend(summary.failed)
+            merged.shards.extend(summary.shards)
+            if summary.estimate is not None:
+                estimates.append(summary.estimate)
+        if estimates:
+            merged.estimate = Estimate.merge(estimates)
+        return merged
@@ -0,0 +1,53 @@
+"""Request-rate throttling shared by the transfers of one account."""
+
+import math
+import threading
+import time
+from typing import Union
+
+
+class Throttle:
+    """
+    Space out transfer starts so an account stays within its request budget.
+
+    One Throttle is shared by every frame synced with the same account, so
+    accounts are throttled independently of each other.
+    """
+
+    def __init__(self, interval: float):
+        """
+        Args:
+            interval: Minimum number of seconds between transfer starts
+        """
+        self.interval = interval
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Claim the next transfer slot.
+
+        Returns:
+            Seconds the caller must wait before starting its transfer
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+            return slot - now
+
+
+def parse_interval(text: Union[str, float]) -> float:
+    """
+    Read a number of seconds between transfer starts, e.g. from --delay.
+
+    Raises:
+        ValueError: If the value is not a finite number of 0 or more
+    """
+    try:
+        interval = float(str(text).strip())
+    except ValueError:
+        interval = -1.0
+    if not math.isfinite(interval) or interval < 0:
+        raise ValueError(f"Invalid delay '{text}', expected a number of seconds of 0 or more")
+    return interval
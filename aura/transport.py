@@ -0,0 +1,215 @@
+"""HTTP transports: requests' own HTTP/1.1 connection pool, or HTTP/2 multiplexing through httpx."""
+
+import asyncio
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .exceptions import ConfigError
+
+LOGGER = logging.getLogger(__name__)
+
+HTTP1 = 'http1'
+HTTP2 = 'http2'
+TRANSPORTS = (HTTP1, HTTP2)
+# Connections kept per HTTP/2 client; each carries as many requests at once as the server allows
+HTTP2_MAX_CONNECTIONS = 4
+
+# Connection-specific headers requests adds for HTTP/1.1, which HTTP/2 forbids
+_HOP_BY_HOP_HEADERS = frozenset({'connection', 'keep-alive', 'proxy-connection', 'transfer-encoding', 'upgrade'})
+
+
+@contextmanager
+def _translate_errors(reading: bool = False) -> Iterator[None]:
+    """Re-raise httpx errors as the requests exceptions the retry classification knows."""
+    import httpx  # pylint: disable=import-outside-toplevel
+    try:
+        yield
+    except httpx.ConnectTimeout as e:
+        raise requests.exceptions.ConnectTimeout(e)
+    except httpx.TimeoutException as e:
+        raise requests.exceptions.ReadTimeout(e)
+    except httpx.DecodingError as e:
+        raise requests.exceptions.ContentDecodingError(e)
+    except (httpx.ReadError, httpx.RemoteProtocolError) as e:
+        if reading:
+            raise requests.exceptions.ChunkedEncodingError(e)
+        raise requests.ConnectionError(e)
+    except httpx.TransportError as e:
+        raise requests.ConnectionError(e)
+    except httpx.HTTPError as e:
+        raise requests.RequestException(e)
+
+
+class _StreamedBody:
+    """
+    Stand-in for urllib3's response object (a requests Response's raw) over a streamed httpx response.
+
+    read() returns the body as sent, as urllib3 does for requests, while
+    stream(), which Response.iter_content() and .content use, decodes it.
+    """
+
+    def __init__(self, adapter: "Http2Adapter", response):
+        self._adapter = adapter
+        self._response = response
+        self._chunks = None
+        self._buffer = bytearray()
+
+    def _next_chunk(self) -> Optional[bytes]:
+        async def next_chunk():
+            try:
+                return await self._chunks.__anext__()
+            except StopAsyncIteration:
+                return None
+        with _translate_errors(reading=True):
+            return self._adapter.run(next_chunk())
+
+    def read(self, amt: Optional[int] = None, decode_content: bool = False) -> bytes:
+        if self._chunks is None:
+            self._chunks = self._response.aiter_bytes() if decode_content else self._response.aiter_raw()
+        while amt is None or len(self._buffer) < amt:
+            chunk = self._next_chunk()
+            if chunk is None:
+                break
+            self._buffer += chunk
+        size = len(self._buffer) if amt is None else amt
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def stream(self, amt: int = 2 ** 16, decode_content: bool = True) -> Iterator[bytes]:
+        while True:
+            data = self.read(amt, decode_content)
+            if not data:
+                return
+            yield data
+
+    def close(self) -> None:
+        self._adapter.run(self._response.aclose())
+
+
+class Http2Adapter(BaseAdapter):
+    """
+    requests transport adapter that sends requests through an httpx client speaking HTTP/2.
+
+    Mounted on a requests.Session, callers keep the requests API (responses,
+    raise_for_status(), exceptions) while all requests to a host share a few
+    connections, each multiplexing many requests in flight, so concurrent
+    fetches of small files no longer each need a connection of their own.
+    Servers that don't offer HTTP/2 are spoken to over HTTP/1.1.
+
+    httpx's synchronous HTTP/2 connections aren't thread-safe, so an async
+    client runs on an event loop thread of its own and callers hand it
+    their requests (and body reads); any number of threads can use one
+    adapter. GETs and HEADs cut off by a connection closing before their
+    response arrived, as servers do after a set number of requests, are
+    resent once on a new connection.
+
+    TLS and proxy settings come from the httpx client; the per-request verify,
+    cert and proxies arguments of requests are ignored. Cookies are not stored.
+    """
+
+    def __init__(self, client=None):
+        """
+        Args:
+            client: Optional preconfigured httpx.AsyncClient, e.g.
+                httpx.AsyncClient(http1=False, http2=True) to speak HTTP/2 without
+                TLS to a local test server
+
+        Raises:
+            ConfigError: If httpx or its HTTP/2 support is not installed
+        """
+        super().__init__()
+        if client is None:
+            try:
+                import httpx  # pylint: disable=import-outside-toplevel
+                client = httpx.AsyncClient(
+                    http2=True,
+                    limits=httpx.Limits(
+                        max_connections=HTTP2_MAX_CONNECTIONS, max_keepalive_connections=HTTP2_MAX_CONNECTIONS,
+                    ),
+                )
+            except ImportError:
+                raise ConfigError("The http2 transport requires httpx with HTTP/2 support (pip install 'httpx[http2]')")
+        self._client = client
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="aura-http2", daemon=True)
+        self._thread.start()
+
+    def run(self, coroutine):
+        """Run a coroutine on the client's event loop and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        """Send a PreparedRequest, returning a requests.Response."""
+        import httpx  # pylint: disable=import-outside-toplevel
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            timeout = httpx.Timeout(read, connect=connect)
+        headers = {
+            name: value for name, value in request.headers.items() if name.lower() not in _HOP_BY_HOP_HEADERS
+        }
+        resend = request.method in ('GET', 'HEAD')
+        with _translate_errors():
+            while True:
+                sent = self._client.build_request(
+                    request.method, request.url, headers=headers, content=request.body,
+                    timeout=httpx.Timeout(timeout),
+                )
+                try:
+                    received = self.run(self._client.send(sent, stream=True))
+                    break
+                except httpx.RemoteProtocolError as e:
+                    if not resend:
+                        raise
+                    LOGGER.debug("Resending %s %s after the connection closed: %s", request.method, request.url, e)
+                    resend = False
+
+        response = requests.Response()
+        response.status_code = received.status_code
+        response.headers = CaseInsensitiveDict(received.headers.multi_items())
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.reason = received.reason_phrase
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.raw = _StreamedBody(self, received)
+        LOGGER.debug("%s %s: %i over %s", request.method, request.url, received.status_code, received.http_version)
+        return response
+
+    def close(self) -> None:
+        """Close the httpx client and its connections, and stop the event loop thread."""
+        if self._loop.is_closed():
+            return
+        self.run(self._client.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+def new_session(transport: Optional[str] = None) -> requests.Session:
+    """
+    Create a requests.Session sending its requests over the given transport.
+
+    Args:
+        transport: 'http1' (the default) for requests' own connection pool, or
+            'http2' to multiplex requests over a few HTTP/2 connections
+
+    Raises:
+        ConfigError: If the transport is unknown or its optional dependency is missing
+    """
+    transport = (transport or HTTP1).strip().lower()
+    if transport not in TRANSPORTS:
+        raise ConfigError(f"Unknown transport '{transport}', expected one of: {', '.join(TRANSPORTS)}")
+    session = requests.Session()
+    if transport == HTTP2:
+        adapter = Http2Adapter()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+    return session
@@ -0,0 +1,251 @@
+"""Dedicated writer stage fed by network readers through a bounded queue."""
+
+import collections
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Deque, List, Optional, Tuple
+
+from .storage import Sink, StorageBackend
+
+LOGGER = logging.getLogger(__name__)
+
+FSYNC_NONE = 'none'
+FSYNC_FILE = 'file'
+FSYNC_BATCH = 'batch'
+FSYNC_MODES = (FSYNC_NONE, FSYNC_FILE, FSYNC_BATCH)
+
+DEFAULT_BUFFER_BYTES = 32 * 1024 * 1024
+DEFAULT_BATCH_FILES = 32
+DEFAULT_BATCH_INTERVAL = 1.0
+
+_OPEN = 'open'
+_WRITE = 'write'
+_CLOSE = 'close'
+_COMMIT = 'commit'
+
+
+class WriteHandle:
+    """An object being written by a DiskWriter; returned by DiskWriter.open()."""
+
+    def __init__(self, writer: "DiskWriter", backend: StorageBackend, key: str, offset: int = 0):
+        self.backend = backend
+        self.key = key
+        #: Bytes of the object handed over so far, including a resumed partial
+        self.size = offset
+        self._writer = writer
+        self._sink: Optional[Sink] = None
+        self._error: Optional[BaseException] = None
+
+    def write(self, chunk: bytes) -> None:
+        """
+        Queue a chunk, blocking while the writer's byte budget is used up.
+
+        Raises:
+            Exception: The error from an earlier failed write to this object
+        """
+        self._raise_error()
+        self._writer._put((_WRITE, self, chunk), len(chunk))
+        self.size += len(chunk)
+
+    def close(self) -> Future:
+        """
+        Stop writing once queued chunks are written, keeping any resumable partial data.
+
+        Returns:
+            Future resolved with the object's size so far once it is closed
+        """
+        future: Future = Future()
+        self._writer._put((_CLOSE, self, future), 0)
+        return future
+
+    def commit(self) -> Future:
+        """
+        Publish the object under its key once queued chunks are written.
+
+        Returns:
+            Future resolved with the object's size once it is in place (and synced,
+            per the fsync mode)
+        """
+        future: Future = Future()
+        self._writer._put((_COMMIT, self, future), 0)
+        return future
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+
+class DiskWriter:
+    """
+    Writes downloaded data to storage backends on its own thread.
+
+    Readers hand chunks over through a queue bounded by total bytes, so a
+    slow disk holds back the sockets only once the buffer is full and a slow
+    socket never leaves queued data unwritten. Operations for one file are
+    applied in order; files are independent of each other.
+
+    Fsync modes:
+        none:  rely on the OS to flush (fastest, the historical behaviour)
+        file:  fsync each file before it is renamed into place
+        batch: group completed files and fsync them together, at most
+               `batch_files` files or `batch_interval` seconds at a time
+    """
+
+    def __init__(
+        self,
+        fsync: str = FSYNC_NONE,
+        max_buffered_bytes: int = DEFAULT_BUFFER_BYTES,
+        batch_files: int = DEFAULT_BATCH_FILES,
+        batch_interval: float = DEFAULT_BATCH_INTERVAL,
+    ):
+        if fsync not in FSYNC_MODES:
+            raise ValueError(f"Unknown fsync mode '{fsync}', expected one of: {', '.join(FSYNC_MODES)}")
+        self.fsync = fsync
+        self.max_buffered_bytes = max_buffered_bytes
+        self.batch_files = batch_files
+        self.batch_interval = batch_interval
+
+        self._queue: Deque[Tuple[str, WriteHandle, object]] = collections.deque()
+        self._buffered = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._batch: List[Tuple[WriteHandle, Future]] = []
+        self._batch_started = 0.0
+        self._thread = threading.Thread(target=self._run, name="aura-writer", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "DiskWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def open(self, backend: StorageBackend, key: str, offset: int = 0) -> WriteHandle:
+        """
+        Start writing an object.
+
+        Args:
+            backend: Storage to write to
+            key: Key of the object
+            offset: Resume after this many bytes of the backend's partial object
+
+        Returns:
+            WriteHandle to queue chunks on
+        """
+        handle = WriteHandle(self, backend, key, offset)
+        self._put((_OPEN, handle, offset), 0)
+        return handle
+
+    def close(self) -> None:
+        """Write everything still queued, then stop the writer thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+
+    def _put(self, op: Tuple[str, WriteHandle, object], size: int) -> None:
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("DiskWriter is closed")
+            while self._buffered and self._buffered + size > self.max_buffered_bytes:
+                self._condition.wait()
+            self._queue.append(op)
+            self._buffered += size
+            self._condition.notify_all()
+
+    def _next_op(self) -> Optional[Tuple[str, WriteHandle, object]]:
+        """Get the next operation, flushing a due fsync batch while idle. None means stop."""
+        with self._condition:
+            while not self._queue:
+                if self._batch:
+                    remaining = self._batch_started + self.batch_interval - time.monotonic()
+                    if remaining <= 0 or self._closed:
+                        break
+                    self._condition.wait(remaining)
+                elif self._closed:
+                    return None
+                else:
+                    self._condition.wait()
+            if not self._queue:
+                op = None
+            else:
+                op = self._queue.popleft()
+        if op is None:
+            self._flush_batch()
+            return self._next_op()
+        return op
+
+    def _run(self) -> None:
+        while True:
+            op = self._next_op()
+            if op is None:
+                return
+            kind, handle, payload = op
+            try:
+                self._apply(kind, handle, payload)
+            finally:
+                if kind == _WRITE:
+                    with self._condition:
+                        self._buffered -= len(payload)
+                        self._condition.notify_all()
+
+    def _apply(self, kind: str, handle: WriteHandle, payload) -> None:
+        if handle._error is not None:
+            if kind in (_CLOSE, _COMMIT):
+                payload.set_exception(handle._error)
+            return
+
+        try:
+            if kind == _OPEN:
+                handle._sink = handle.backend.open_sink(handle.key, payload)
+            elif kind == _WRITE:
+                handle._sink.write(payload)
+            elif kind == _CLOSE:
+                handle._sink.abort()
+                payload.set_result(handle.size)
+            elif kind == _COMMIT:
+                if self.fsync == FSYNC_BATCH:
+                    if not self._batch:
+                        self._batch_started = time.monotonic()
+                    self._batch.append((handle, payload))
+                    if len(self._batch) >= self.batch_files:
+                        self._flush_batch()
+                    return
+                if self.fsync == FSYNC_FILE:
+                    handle._sink.sync()
+                handle._sink.commit()
+                if self.fsync == FSYNC_FILE:
+                    handle.backend.sync_directories([handle.key])
+                payload.set_result(handle.size)
+        except Exception as e:  # pylint: disable=broad-except
+            LOGGER.debug("Write to %s failed: %s", handle.key, e)
+            handle._error = e
+            if handle._sink is not None:
+                try:
+                    handle._sink.abort()
+                except Exception:  # pylint: disable=broad-except
+                    pass
+            if kind in (_CLOSE, _COMMIT):
+                payload.set_exception(e)
+
+    def _flush_batch(self) -> None:
+        """Sync and publish every object in the current batch."""
+        batch, self._batch = self._batch, []
+        committed = {}
+        for handle, future in batch:
+            try:
+                handle._sink.sync()
+                handle._sink.commit()
+                committed.setdefault(id(handle.backend), (handle.backend, []))[1].append(handle.key)
+            except Exception as e:  # pylint: disable=broad-except
+                handle._error = e
+                future.set_exception(e)
+        for backend, keys in committed.values():
+            backend.sync_directories(keys)
+        for handle, future in batch:
+            if not future.done():
+                future.set_result(handle.size)
+        if batch:
+            LOGGER.debug("Synced a batch of %i files", len(batch))
@@ -0,0 +1 @@
+"""Benchmarks for Aura Frame Downloader; see benchmarks/scaling.py."""
@@ -0,0 +1,440 @@
+"""
+Memory and wall-time scaling benchmarks over synthetic frame listings.
+
+Generates listings of 10k to 1M assets and drives each stage of a sync
+against a fake transport and in-memory storage, so the numbers reflect the
+downloader's own code rather than the network or the disk:
+
+    parse     get_frame_assets() decoding the listing response
+    plan      Downloader.plan(): filtering and filename/key derivation
+    skip      Downloader.execute() over storage that already holds every file
+    download  Downloader.execute() fetching every file from the fake transport
+
+Each stage is timed on its own, then repeated under tracemalloc for its peak
+allocation. The results are compared with benchmarks/baselines.json and the
+script exits with status 1 when a stage is slower or larger than its baseline
+allows.
+
+Usage (from the repository root):
+
+    python -m benchmarks.scaling
+    python -m benchmarks.scaling --sizes 10000 100000 1000000
+    python -m benchmarks.scaling --update-baselines
+"""
+
+import argparse
+import gc
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from aura.core import Downloader, get_frame_assets
+from aura.layout import LAYOUTS
+from aura.storage import Sink, StorageBackend
+from aura.throttle import Throttle
+
+LOGGER = logging.getLogger(__name__)
+
+STAGES = ('parse', 'plan', 'skip', 'download')
+DEFAULT_SIZES = (10_000, 100_000)
+DEFAULT_BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+DEFAULT_FILE_SIZE = 2048
+
+# Allowed growth over a baseline before a stage counts as a regression. Wall
+# time varies between machines far more than allocations do.
+TIME_TOLERANCE = 1.0
+MEMORY_TOLERANCE = 0.25
+# Timing differences below this many seconds are noise, whatever the ratio
+TIME_FLOOR = 0.25
+
+FRAME_ID = 'bench-frame'
+UPLOADERS = 5
+VIDEO_EVERY = 10
+
+
+def make_listing(count: int) -> List[Dict[str, Any]]:
+    """
+    Build a deterministic listing shaped like the assets API response.
+
+    Assets are spread over ten years and a few uploaders; every
+    VIDEO_EVERY-th asset also has a video.
+    """
+    assets = []
+    for number in range(count):
+        asset = {
+            'id': f"{number:08x}-bench",
+            'taken_at': (
+                f"{2015 + number % 10}-{1 + number % 12:02d}-{1 + number % 28:02d} "
+                f"{number % 24:02d}:{number % 60:02d}:{number // 60 % 60:02d}.000"
+            ),
+            'user_id': f"user{number % UPLOADERS}",
+            'file_name': f"{number:08x}.jpg",
+            'video_url': None,
+            'video_file_name': None,
+        }
+        if number % VIDEO_EVERY == 0:
+            asset['video_url'] = f"https://video.bench.invalid/{number:08x}.mp4"
+            asset['video_file_name'] = f"{number:08x}.mp4"
+        assets.append(asset)
+    return assets
+
+
+class _FakeResponse:
+    """The parts of requests.Response the downloader uses."""
+
+    def __init__(self, status_code: int = 200, text: str = '', body: bytes = b''):
+        self.status_code = status_code
+        self.text = text
+        self.headers = {'Content-Length': str(len(body))}
+        self.raw = io.BytesIO(body)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+    def close(self) -> None:
+        self.raw.close()
+
+
+class FakeTransport:
+    """
+    Stands in for both the API session and the media session.
+
+    The listing URL answers with the pre-serialised listing; every other URL
+    answers with file_size bytes.
+    """
+
+    def __init__(self, listing_text: str, file_size: int = DEFAULT_FILE_SIZE):
+        self.listing_text = listing_text
+        self.body = b'\0' * file_size
+        self.requests = 0
+
+    def get(self, url: str, stream: bool = False, timeout: Optional[float] = None,
+            headers: Optional[Dict[str, str]] = None) -> _FakeResponse:
+        self.requests += 1
+        if '/assets.json' in url:
+            return _FakeResponse(text=self.listing_text)
+        return _FakeResponse(body=self.body)
+
+    def head(self, url: str, allow_redirects: bool = True, timeout: Optional[float] = None) -> _FakeResponse:
+        self.requests += 1
+        return _FakeResponse(body=self.body)
+
+
+class _CountingSink(Sink):
+    def __init__(self, storage: "MemoryStorage", key: str):
+        self._storage = storage
+        self._key = key
+
+    def write(self, chunk: bytes) -> None:
+        pass
+
+    def commit(self) -> None:
+        self._storage.add(self._key)
+
+    def abort(self) -> None:
+        pass
+
+
+class MemoryStorage(StorageBackend):
+    """Keeps only the keys of stored objects, discarding their bytes."""
+
+    def __init__(self, location: str, state_dir: str, keys: Optional[List[str]] = None):
+        self.location = location
+        self._state_dir = state_dir
+        self._directories: Dict[str, Set[str]] = {}
+        for key in keys or []:
+            self.add(key)
+
+    def add(self, key: str) -> None:
+        """Record a stored object."""
+        self._directories.setdefault(key.rpartition('/')[0], set()).add(key)
+
+    def exists(self, key: str) -> bool:
+        return key in self._directories.get(key.rpartition('/')[0], ())
+
+    def list_keys(self, prefix: str = '', include_partial: bool = False) -> Iterator[str]:
+        prefix = prefix.rstrip('/')
+        for directory, keys in self._directories.items():
+            if not prefix or directory == prefix or directory.startswith(prefix + '/'):
+                yield from keys
+
+    def list_directory(self, prefix: str) -> Set[str]:
+        return set(self._directories.get(prefix.rstrip('/'), ()))
+
+    def open_sink(self, key: str, offset: int = 0) -> Sink:
+        return _CountingSink(self, key)
+
+    def move(self, source_key: str, target_key: str) -> None:
+        self._directories.get(source_key.rpartition('/')[0], set()).discard(source_key)
+        self.add(target_key)
+
+    def state_dir(self) -> str:
+        return self._state_dir
+
+
+@dataclass
+class Measurement:
+    """Cost of one stage at one listing size."""
+
+    stage: str
+    size: int
+    seconds: float
+    peak_bytes: int
+    rss_bytes: Optional[int]
+
+    @property
+    def key(self) -> str:
+        """Key of this stage and size in the baselines file."""
+        return f"{self.stage}@{self.size}"
+
+
+def max_rss() -> Optional[int]:
+    """The process's peak resident set size in bytes, where the platform reports it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def measure(stage: str, size: int, run: Callable[[], Any], memory: bool = True) -> Tuple[Any, Measurement]:
+    """
+    Time a stage, then run it again under tracemalloc for its peak allocation.
+
+    Returns:
+        (result of the timed run, Measurement)
+    """
+    gc.collect()
+    started = time.perf_counter()
+    result = run()
+    seconds = time.perf_counter() - started
+
+    peak = 0
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            # The peak already covers the result, so it needn't be kept
+            run()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    measurement = Measurement(stage, size, seconds, peak, max_rss())
+    LOGGER.info(
+        "%-9s %9i items  %8.2fs  %9.1f MB peak  %9s MB RSS", stage, size, seconds, peak / 2**20,
+        f"{measurement.rss_bytes / 2**20:.1f}" if measurement.rss_bytes else '-',
+    )
+    return result, measurement
+
+
+def run_size(
+    size: int,
+    stages: List[str],
+    layout: str,
+    file_size: int = DEFAULT_FILE_SIZE,
+    memory: bool = True,
+) -> List[Measurement]:
+    """Run the selected stages on a synthetic listing of the given size."""
+    transport = FakeTransport(json.dumps({'assets': make_listing(size)}), file_size)
+    measurements = []
+
+    with tempfile.TemporaryDirectory(prefix='aura-bench-') as state_dir:
+        def downloader() -> Downloader:
+            # A fresh Downloader per run so no stage benefits from another's caches
+            return Downloader(session=transport, media_session=transport, throttle=Throttle(0))
+
+        def plan_listing():
+            with downloader() as planner:
+                return planner.plan(
+                    FRAME_ID, 'memory://plan', layout=layout,
+                    storage=MemoryStorage('memory://plan', state_dir), assets=assets,
+                )
+
+        def execute(location: str, stored: bool):
+            storage = MemoryStorage(
+                location, state_dir, [transfer.path for transfer in plan.transfers] if stored else None
+            )
+            with downloader() as runner:
+                summary = runner.execute(replace(plan, storage=storage))
+            expected = (0, len(plan.transfers)) if stored else (len(plan.transfers), 0)
+            if (summary.downloaded, summary.skipped) != expected or summary.failed:
+                raise RuntimeError(f"{location}: unexpected result {summary.to_dict()}")
+            return summary
+
+        assets, measurement = measure('parse', size, lambda: get_frame_assets(transport, FRAME_ID), memory)
+        measurements.append(measurement)
+
+        plan, measurement = measure('plan', size, plan_listing, memory)
+        if 'plan' in stages:
+            measurements.append(measurement)
+
+        for stage, stored in (('skip', True), ('download', False)):
+            if stage in stages:
+                _, measurement = measure(
+                    stage, size, lambda stage=stage, stored=stored: execute(f"memory://{stage}", stored), memory
+                )
+                measurements.append(measurement)
+
+    return [measurement for measurement in measurements if measurement.stage in stages]
+
+
+def load_baselines(path: str) -> Dict[str, Dict[str, float]]:
+    """Read stored baselines, keyed by 'stage@size'."""
+    if not os.path.isfile(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_baselines(path: str, baselines: Dict[str, Dict[str, float]], measurements: List[Measurement]) -> None:
+    """Store measurements as the new baselines, keeping entries that weren't re-measured."""
+    for measurement in measurements:
+        entry = {'seconds': round(measurement.seconds, 3)}
+        if measurement.peak_bytes:
+            entry['peak_bytes'] = measurement.peak_bytes
+        baselines[measurement.key] = entry
+    with open(path, 'w') as f:
+        json.dump(dict(sorted(baselines.items())), f, indent=2)
+        f.write("\n")
+
+
+def find_regressions(
+    measurements: List[Measurement],
+    baselines: Dict[str, Dict[str, float]],
+    time_tolerance: float = TIME_TOLERANCE,
+    memory_tolerance: float = MEMORY_TOLERANCE,
+) -> List[str]:
+    """
+    Compare measurements with their baselines.
+
+    Returns:
+        A description of every stage that exceeded its baseline by more than the tolerance
+    """
+    regressions = []
+    for measurement in measurements:
+        baseline = baselines.get(measurement.key)
+        if baseline is None:
+            LOGGER.warning("No baseline for %s", measurement.key)
+            continue
+        allowed = max(baseline['seconds'] * (1 + time_tolerance), baseline['seconds'] + TIME_FLOOR)
+        if measurement.seconds > allowed:
+            regressions.append(
+                f"{measurement.key}: {measurement.seconds:.2f}s, baseline {baseline['seconds']:.2f}s"
+            )
+        if measurement.peak_bytes and 'peak_bytes' in baseline:
+            allowed = baseline['peak_bytes'] * (1 + memory_tolerance)
+            if measurement.peak_bytes > allowed:
+                regressions.append(
+                    f"{measurement.key}: {measurement.peak_bytes / 2**20:.1f} MB peak, "
+                    f"baseline {baseline['peak_bytes'] / 2**20:.1f} MB"
+                )
+    return regressions
+
+
+def parse_command_line():
+    """
+    Parse the command line options.
+
+    Returns:
+        The parsed command line args
+    """
+    parser = argparse.ArgumentParser(description="Measure how the downloader scales with frame size")
+    parser.add_argument(
+        "--sizes",
+        help=f"listing sizes to run (default: {' '.join(str(size) for size in DEFAULT_SIZES)})",
+        type=int,
+        nargs='+',
+        default=list(DEFAULT_SIZES),
+    )
+    parser.add_argument(
+        "--stages",
+        help=f"stages to measure (default: all of {', '.join(STAGES)})",
+        choices=STAGES,
+        nargs='+',
+        default=list(STAGES),
+    )
+    parser.add_argument(
+        "--layout",
+        help="directory layout the plan uses (default: hash)",
+        choices=list(LAYOUTS),
+        default='hash',
+    )
+    parser.add_argument(
+        "--file-size",
+        help=f"bytes served per file by the fake transport (default: {DEFAULT_FILE_SIZE})",
+        type=int,
+        default=DEFAULT_FILE_SIZE,
+    )
+    parser.add_argument(
+        "--no-memory",
+        help="skip the tracemalloc runs and only measure wall time",
+        action="store_true",
+        default=False,
+    )
+    parser.add_argument(
+        "--baselines",
+        help="baselines file (default: benchmarks/baselines.json)",
+        default=DEFAULT_BASELINES,
+    )
+    parser.add_argument(
+        "--update-baselines",
+        help="store this run's results as the new baselines instead of checking them",
+        action="store_true",
+        default=False,
+    )
+    parser.add_argument(
+        "--time-tolerance",
+        help=f"allowed wall-time growth over the baseline, as a fraction (default: {TIME_TOLERANCE})",
+        type=float,
+        default=TIME_TOLERANCE,
+    )
+    parser.add_argument(
+        "--memory-tolerance",
+        help=f"allowed peak-memory growth over the baseline, as a fraction (default: {MEMORY_TOLERANCE})",
+        type=float,
+        default=MEMORY_TOLERANCE,
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    """Run the benchmarks; returns the process exit status."""
+    args = parse_command_line()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    # The downloader's own per-item logging would dominate the timings
+    logging.getLogger('aura').setLevel(logging.WARNING)
+
+    measurements = []
+    for size in args.sizes:
+        measurements.extend(run_size(size, args.stages, args.layout, args.file_size, not args.no_memory))
+
+    baselines = load_baselines(args.baselines)
+    if args.update_baselines:
+        save_baselines(args.baselines, baselines, measurements)
+        LOGGER.info("Saved baselines to %s", args.baselines)
+        return 0
+
+    regressions = find_regressions(measurements, baselines, args.time_tolerance, args.memory_tolerance)
+    for regression in regressions:
+        LOGGER.error("Regression: %s", regression)
+    if not regressions:
+        LOGGER.info("All stages within their baselines")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,17 +2,91 @@
 """Aura Frame Downloader - CLI Entry Point."""
 
 import argparse
+import json
 import logging
 import os
+import sqlite3
 import sys
 
-from aura.config import get_default_config_path, get_frame_config, get_login_credentials, load_config
-from aura.core import download_photos_from_aura
+from aura.bandwidth import BandwidthLimiter, BandwidthSchedule
+from aura.catalog import STATS_GROUPS, Catalog, default_catalog_path
+from aura.concurrency import AUTO, parse_concurrency
+from aura.config import (
+    get_default_config_path,
+    get_frame_config,
+    get_frame_names,
+    get_login_credentials,
+    load_config,
+)
+from aura.core import FrameJob, download_frames, download_photos_from_aura, migrate_archive
+from aura.estimate import log_estimate
+from aura.events import EVENT_FORMATS, JsonLinesEventSink
 from aura.exceptions import AuraError, ConfigError, DownloadCancelledError, LoginError, NoAssetsError
+from aura.filters import AssetFilter, parse_bound
+from aura.layout import LAYOUTS
+from aura.postprocess import PROCESSORS, PostProcessor
+from aura.shard import parse_shard
+from aura.storage import open_storage
+from aura.throttle import parse_interval
+from aura.transport import TRANSPORTS
+from aura.writer import FSYNC_MODES, FSYNC_NONE
+from aura.summary import DownloadSummary
 
 LOGGER = logging.getLogger(__name__)
 
 
+def shard_argument(text):
+    """Argparse type for --shard."""
+    try:
+        return parse_shard(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def bound_argument(text):
+    """Argparse type for --since and --until."""
+    try:
+        return parse_bound(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def concurrency_argument(text):
+    """Argparse type for --concurrency."""
+    try:
+        parse_concurrency(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return text
+
+
+def positive_int_argument(text):
+    """Argparse type for counts that must be 1 or more."""
+    try:
+        value = int(text)
+    except ValueError:
+        value = 0
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"invalid value '{text}', expected a whole number of 1 or more")
+    return value
+
+
+def delay_argument(text):
+    """Argparse type for --delay."""
+    try:
+        return parse_interval(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def bandwidth_argument(text):
+    """Argparse type for --bandwidth."""
+    try:
+        return BandwidthSchedule.parse(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
 def parse_command_line():
     """
     Parse the command line options.
@@ -36,6 +110,24 @@ def parse_command_line():
         default=False,
         required=False,
     )
+    parser.add_argument(
+        "--quiet",
+        help="don't log each photo; warnings, errors and totals are still logged",
+        action="store_true",
+        default=False,
+        required=False,
+    )
+    parser.add_argument(
+        "--events",
+        help="emit machine-readable progress events in this format (jsonl) to stdout; logs go to stderr",
+        choices=EVENT_FORMATS,
+        required=False,
+    )
+    parser.add_argument(
+        "--events-file",
+        help="write --events to this file instead of stdout",
+        required=False,
+    )
     parser.add_argument(
         "--years",
         help="save pictures folder by year",
@@ -43,6 +135,20 @@ def parse_command_line():
         default=False,
         required=False,
     )
+    parser.add_argument(
+        "--layout",
+        help="folder layout: " + ", ".join(f"{name} ({desc})" for name, desc in LAYOUTS.items()),
+        choices=list(LAYOUTS),
+        required=False,
+    )
+    parser.add_argument(
+        "--migrate-layout",
+        help="move already downloaded files into the layout chosen with --layout (or the frame's "
+             "layout setting), then exit",
+        action="store_true",
+        default=False,
+        required=False,
+    )
     parser.add_argument(
         "--count",
         help="show count of photos then exit",
@@ -50,6 +156,42 @@ def parse_command_line():
         default=False,
         required=False,
     )
+    parser.add_argument(
+        "--estimate",
+        help="check the size of every file to download, free space and expected time, then exit",
+        action="store_true",
+        default=False,
+        required=False,
+    )
+    parser.add_argument(
+        "--stats",
+        help="count the frame's assets per " + ", ".join(STATS_GROUPS)
+             + " from the local catalog (no network), then exit",
+        choices=STATS_GROUPS,
+        required=False,
+    )
+    parser.add_argument(
+        "--query",
+        help="print the catalogued assets matching --since/--until/--uploader/--photos-only/"
+             "--videos-only/--limit as JSON lines (no network), then exit",
+        action="store_true",
+        default=False,
+        required=False,
+    )
+    parser.add_argument(
+        "--catalog",
+        help=f"catalog that each frame listing is stored in (default: {default_catalog_path()})",
+        default=default_catalog_path(),
+        metavar="FILE",
+        required=False,
+    )
+    parser.add_argument(
+        "--no-catalog",
+        help="don't store frame listings in the catalog",
+        action="store_true",
+        default=False,
+        required=False,
+    )
     parser.add_argument(
         "--videos-only",
         help="only download video clips, skip still photos",
@@ -57,78 +199,359 @@ def parse_command_line():
         default=False,
         required=False,
     )
+    parser.add_argument(
+        "--photos-only",
+        help="only download still photos, skip video clips",
+        action="store_true",
+        default=False,
+        required=False,
+    )
+    parser.add_argument(
+        "--since",
+        help="only photos taken on or after this date (YYYY[-MM[-DD[THH:MM]]])",
+        type=bound_argument,
+        required=False,
+    )
+    parser.add_argument(
+        "--until",
+        help="only photos taken on or before this date (YYYY[-MM[-DD[THH:MM]]]), inclusive",
+        type=bound_argument,
+        required=False,
+    )
+    parser.add_argument(
+        "--uploader",
+        help="only photos uploaded by this user id (repeat for several)",
+        action="append",
+        dest="uploaders",
+        metavar="USER_ID",
+        required=False,
+    )
+    parser.add_argument(
+        "--limit",
+        help="download at most N photos (after the other filters)",
+        type=int,
+        metavar="N",
+        required=False,
+    )
     parser.add_argument(
         "--save-assets",
         help="write the raw asset JSON returned by the Aura API to this file",
         required=False,
     )
-    parser.add_argument('frame', nargs='?')
+    parser.add_argument(
+        "--retry-failed",
+        help="only retry transfers recorded in the frame's failure journal",
+        action="store_true",
+        default=False,
+        required=False,
+    )
+    parser.add_argument(
+        "--post-process",
+        help="comma-separated processors to run on each new file: " + ", ".join(PROCESSORS),
+        type=lambda text: [name.strip() for name in text.split(',') if name.strip()],
+        default=[],
+        required=False,
+    )
+    parser.add_argument(
+        "--post-process-workers",
+        help="number of post-processing worker processes (default: CPU count)",
+        type=positive_int_argument,
+        required=False,
+    )
+    parser.add_argument(
+        "--fsync",
+        help="sync downloaded files to disk: none (default), file (each file) or batch (groups of files)",
+        choices=FSYNC_MODES,
+        default=FSYNC_NONE,
+        required=False,
+    )
+    parser.add_argument(
+        "--concurrency",
+        help="transfers in flight at once: auto (default, tuned between 1 and 8 from the "
+             "observed throughput), auto:N (tuned up to N) or a fixed number",
+        type=concurrency_argument,
+        default=AUTO,
+        required=False,
+    )
+    parser.add_argument(
+        "--delay",
+        help="minimum seconds between transfer starts per account (default: 2); 0 leaves pacing to "
+             "--concurrency, e.g. over http2. Overrides the account's delay setting",
+        type=delay_argument,
+        metavar="SECONDS",
+        required=False,
+    )
+    parser.add_argument(
+        "--bandwidth",
+        help="cap the combined download rate of every transfer and frame, e.g. 2M, or a schedule "
+             "such as 'mon-fri 09:00-18:00=2M, unlimited' (binary units, local time)",
+        type=bandwidth_argument,
+        metavar="SCHEDULE",
+        required=False,
+    )
+    parser.add_argument(
+        "--bandwidth-file",
+        help="read the --bandwidth schedule from this file, re-reading it whenever it changes during the run",
+        metavar="FILE",
+        required=False,
+    )
+    parser.add_argument(
+        "--transport",
+        help="HTTP transport for the listing and downloads: http1 (default) or http2, which multiplexes "
+             "many requests over a few connections (needs httpx[http2]); overrides the account's "
+             "transport setting",
+        choices=TRANSPORTS,
+        required=False,
+    )
+    parser.add_argument(
+        "--shard",
+        help="only handle shard i of N (e.g. 2/4), split by a hash of the asset id",
+        type=shard_argument,
+        required=False,
+    )
+    parser.add_argument(
+        "--summary-json",
+        help="write per-frame results to this JSON file",
+        required=False,
+    )
+    parser.add_argument(
+        "--merge-summaries",
+        help="merge JSON summaries written by --summary-json (e.g. one per shard), then exit",
+        nargs='+',
+        metavar="FILE",
+        required=False,
+    )
+    parser.add_argument(
+        "--all",
+        help="sync every frame in the config file",
+        action="store_true",
+        default=False,
+        required=False,
+    )
+    parser.add_argument(
+        'frames',
+        nargs='*',
+        help="frame sections to sync; frames of different accounts sync in parallel",
+    )
     args = parser.parse_args()
     return args
 
 
-def setup_logger(log_debug=False):
+def setup_logger(log_debug=False, show_thread=False, stream=None, quiet=False):
     """
     Set up default logging options.
 
     Args:
         log_debug: True sets logging.DEBUG, False sets logging.INFO
+        show_thread: True prefixes each line with the thread (account) name
+        stream: Where log lines go (defaults to stdout)
+        quiet: True hides the per-photo progress lines
     """
     logging_level = logging.DEBUG if log_debug else logging.INFO
+    log_format = "%(asctime)s [%(levelname)s]: %(message)s"
+    if show_thread:
+        log_format = "%(asctime)s [%(levelname)s] %(threadName)s: %(message)s"
     logging.basicConfig(
-        stream=sys.stdout,
-        format="%(asctime)s [%(levelname)s]: %(message)s",
+        stream=stream or sys.stdout,
+        format=log_format,
         datefmt="%H:%M:%S",
         level=logging_level,
     )
+    if quiet:
+        logging.getLogger('aura.core.items').setLevel(logging.WARNING)
+    if not log_debug:
+        # httpx (the http2 transport) logs every request at INFO, where urllib3 uses DEBUG
+        logging.getLogger('httpx').setLevel(logging.WARNING)
     LOGGER.debug("Debug logging enabled.")
 
 
-def app():
-    """Main CLI application entry point."""
-    args = parse_command_line()
-    setup_logger(args.debug)
+def build_jobs(config, frame_names, args):
+    """
+    Resolve frame names into download jobs.
 
-    # Validate arguments
-    if not args.frame:
-        LOGGER.error("No frame name supplied on the command line")
-        sys.exit(1)
+    Args:
+        config: Loaded configuration
+        frame_names: Names of the frame sections to sync
+        args: The parsed command line args
 
-    try:
-        # Load configuration
-        LOGGER.info("Using credentials file '%s'", args.config)
-        config = load_config(args.config)
+    Returns:
+        List of FrameJob
+
+    Raises:
+        ConfigError: If a frame or its account is missing or incomplete
+    """
+    jobs = []
+    for frame_name in frame_names:
+        frame_config = get_frame_config(config, frame_name)
+        credentials = get_login_credentials(config, frame_config['account'])
+        jobs.append(FrameJob(
+            name=frame_name,
+            account=frame_config['account'],
+            email=credentials['email'],
+            password=credentials['password'],
+            frame_id=frame_config['frame_id'],
+            file_path=frame_config['file_path'],
+            layout=args.layout or ('year' if args.years else frame_config['layout']),
+            s3_endpoint_url=frame_config['s3_endpoint_url'],
+            transport=args.transport or credentials['transport'],
+            delay=args.delay if args.delay is not None else credentials['delay'],
+        ))
+    return jobs
 
-        # Get credentials and frame config
-        credentials = get_login_credentials(config)
-        frame_config = get_frame_config(config, args.frame)
 
-        email = credentials['email']
-        password = credentials['password']
-        frame_id = frame_config['frame_id']
-        file_path = frame_config['file_path']
+def log_summary(name, summary, count_only):
+    """Log the outcome of one frame."""
+    if summary.estimate is not None:
+        log_estimate(summary.estimate, name)
+    elif count_only:
+        LOGGER.info("%sTotal photos in frame: %d", name, summary.total)
+    else:
+        LOGGER.info(
+            "%sDownloaded %d photos (%d skipped, %d failed)",
+            name, summary.downloaded, summary.skipped, len(summary.failed),
+        )
 
-    except ConfigError as e:
+
+def write_summaries(path, summaries):
+    """
+    Write per-frame summaries to a JSON file.
+
+    Args:
+        path: Output file
+        summaries: Mapping of frame name to DownloadSummary
+    """
+    with open(path, 'w') as f:
+        json.dump({'frames': {name: summary.to_dict() for name, summary in summaries.items()}}, f, indent=2)
+    LOGGER.info("Wrote summary to %s", path)
+
+
+def merge_summaries(paths):
+    """Log the combined totals of several --summary-json files."""
+    by_frame = {}
+    for path in paths:
+        with open(path, 'r') as f:
+            for name, data in json.load(f)['frames'].items():
+                by_frame.setdefault(name, []).append(DownloadSummary.from_dict(data))
+
+    merged = {name: DownloadSummary.merge(summaries) for name, summaries in by_frame.items()}
+    for name, summary in merged.items():
+        log_summary(f"{name} (shards {', '.join(summary.shards) or 'all'}): ", summary, False)
+    log_summary("All frames: ", DownloadSummary.merge(merged.values()), False)
+    return merged
+
+
+def run_catalog(jobs, args):
+    """Answer --stats or --query from the catalog, without logging in."""
+    catalog = Catalog(args.catalog)
+    exit_code = 0
+    try:
+        asset_filter = AssetFilter(
+            since=args.since, until=args.until, uploaders=args.uploaders or [],
+            photos_only=args.photos_only, videos_only=args.videos_only, limit=args.limit,
+        )
+        for job in jobs:
+            if catalog.listed_at(job.frame_id) is None:
+                LOGGER.error("%s: not in the catalog %s yet; sync it or run --count first", job.name, catalog.path)
+                exit_code = 1
+                continue
+            if args.stats:
+                for group, count in catalog.stats(job.frame_id, args.stats):
+                    LOGGER.info("%s: %s: %d", job.name, group, count)
+            else:
+                for asset in catalog.query(job.frame_id, asset_filter):
+                    print(json.dumps({'frame': job.name, **asset}))
+    except (ConfigError, sqlite3.Error) as e:
         LOGGER.error(str(e))
         sys.exit(1)
+    sys.exit(exit_code)
+
+
+def run_many(jobs, args, post_processor=None, events=None, bandwidth=None):
+    """Sync several frames, in parallel across accounts."""
+    if args.save_assets:
+        LOGGER.error("--save-assets can only be used with a single frame")
+        sys.exit(1)
 
-    # Run the download
     try:
-        downloaded, skipped, total = download_photos_from_aura(
-            email=email,
-            password=password,
-            frame_id=frame_id,
-            file_path=file_path,
+        results = download_frames(
+            jobs,
             organize_by_year=args.years,
             count_only=args.count,
+            estimate=args.estimate,
             videos_only=args.videos_only,
-            save_assets_path=args.save_assets,
+            photos_only=args.photos_only,
+            since=args.since,
+            until=args.until,
+            uploaders=args.uploaders,
+            limit=args.limit,
+            retry_failed=args.retry_failed,
+            shard=args.shard,
+            post_processor=post_processor,
+            fsync=args.fsync,
+            events=events,
+            concurrency=args.concurrency,
+            bandwidth=bandwidth,
+            catalog=None if args.no_catalog else Catalog(args.catalog),
         )
+    except DownloadCancelledError:
+        LOGGER.info("Download cancelled")
+        sys.exit(0)
 
-        if args.count:
-            LOGGER.info("Total photos in frame: %d", total)
+    exit_code = 0
+    for frame_name, result in results.items():
+        if isinstance(result, NoAssetsError):
+            LOGGER.info("%s: %s", frame_name, result)
+        elif isinstance(result, AuraError):
+            LOGGER.error("%s: %s", frame_name, result)
+            exit_code = 1
         else:
-            LOGGER.info("Downloaded %d photos (%d skipped)", downloaded, skipped)
+            log_summary(frame_name + ": ", result, args.count)
+            if result.estimate is not None and result.estimate.fits is False:
+                exit_code = 1
+
+    if args.summary_json:
+        write_summaries(args.summary_json, {
+            name: result for name, result in results.items() if isinstance(result, DownloadSummary)
+        })
+    sys.exit(exit_code)
+
+
+def run_one(job, args, post_processor=None, events=None, bandwidth=None):
+    """Sync a single frame."""
+    try:
+        summary = download_photos_from_aura(
+            email=job.email,
+            password=job.password,
+            frame_id=job.frame_id,
+            file_path=job.file_path,
+            storage=open_storage(job.file_path, job.s3_endpoint_url),
+            organize_by_year=args.years,
+            layout=job.layout,
+            count_only=args.count,
+            estimate=args.estimate,
+            videos_only=args.videos_only,
+            photos_only=args.photos_only,
+            since=args.since,
+            until=args.until,
+            uploaders=args.uploaders,
+            limit=args.limit,
+            save_assets_path=args.save_assets,
+            retry_failed=args.retry_failed,
+            shard=args.shard,
+            post_processor=post_processor,
+            fsync=args.fsync,
+            events=events,
+            concurrency=args.concurrency,
+            bandwidth=bandwidth,
+            catalog=None if args.no_catalog else Catalog(args.catalog),
+            transport=job.transport,
+            delay=job.delay,
+        )
+        log_summary("", summary, args.count)
+        if args.summary_json:
+            write_summaries(args.summary_json, {job.name: summary})
+        if summary.estimate is not None and summary.estimate.fits is False:
+            sys.exit(1)
 
     except LoginError as e:
         LOGGER.error(str(e))
@@ -147,5 +570,100 @@ def app():
         sys.exit(1)
 
 
+def app():
+    """Main CLI application entry point."""
+    args = parse_command_line()
+
+    if args.merge_summaries:
+        setup_logger(args.debug)
+        merge_summaries(args.merge_summaries)
+        return
+
+    # Validate arguments
+    if not args.frames and not args.all:
+        setup_logger(args.debug)
+        LOGGER.error("No frame name supplied on the command line")
+        sys.exit(1)
+
+    try:
+        # Load configuration
+        config = load_config(args.config)
+        frame_names = get_frame_names(config) if args.all else args.frames
+        jobs = build_jobs(config, frame_names, args)
+    except ConfigError as e:
+        setup_logger(args.debug)
+        LOGGER.error(str(e))
+        sys.exit(1)
+
+    if not jobs:
+        setup_logger(args.debug)
+        LOGGER.error("No frames configured in '%s'", args.config)
+        sys.exit(1)
+
+    events_file = None
+    events = None
+    if args.events:
+        events_file = open(args.events_file, 'a') if args.events_file else sys.stdout
+        events = JsonLinesEventSink(events_file)
+
+    setup_logger(
+        args.debug,
+        show_thread=len({job.account for job in jobs}) > 1,
+        stream=sys.stderr if events_file is sys.stdout or args.query else None,
+        quiet=args.quiet,
+    )
+    LOGGER.info("Using credentials file '%s'", args.config)
+
+    if args.stats or args.query:
+        run_catalog(jobs, args)
+
+    if args.migrate_layout:
+        missing = [job.name for job in jobs if not job.layout]
+        if missing:
+            LOGGER.error(
+                "No target layout for %s; pass --layout or set layout in the frame's config", ", ".join(missing)
+            )
+            sys.exit(1)
+        try:
+            for job in jobs:
+                moved, unchanged = migrate_archive(
+                    job.file_path, job.layout, open_storage(job.file_path, job.s3_endpoint_url)
+                )
+                LOGGER.info("%s: moved %d files (%d already in place)", job.name, moved, unchanged)
+        except AuraError as e:
+            LOGGER.error(str(e))
+            sys.exit(1)
+        return
+
+    bandwidth = None
+    if args.bandwidth or args.bandwidth_file:
+        bandwidth = BandwidthLimiter(args.bandwidth)
+        if args.bandwidth_file:
+            try:
+                bandwidth.watch(args.bandwidth_file)
+            except (OSError, ValueError) as e:
+                LOGGER.error("Can't read bandwidth schedule %s: %s", args.bandwidth_file, e)
+                sys.exit(1)
+
+    post_processor = None
+    if args.post_process and not (args.count or args.estimate):
+        try:
+            post_processor = PostProcessor(args.post_process, max_workers=args.post_process_workers)
+        except ConfigError as e:
+            LOGGER.error(str(e))
+            sys.exit(1)
+
+    try:
+        if len(jobs) > 1:
+            run_many(jobs, args, post_processor, events, bandwidth)
+        else:
+            run_one(jobs[0], args, post_processor, events, bandwidth)
+    finally:
+        if post_processor:
+            post_processor.close()
+        if events_file and events_file is not sys.stdout:
+            events_file.close()
+
+
 if __name__ == '__main__':
     app()
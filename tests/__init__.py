@@ -0,0 +1 @@
+"""Tests for Aura Frame Downloader; run with `make test`."""
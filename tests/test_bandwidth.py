@@ -0,0 +1,80 @@
+"""Tests for aura.bandwidth."""
+
+import datetime
+import unittest
+
+from aura.bandwidth import BandwidthSchedule, parse_rate
+
+MB = 1024 ** 2
+# 2024-01-01 is a Monday
+MONDAY = datetime.date(2024, 1, 1)
+
+
+def _at(day_offset, hour, minute=0):
+    return datetime.datetime.combine(MONDAY + datetime.timedelta(days=day_offset), datetime.time(hour, minute))
+
+
+class ParseRateTest(unittest.TestCase):
+
+    def test_units_are_binary(self):
+        self.assertEqual(parse_rate('100'), 100)
+        self.assertEqual(parse_rate('500K'), 500 * 1024)
+        self.assertEqual(parse_rate('2M'), 2 * MB)
+        self.assertEqual(parse_rate('1.5MB/s'), 1.5 * MB)
+        self.assertEqual(parse_rate(' 2 mib '), 2 * MB)
+        self.assertEqual(parse_rate('1g'), 1024 * MB)
+
+    def test_unlimited(self):
+        for text in ('unlimited', 'UNLIMITED', 'none', 'off'):
+            self.assertIsNone(parse_rate(text))
+
+    def test_malformed_rate_raises_value_error(self):
+        for text in ('', '0', '-1M', '2X', 'fast', '1.M'):
+            with self.assertRaises(ValueError):
+                parse_rate(text)
+
+
+class BandwidthScheduleTest(unittest.TestCase):
+
+    def test_window_boundaries_are_start_inclusive_end_exclusive(self):
+        schedule = BandwidthSchedule.parse('09:00-18:00=2M')
+        self.assertIsNone(schedule.rate_at(_at(0, 8, 59)))
+        self.assertEqual(schedule.rate_at(_at(0, 9)), 2 * MB)
+        self.assertEqual(schedule.rate_at(_at(0, 17, 59)), 2 * MB)
+        self.assertIsNone(schedule.rate_at(_at(0, 18)))
+
+    def test_window_across_midnight(self):
+        schedule = BandwidthSchedule.parse('22:00-06:00=1M, 8M')
+        self.assertEqual(schedule.rate_at(_at(0, 21, 59)), 8 * MB)
+        self.assertEqual(schedule.rate_at(_at(0, 22)), MB)
+        self.assertEqual(schedule.rate_at(_at(0, 23, 59)), MB)
+        self.assertEqual(schedule.rate_at(_at(1, 0)), MB)
+        self.assertEqual(schedule.rate_at(_at(1, 5, 59)), MB)
+        self.assertEqual(schedule.rate_at(_at(1, 6)), 8 * MB)
+
+    def test_early_morning_belongs_to_the_previous_days_window(self):
+        schedule = BandwidthSchedule.parse('fri 22:00-06:00=1M')
+        self.assertEqual(schedule.rate_at(_at(4, 23)), MB)
+        # Saturday morning is still Friday night
+        self.assertEqual(schedule.rate_at(_at(5, 3)), MB)
+        # Friday morning follows Thursday night
+        self.assertIsNone(schedule.rate_at(_at(4, 3)))
+
+    def test_day_ranges_wrap_around_the_week(self):
+        schedule = BandwidthSchedule.parse('fri-mon 00:00-24:00=1M')
+        self.assertEqual([schedule.rate_at(_at(day, 12)) for day in range(7)], [MB, None, None, None, MB, MB, MB])
+
+    def test_first_matching_rule_applies(self):
+        schedule = BandwidthSchedule.parse('mon-fri 09:00-18:00=2M, 00:00-24:00=4M, unlimited')
+        self.assertEqual(schedule.rate_at(_at(0, 10)), 2 * MB)
+        self.assertEqual(schedule.rate_at(_at(5, 10)), 4 * MB)
+
+    def test_malformed_schedule_raises_value_error(self):
+        for text in ('25:00-26:00=1M', '09:60-10:00=1M', 'xyz 09:00-10:00=1M', 'mon-xyz 09:00-10:00=1M',
+                     '09:00-10:00=fast', '09:00-10:00'):
+            with self.assertRaises(ValueError, msg=text):
+                BandwidthSchedule.parse(text)
+
+
+if __name__ == '__main__':
+    unittest.main()
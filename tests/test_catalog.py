@@ -0,0 +1,57 @@
+"""Tests for aura.catalog."""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from aura.catalog import MONTH, Catalog
+from aura.filters import AssetFilter
+
+ASSETS = [
+    {'id': 'a', 'taken_at': '2021-05-01T10:00:00.000Z', 'user_id': 1, 'file_name': 'a.jpg'},
+    {'id': 'b', 'taken_at': '2022-06-15T08:30:00.000Z', 'user_id': 2, 'file_name': 'b.jpg'},
+    {'id': 'c', 'taken_at': None, 'user_id': 1, 'file_name': 'c.jpg'},
+]
+
+
+class CatalogTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.catalog = Catalog(os.path.join(self._tmp.name, 'catalog.sqlite'))
+        self.catalog.ingest('frame', ASSETS)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_query_returns_taken_at_as_listed(self):
+        self.assertEqual(
+            [asset['taken_at'] for asset in self.catalog.query('frame')],
+            [item['taken_at'] for item in ASSETS],
+        )
+
+    def test_query_filters_like_a_download(self):
+        for asset_filter in (
+            AssetFilter(since='2022-01-01'),
+            AssetFilter(until='2021-05-01 10:00'),
+            AssetFilter(since='2021-05-01T10:00', until='2022'),
+        ):
+            self.assertEqual(
+                [asset['id'] for asset in self.catalog.query('frame', asset_filter)],
+                [item['id'] for item in asset_filter.apply(ASSETS)],
+            )
+
+    def test_stats_group_on_dates(self):
+        self.assertEqual(self.catalog.stats('frame', MONTH), [('2021-05', 1), ('2022-06', 1), ('unknown', 1)])
+
+    def test_older_schema_is_rebuilt(self):
+        with sqlite3.connect(self.catalog.path) as connection:
+            connection.execute("PRAGMA user_version = 1")
+        self.assertIsNone(self.catalog.listed_at('frame'))
+        self.catalog.ingest('frame', ASSETS)
+        self.assertEqual(len(self.catalog.query('frame')), len(ASSETS))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+"""Tests for aura.concurrency and how transfers feed it."""
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from aura.concurrency import ConcurrencyController
+from aura.core import _Transfer, _TransferRunner
+from aura.journal import FailureJournal
+from aura.storage import LocalStorage
+from aura.summary import DownloadSummary
+from aura.throttle import Throttle
+
+BODY = b'x' * 1000
+LATENCY = 0.05
+PAUSE = 0.5
+
+
+class _Body:
+
+    def __init__(self, data, on_read=None):
+        self._data = data
+        self._on_read = on_read
+
+    def read(self, amt=None):
+        data, self._data = self._data, b''
+        if data and self._on_read:
+            self._on_read()
+        return data
+
+
+class _Response:
+
+    def __init__(self, status_code, data, on_read=None, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.raw = _Body(data, on_read)
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class _Session:
+    """Serves BODY after LATENCY; pauses the download once the body of 'paused.jpg' has been read."""
+
+    def __init__(self, pause):
+        self._pause = pause
+
+    def get(self, url, stream=False, timeout=None, headers=None):
+        if headers and 'Range' in headers:
+            return _Response(416, b'', headers={'Content-Range': f'bytes */{len(BODY)}'})
+        time.sleep(LATENCY)
+        return _Response(200, BODY, self._pause if url.endswith('paused.jpg') else None)
+
+
+class ConcurrencyControllerTest(unittest.TestCase):
+
+    def test_probes_up_only_when_a_transfer_waited_for_a_slot(self):
+        controller = ConcurrencyController(maximum=4, window=0, min_samples=1)
+        self.assertTrue(controller.acquire())
+        controller.release()
+        controller.record(len(BODY), LATENCY)
+        self.assertEqual(controller.limit, 1)
+
+        self.assertTrue(controller.acquire())
+        self.assertFalse(controller.acquire(timeout=0))
+        controller.release()
+        controller.record(len(BODY), LATENCY)
+        self.assertEqual(controller.limit, 2)
+
+
+class PausedTransferTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.paused = threading.Event()
+        self.controller = ConcurrencyController(maximum=4, initial=2, window=0, min_samples=1)
+        self.runner = _TransferRunner(
+            DownloadSummary(),
+            FailureJournal(os.path.join(self._tmp.name, 'journal.jsonl')),
+            LocalStorage(self._tmp.name),
+            pause_check=self.paused.is_set,
+            throttle=Throttle(0),
+            media_session=_Session(self._pause),
+            concurrency=self.controller,
+        )
+
+    def tearDown(self):
+        self.runner.close()
+        self._tmp.cleanup()
+
+    def _pause(self):
+        self.paused.set()
+        threading.Timer(PAUSE, self.paused.clear).start()
+
+    def _download(self, index, name):
+        transfer = _Transfer(index, f'A{index}', 'photo', f'https://example.invalid/{name}', name)
+        self.runner.attempt(transfer)
+        self.runner.finish()
+        return transfer
+
+    def test_pause_is_not_counted_as_latency(self):
+        for index in range(3):
+            self._download(index, f'{index}.jpg')
+        transfer = self._download(3, 'paused.jpg')
+
+        self.assertEqual(self.runner.summary.downloaded, 4)
+        self.assertGreaterEqual(transfer.paused, PAUSE)
+        self.assertLess(transfer.seconds, PAUSE)
+        self.assertEqual(self.controller.limit, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
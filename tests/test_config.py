@@ -0,0 +1,32 @@
+"""Tests for aura.config."""
+
+import configparser
+import unittest
+
+from aura.config import get_login_credentials
+from aura.exceptions import ConfigError
+
+
+def _config(**account):
+    config = configparser.ConfigParser()
+    config['login'] = {'email': 'me@example.com', 'password': 'secret', **account}
+    return config
+
+
+class LoginCredentialsTest(unittest.TestCase):
+
+    def test_delay_defaults_to_unset(self):
+        self.assertIsNone(get_login_credentials(_config())['delay'])
+
+    def test_delay_is_read_in_seconds(self):
+        self.assertEqual(get_login_credentials(_config(delay='0.5'))['delay'], 0.5)
+        self.assertEqual(get_login_credentials(_config(delay='0'))['delay'], 0)
+
+    def test_malformed_delay_is_a_config_error(self):
+        for delay in ('-1', 'soon', 'nan'):
+            with self.assertRaises(ConfigError):
+                get_login_credentials(_config(delay=delay))
+
+
+if __name__ == '__main__':
+    unittest.main()
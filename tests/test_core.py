@@ -0,0 +1,203 @@
+"""Tests for aura.core."""
+
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import requests
+
+from aura.core import FrameJob, _download_to_file, _run_transfers, _Transfer, _TransferRunner, download_frames
+from aura.exceptions import DownloadError
+from aura.journal import FailureJournal
+from aura.storage import PARTIAL_SUFFIX, LocalStorage
+from aura.summary import DownloadSummary
+from aura.throttle import Throttle
+from aura.writer import DiskWriter
+
+BODY = b'0123456789abcdef'
+
+
+class _Response:
+
+    def __init__(self, status_code=200, data=b'photo', headers=None, on_read=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.raw = self
+        self._data = data
+        self._on_read = on_read
+
+    def read(self, amt=None):
+        # A few bytes at a time, so a transfer can be paused mid-body
+        data, self._data = self._data[:4], self._data[4:]
+        if data and self._on_read:
+            self._on_read()
+        return data
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error")
+
+    def close(self):
+        pass
+
+
+class _Session:
+
+    def get(self, url, stream=False, timeout=None, headers=None):
+        return _Response()
+
+    def close(self):
+        pass
+
+
+class _RangeServer:
+    """Serves one object, honouring Range and If-Range like an HTTP server."""
+
+    def __init__(self, body=BODY, etag=None, wrong_start=False, on_read=None):
+        self.body = body
+        self.etag = etag
+        self.wrong_start = wrong_start
+        self.on_read = on_read
+        self.requests = []
+
+    def get(self, url, stream=False, timeout=None, headers=None):
+        headers = dict(headers or {})
+        self.requests.append(headers)
+        size = len(self.body)
+        validators = {'ETag': self.etag} if self.etag else {}
+        if 'Range' not in headers or headers.get('If-Range', self.etag) != self.etag:
+            return _Response(200, self.body, validators, self.on_read)
+        start = int(headers['Range'][len('bytes='):-1])
+        if start >= size:
+            return _Response(416, b'', {'Content-Range': f'bytes */{size}'})
+        if self.wrong_start:
+            start = 0
+        return _Response(
+            206, self.body[start:], {'Content-Range': f'bytes {start}-{size - 1}/{size}', **validators}, self.on_read,
+        )
+
+
+def _job(name, account):
+    return FrameJob(name, account, f'{account}@example.com', 'secret', name, f'/tmp/{name}')
+
+
+class SyncAccountErrorTest(unittest.TestCase):
+
+    def test_unexpected_error_only_stops_its_frame(self):
+        summary = DownloadSummary(downloaded=1, total=1)
+
+        def download(frame_id, **options):
+            if frame_id == 'broken':
+                raise OSError("disk full")
+            return summary
+
+        jobs = [_job('broken', 'a'), _job('next', 'a'), _job('other', 'b')]
+        with mock.patch('aura.core.create_session', return_value=_Session()), \
+                mock.patch('aura.core.download_photos_from_aura', side_effect=download), \
+                self.assertLogs('aura.core', 'ERROR'):
+            results = download_frames(jobs)
+
+        self.assertIsInstance(results['broken'], DownloadError)
+        self.assertIn("disk full", str(results['broken']))
+        self.assertIs(results['next'], summary)
+        self.assertIs(results['other'], summary)
+
+
+class RunTransfersTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.runner = _TransferRunner(
+            DownloadSummary(total=2),
+            FailureJournal(os.path.join(self._tmp.name, 'journal.jsonl')),
+            LocalStorage(self._tmp.name),
+            throttle=Throttle(0),
+            media_session=_Session(),
+        )
+
+    def tearDown(self):
+        self.runner.close()
+        self._tmp.cleanup()
+
+    def test_directory_error_fails_only_its_transfer(self):
+        # A file where the directory should go
+        open(os.path.join(self._tmp.name, 'blocked'), 'w').close()
+        transfers = [
+            _Transfer(1, 'A1', 'photo', 'https://example.invalid/1.jpg', 'blocked/1.jpg'),
+            _Transfer(2, 'A2', 'photo', 'https://example.invalid/2.jpg', 'ok/2.jpg'),
+        ]
+        with self.assertLogs('aura.core', 'ERROR'):
+            summary = _run_transfers(self.runner, transfers)
+
+        self.assertEqual(summary.downloaded, 1)
+        self.assertEqual([failure.asset_id for failure in summary.failed], ['A1'])
+        self.assertTrue(os.path.isfile(os.path.join(self._tmp.name, 'ok', '2.jpg')))
+
+
+class ResumeTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.storage = LocalStorage(self._tmp.name)
+        self.writer = DiskWriter()
+
+    def tearDown(self):
+        self.writer.close()
+        self._tmp.cleanup()
+
+    def _partial(self, data):
+        with open(os.path.join(self._tmp.name, 'photo.jpg' + PARTIAL_SUFFIX), 'wb') as f:
+            f.write(data)
+
+    def _download(self, server, pause_check=None):
+        commit = _download_to_file(
+            'https://example.invalid/photo.jpg', self.storage, 'photo.jpg', self.writer,
+            pause_check=pause_check, session=server,
+        )
+        commit.result()
+        with open(os.path.join(self._tmp.name, 'photo.jpg'), 'rb') as f:
+            return f.read()
+
+    def test_resumes_after_the_partial(self):
+        self._partial(BODY[:5])
+        server = _RangeServer()
+        self.assertEqual(self._download(server), BODY)
+        self.assertEqual([request.get('Range') for request in server.requests], ['bytes=5-'])
+
+    def test_range_at_another_offset_starts_over(self):
+        self._partial(BODY[:5])
+        server = _RangeServer(wrong_start=True)
+        self.assertEqual(self._download(server), BODY)
+        self.assertEqual([request.get('Range') for request in server.requests], ['bytes=5-', None])
+
+    def test_complete_partial_is_committed(self):
+        self._partial(BODY)
+        server = _RangeServer()
+        self.assertEqual(self._download(server), BODY)
+        self.assertEqual(len(server.requests), 1)
+
+    def test_oversized_partial_is_fetched_again(self):
+        self._partial(BODY + b'stale')
+        server = _RangeServer()
+        self.assertEqual(self._download(server), BODY)
+        self.assertEqual([request.get('Range') for request in server.requests], [f'bytes={len(BODY) + 5}-', None])
+
+    def test_changed_object_is_fetched_again_after_a_pause(self):
+        paused = threading.Event()
+        server = _RangeServer(etag='"v1"')
+
+        def pause_and_change():
+            if not paused.is_set() and server.etag == '"v1"':
+                paused.set()
+                server.body, server.etag = BODY.upper(), '"v2"'
+                threading.Timer(0.1, paused.clear).start()
+
+        server.on_read = pause_and_change
+        self.assertEqual(self._download(server, paused.is_set), BODY.upper())
+        self.assertEqual(server.requests[1], {'Range': 'bytes=4-', 'If-Range': '"v1"'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+"""Tests for aura.events."""
+
+import io
+import json
+import unittest
+
+from aura import events as ev
+
+
+class _ListSink(ev.EventSink):
+
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event, **fields):
+        self.events.append((event, fields))
+
+
+class EventSinkTest(unittest.TestCase):
+
+    def test_sink_without_emit_cannot_be_created(self):
+        class Incomplete(ev.EventSink):
+            pass
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+    def test_bound_sink_adds_its_context(self):
+        sink = _ListSink()
+        sink.bind(frame_id='f1').emit(ev.SKIP, asset_id='a')
+        self.assertEqual(sink.events, [(ev.SKIP, {'frame_id': 'f1', 'asset_id': 'a'})])
+
+    def test_json_lines(self):
+        stream = io.StringIO()
+        sink = ev.JsonLinesEventSink(stream)
+        sink.emit(ev.LOGIN, account='login', ok=True)
+        sink.emit(ev.SUMMARY, downloaded=1)
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual([(line['event'], line.get('ok')) for line in lines], [(ev.LOGIN, True), (ev.SUMMARY, None)])
+        self.assertIn('time', lines[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+"""Tests for aura.filters."""
+
+import unittest
+
+from aura.exceptions import ConfigError
+from aura.filters import AssetFilter, parse_bound
+
+ASSETS = [
+    {'id': 'apr', 'taken_at': '2024-04-30T23:59:59.000Z', 'user_id': 1, 'file_name': 'a.jpg'},
+    {'id': 'may', 'taken_at': '2024-05-01 00:00:00.000', 'user_id': 2, 'file_name': 'b.jpg'},
+    {'id': 'end', 'taken_at': '2024-05-31T23:59:59.999Z', 'user_id': 1, 'file_name': 'c.jpg'},
+    {'id': 'jun', 'taken_at': '2024-06-01T00:00:00.000Z', 'user_id': 2, 'video_url': 'v', 'video_file_name': 'v.mov'},
+    {'id': 'undated', 'taken_at': None, 'user_id': 1, 'file_name': 'e.jpg'},
+]
+
+
+def _ids(asset_filter):
+    return [item['id'] for item in asset_filter.apply(ASSETS)]
+
+
+class ParseBoundTest(unittest.TestCase):
+
+    def test_prefixes_of_a_timestamp(self):
+        self.assertEqual(parse_bound('2024'), '2024')
+        self.assertEqual(parse_bound('2024-05-31T18'), '2024-05-31 18')
+        self.assertEqual(parse_bound(' 2024-05-31T18:00 '), '2024-05-31 18:00')
+
+    def test_malformed_bound_raises_value_error(self):
+        for text in ('24', '2024-5', '2024/05', 'May 2024', '2024-05-31T1'):
+            with self.assertRaises(ValueError, msg=text):
+                parse_bound(text)
+
+
+class AssetFilterTest(unittest.TestCase):
+
+    def test_until_is_inclusive_at_its_precision(self):
+        self.assertEqual(_ids(AssetFilter(until='2024-05')), ['apr', 'may', 'end'])
+        self.assertEqual(_ids(AssetFilter(until='2024-05-31')), ['apr', 'may', 'end'])
+        self.assertEqual(_ids(AssetFilter(until='2024-05-31T23:59:59')), ['apr', 'may', 'end'])
+        self.assertEqual(_ids(AssetFilter(until='2024-04')), ['apr'])
+
+    def test_since_is_inclusive(self):
+        self.assertEqual(_ids(AssetFilter(since='2024-05-01')), ['may', 'end', 'jun'])
+        self.assertEqual(_ids(AssetFilter(since='2024-05', until='2024-05')), ['may', 'end'])
+
+    def test_other_filters_and_limit(self):
+        self.assertEqual(_ids(AssetFilter(uploaders=['2'])), ['may', 'jun'])
+        self.assertEqual(_ids(AssetFilter(videos_only=True)), ['jun'])
+        self.assertEqual(_ids(AssetFilter(photos_only=True, limit=2)), ['apr', 'may'])
+        self.assertEqual(_ids(AssetFilter(limit=0)), [])
+
+    def test_invalid_filters_raise_config_error(self):
+        for options in ({'since': '2024-5'}, {'limit': -1}, {'photos_only': True, 'videos_only': True}):
+            with self.assertRaises(ConfigError, msg=options):
+                AssetFilter(**options)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""Tests for aura.journal."""
+
+import os
+import tempfile
+import unittest
+
+from aura.journal import FailureJournal
+from aura.summary import FailedTransfer
+
+
+def _failure(asset_id, attempts=1):
+    return FailedTransfer(
+        asset_id=asset_id, component='photo', url=f'https://example.invalid/{asset_id}.jpg',
+        path=f'{asset_id}.jpg', error='HTTPError', message='404', attempts=attempts,
+    )
+
+
+class FailureJournalTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, 'journal.jsonl')
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _lines(self):
+        with open(self.path, 'r') as f:
+            return f.read().splitlines()
+
+    def test_records_are_appended(self):
+        journal = FailureJournal(self.path)
+        for index in range(5):
+            journal.record(_failure(f'a{index}'))
+        journal.record(_failure('a0', attempts=2))
+        journal.resolve('a1', 'photo')
+        self.assertEqual(len(self._lines()), 7)
+
+        reloaded = FailureJournal(self.path)
+        self.assertEqual([entry.asset_id for entry in reloaded.entries()], ['a2', 'a3', 'a4', 'a0'])
+        self.assertEqual(reloaded.entries()[-1].attempts, 3)
+
+    def test_compact(self):
+        journal = FailureJournal(self.path)
+        for index in range(3):
+            journal.record(_failure(f'a{index}'))
+        journal.resolve('a0', 'photo')
+        journal.compact()
+        self.assertEqual(len(self._lines()), 2)
+        self.assertEqual(len(FailureJournal(self.path)), 2)
+
+    def test_resolving_the_last_entry_removes_the_file(self):
+        journal = FailureJournal(self.path)
+        journal.record(_failure('a0'))
+        journal.resolve('a0', 'photo')
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_torn_last_line_is_skipped(self):
+        journal = FailureJournal(self.path)
+        journal.record(_failure('a0'))
+        with open(self.path, 'a') as f:
+            f.write('{"asset_id": "a1", "comp')
+        self.assertEqual([entry.asset_id for entry in FailureJournal(self.path).entries()], ['a0'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+"""Tests for aura.layout."""
+
+import os
+import tempfile
+import unittest
+
+from aura.layout import HASH, YEAR, asset_filename, asset_key, migrate_layout, parse_filename
+from aura.storage import LocalStorage
+
+
+class ParseFilenameTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        name = asset_filename('2024-05-01 10-00-00.000', 'abc-123', 'photo.jpg')
+        self.assertEqual(parse_filename(name), ('2024-05-01 10-00-00.000', 'abc-123'))
+
+    def test_foreign_names(self):
+        for name in ('IMG_1234.JPG', 'holiday_photo.jpg', '2024-05-01_.jpg', 'notes.txt'):
+            self.assertIsNone(parse_filename(name), name)
+
+
+class MigrateLayoutTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        self.storage = LocalStorage(self.root)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _touch(self, key):
+        path = os.path.join(self.root, *key.split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(key)
+
+    def test_foreign_files_stay_in_place(self):
+        downloaded = asset_filename('2024-05-01 10-00-00.000', 'abc-123', 'photo.jpg')
+        self._touch(downloaded)
+        self._touch('IMG_1234.JPG')
+
+        for layout in (HASH, YEAR):
+            moved, _ = migrate_layout(self.storage, layout)
+            self.assertEqual(moved, 1)
+            self.assertTrue(self.storage.exists('IMG_1234.JPG'))
+            self.assertTrue(self.storage.exists(asset_key(layout, '2024-05-01 10-00-00.000', 'abc-123', downloaded)))
+        self.assertEqual(sorted(os.listdir(self.root)), ['2024', 'IMG_1234.JPG'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,18 @@
+"""Tests for aura.postprocess."""
+
+import unittest
+
+from aura.exceptions import ConfigError
+from aura.postprocess import PostProcessor
+
+
+class PostProcessorTest(unittest.TestCase):
+
+    def test_workers_must_be_positive(self):
+        for workers in (0, -1):
+            with self.assertRaises(ConfigError):
+                PostProcessor([], max_workers=workers)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+"""Tests for aura.retry."""
+
+import time
+import unittest
+
+from aura.retry import CircuitBreaker
+
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    def _open_breaker(self):
+        breaker = CircuitBreaker('host', failure_threshold=2, reset_timeout=0.01)
+        breaker.record_failure()
+        breaker.record_failure()
+        self.assertTrue(breaker.is_open)
+        self.assertFalse(breaker.allow())
+        time.sleep(0.02)
+        return breaker
+
+    def test_half_open_allows_a_single_trial(self):
+        breaker = self._open_breaker()
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        self.assertFalse(breaker.allow())
+
+        breaker.record_success(trial=True)
+        self.assertFalse(breaker.is_open)
+        self.assertTrue(breaker.allow())
+        self.assertTrue(breaker.allow())
+
+    def test_failed_trial_reopens_with_a_longer_timeout(self):
+        breaker = self._open_breaker()
+        self.assertTrue(breaker.allow())
+        breaker.record_failure(trial=True)
+        self.assertTrue(breaker.is_open)
+        self.assertAlmostEqual(breaker.remaining(), 0.02, delta=0.01)
+        self.assertFalse(breaker.allow())
+
+    def test_stale_failures_dont_end_the_trial(self):
+        breaker = self._open_breaker()
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertFalse(breaker.allow())
+        breaker.record_success(trial=True)
+        self.assertTrue(breaker.allow())
+
+
+if __name__ == '__main__':
+    unittest.main()
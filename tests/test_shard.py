@@ -0,0 +1,38 @@
+"""Tests for aura.shard."""
+
+import unittest
+
+from aura.shard import asset_in_shard, format_shard, parse_shard
+
+
+class ParseShardTest(unittest.TestCase):
+
+    def test_parses_index_and_count(self):
+        self.assertEqual(parse_shard('2/4'), (2, 4))
+        self.assertEqual(format_shard(parse_shard('1/1')), '1/1')
+
+    def test_malformed_shard_raises_value_error(self):
+        for text in ('2', '0/4', '5/4', '1/0', '-1/4', 'a/4', '1/b', '', '/'):
+            with self.assertRaises(ValueError, msg=text):
+                parse_shard(text)
+
+
+class AssetInShardTest(unittest.TestCase):
+
+    def test_assignment_is_a_stable_sha1_split(self):
+        # Fixed by the first 8 bytes of sha1(asset id), so every machine and release agrees
+        self.assertTrue(asset_in_shard('asset-1', (3, 3)))
+        self.assertTrue(asset_in_shard('asset-2', (2, 3)))
+        self.assertTrue(asset_in_shard('asset-3', (3, 3)))
+        self.assertFalse(asset_in_shard('asset-1', (1, 3)))
+
+    def test_every_asset_lands_in_exactly_one_shard(self):
+        for count in (1, 2, 3, 7):
+            for number in range(200):
+                asset_id = f'asset-{number}'
+                owners = [index for index in range(1, count + 1) if asset_in_shard(asset_id, (index, count))]
+                self.assertEqual(len(owners), 1, (asset_id, count))
+
+
+if __name__ == '__main__':
+    unittest.main()
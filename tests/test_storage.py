@@ -0,0 +1,132 @@
+"""Tests for aura.storage."""
+
+import unittest
+from unittest import mock
+
+from aura import storage
+from aura.storage import ExistingIndex, S3Storage, Sink, StorageBackend
+from aura.writer import DiskWriter
+
+
+class _Paginator:
+
+    def __init__(self, client):
+        self._client = client
+
+    def paginate(self, Bucket, Prefix='', Delimiter=None):
+        self._client.calls.append(('list', Prefix, Delimiter))
+        keys = sorted(key for key in self._client.objects if key.startswith(Prefix))
+        if Delimiter:
+            keys = [key for key in keys if Delimiter not in key[len(Prefix):]]
+        # Two pages, as S3 returns long listings
+        middle = len(keys) // 2
+        yield {'Contents': [{'Key': key} for key in keys[:middle]]}
+        yield {'Contents': [{'Key': key} for key in keys[middle:]]}
+
+
+class _Client:
+    """The part of boto3's S3 client S3Storage uses, keeping objects in memory."""
+
+    def __init__(self, fail_part=None):
+        self.objects = {}
+        self.calls = []
+        self._fail_part = fail_part
+        self._uploads = {}
+
+    def get_paginator(self, name):
+        return _Paginator(self)
+
+    def put_object(self, Bucket, Key, Body):
+        self.calls.append(('put', Key, len(Body)))
+        self.objects[Key] = Body
+
+    def create_multipart_upload(self, Bucket, Key):
+        self.calls.append(('create', Key))
+        self._uploads['upload-1'] = {}
+        return {'UploadId': 'upload-1'}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        if PartNumber == self._fail_part:
+            raise OSError("connection reset")
+        self.calls.append(('part', PartNumber, len(Body)))
+        self._uploads[UploadId][PartNumber] = Body
+        return {'ETag': f'"etag-{PartNumber}"'}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        parts = MultipartUpload['Parts']
+        self.calls.append(('complete', [(part['PartNumber'], part['ETag']) for part in parts]))
+        uploaded = self._uploads.pop(UploadId)
+        self.objects[Key] = b''.join(uploaded[part['PartNumber']] for part in parts)
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.calls.append(('abort', UploadId))
+        self._uploads.pop(UploadId, None)
+
+
+@mock.patch.object(storage, 'S3_PART_SIZE', 10)
+class S3StorageTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = _Client()
+        self.storage = S3Storage('s3://bucket/frames/mine', client=self.client)
+
+    def _upload(self, chunks):
+        with DiskWriter() as writer:
+            handle = writer.open(self.storage, '2024/photo.jpg')
+            for chunk in chunks:
+                handle.write(chunk)
+            return handle.commit().exception(5)
+
+    def test_small_object_is_one_put(self):
+        self.assertIsNone(self._upload([b'abc', b'def']))
+        self.assertEqual(self.client.calls, [('put', 'frames/mine/2024/photo.jpg', 6)])
+
+    def test_large_object_is_uploaded_in_numbered_parts(self):
+        chunks = [bytes([n]) * 4 for n in range(7)]
+        self.assertIsNone(self._upload(chunks))
+        self.assertEqual(self.client.calls, [
+            ('create', 'frames/mine/2024/photo.jpg'),
+            # Parts are flushed once at least S3_PART_SIZE bytes are buffered
+            ('part', 1, 12), ('part', 2, 12),
+            # The short remainder goes in the final part
+            ('part', 3, 4),
+            ('complete', [(1, '"etag-1"'), (2, '"etag-2"'), (3, '"etag-3"')]),
+        ])
+        self.assertEqual(self.client.objects['frames/mine/2024/photo.jpg'], b''.join(chunks))
+
+    def test_failed_part_aborts_the_upload(self):
+        self.client = _Client(fail_part=2)
+        self.storage = S3Storage('s3://bucket/frames/mine', client=self.client)
+        self.assertIsInstance(self._upload([b'x' * 12, b'y' * 12, b'z' * 4]), OSError)
+        self.assertEqual(self.client.calls[-1], ('abort', 'upload-1'))
+        self.assertNotIn('frames/mine/2024/photo.jpg', self.client.objects)
+
+    def test_existing_keys_come_from_one_listing_per_directory(self):
+        for key in ('2024/a.jpg', '2024/b.jpg', '2024/deeper/c.jpg', '2023/d.jpg'):
+            self.client.objects['frames/mine/' + key] = b'x'
+        index = ExistingIndex(self.storage)
+
+        self.assertIn('2024/a.jpg', index)
+        self.assertIn('2024/b.jpg', index)
+        # Objects in subdirectories aren't part of their parent's listing
+        self.assertNotIn('2024/c.jpg', index)
+        self.assertEqual(self.client.calls, [('list', 'frames/mine/2024/', '/')])
+        self.assertIn('2024/deeper/c.jpg', index)
+        self.assertEqual(len(self.client.calls), 2)
+
+
+class StorageBackendTest(unittest.TestCase):
+
+    def test_incomplete_backend_cannot_be_created(self):
+        class Incomplete(StorageBackend):
+            def exists(self, key):
+                return False
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+        with self.assertRaises(TypeError):
+            Sink()
+
+
+if __name__ == '__main__':
+    unittest.main()
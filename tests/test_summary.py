@@ -0,0 +1,42 @@
+"""Tests for aura.summary."""
+
+import unittest
+
+from aura.summary import DownloadSummary, Estimate
+
+
+class MergeTest(unittest.TestCase):
+
+    def test_counts_and_shards_are_combined(self):
+        merged = DownloadSummary.merge([
+            DownloadSummary(downloaded=2, skipped=1, total=3, shards=['1/2']),
+            DownloadSummary(downloaded=1, skipped=0, total=1, shards=['2/2']),
+        ])
+        self.assertEqual(tuple(merged), (3, 1, 4))
+        self.assertEqual(merged.shards, ['1/2', '2/2'])
+        self.assertIsNone(merged.estimate)
+
+    def test_estimates_are_combined(self):
+        merged = DownloadSummary.merge([
+            DownloadSummary(estimate=Estimate(
+                files=2, bytes=300, by_type={'photo': 300}, by_year={'2023': 300},
+                free_bytes=1000, throughput=10.0, seconds=30.0,
+            )),
+            DownloadSummary(),
+            DownloadSummary(estimate=Estimate(
+                files=1, bytes=100, unknown=1, by_type={'video': 100}, by_year={'2024': 100},
+                free_bytes=500, throughput=5.0, seconds=20.0,
+            )),
+        ])
+        self.assertEqual(merged.estimate, Estimate(
+            files=3, bytes=400, unknown=1, by_type={'photo': 300, 'video': 100}, by_year={'2023': 300, '2024': 100},
+            free_bytes=500, throughput=15.0, seconds=30.0,
+        ))
+
+    def test_estimate_survives_the_json_round_trip(self):
+        summary = DownloadSummary(total=1, estimate=Estimate(files=1, bytes=10))
+        self.assertEqual(DownloadSummary.from_dict(summary.to_dict()), summary)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+"""Tests for aura.transport."""
+
+import asyncio
+import socket
+import threading
+import unittest
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from aura.transport import HTTP2, Http2Adapter, new_session
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config
+except ImportError:
+    serve = None
+
+BODY = b'0123456789' * 1000
+
+
+def _handler(request):
+    if request.url.path == '/missing':
+        return httpx.Response(404, content=b'not found')
+    if request.url.path == '/down':
+        raise httpx.ConnectError("connection refused", request=request)
+    body = b'' if request.method == 'HEAD' else BODY
+    # A stream rather than content=, which MockTransport reads up front
+    return httpx.Response(200, headers={'Content-Length': str(len(BODY))}, stream=httpx.ByteStream(body))
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class Http2AdapterTest(unittest.TestCase):
+
+    def setUp(self):
+        client = httpx.AsyncClient(http2=True, transport=httpx.MockTransport(_handler))
+        self.adapter = Http2Adapter(client)
+        self.session = requests.Session()
+        self.session.mount('https://', self.adapter)
+
+    def tearDown(self):
+        self.session.close()
+
+    def test_streamed_get(self):
+        response = self.session.get('https://frame.invalid/photo.jpg', stream=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.raw.read(100), BODY[:100])
+        self.assertEqual(response.raw.read(), BODY[100:])
+        self.assertEqual(response.raw.read(), b'')
+        response.close()
+
+    def test_content(self):
+        self.assertEqual(self.session.get('https://frame.invalid/photo.jpg').content, BODY)
+
+    def test_head(self):
+        response = self.session.head('https://frame.invalid/photo.jpg')
+        self.assertEqual(response.headers['content-length'], str(len(BODY)))
+        self.assertEqual(response.raw.read(), b'')
+
+    def test_raise_for_status(self):
+        response = self.session.get('https://frame.invalid/missing')
+        self.assertEqual(response.status_code, 404)
+        with self.assertRaises(requests.HTTPError):
+            response.raise_for_status()
+
+    def test_connect_error_is_a_requests_connection_error(self):
+        with self.assertRaises(requests.ConnectionError):
+            self.session.get('https://frame.invalid/down')
+
+    def test_close_stops_the_loop_thread(self):
+        self.adapter.close()
+        self.assertFalse(self.adapter._thread.is_alive())
+
+
+async def _app(scope, receive, send):
+    if scope['type'] != 'http':
+        return
+    body = scope['http_version'].encode()
+    await send({'type': 'http.response.start', 'status': 200,
+                'headers': [(b'content-length', str(len(body)).encode())]})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+@unittest.skipIf(httpx is None or serve is None, "httpx and hypercorn are not installed")
+class Http2ServerTest(unittest.TestCase):
+    """The adapter against a local HTTP/2 stand-in server (cleartext, prior knowledge)."""
+
+    def setUp(self):
+        with socket.socket() as probe:
+            probe.bind(('127.0.0.1', 0))
+            self.port = probe.getsockname()[1]
+        config = Config()
+        config.bind = [f'127.0.0.1:{self.port}']
+        config.loglevel = 'WARNING'
+        self._loop = asyncio.new_event_loop()
+        self._stopped = asyncio.Event()
+        self._server = threading.Thread(
+            target=self._loop.run_until_complete,
+            args=(serve(_app, config, shutdown_trigger=self._stopped.wait),),
+            daemon=True,
+        )
+        self._server.start()
+        for _ in range(50):
+            try:
+                socket.create_connection(('127.0.0.1', self.port), timeout=0.1).close()
+                break
+            except OSError:
+                threading.Event().wait(0.1)
+
+    def tearDown(self):
+        self._loop.call_soon_threadsafe(self._stopped.set)
+        self._server.join(5)
+
+    def test_requests_are_multiplexed_over_http2(self):
+        session = requests.Session()
+        session.mount('http://', Http2Adapter(httpx.AsyncClient(http1=False, http2=True)))
+        try:
+            responses = [session.get(f'http://127.0.0.1:{self.port}/{i}.jpg') for i in range(3)]
+        finally:
+            session.close()
+        self.assertEqual([response.text for response in responses], ['2'] * 3)
+
+
+class NewSessionTest(unittest.TestCase):
+
+    def test_requests_transport_is_the_default(self):
+        session = new_session()
+        self.assertIsInstance(session.get_adapter('https://frame.invalid/'), HTTPAdapter)
+        session.close()
+
+    @unittest.skipIf(httpx is None, "httpx is not installed")
+    def test_http2_mounts_the_adapter(self):
+        session = new_session(HTTP2)
+        self.assertIsInstance(session.get_adapter('https://frame.invalid/'), Http2Adapter)
+        session.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
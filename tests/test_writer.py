@@ -0,0 +1,122 @@
+"""Tests for aura.writer."""
+
+import threading
+import time
+import unittest
+
+from aura.writer import FSYNC_BATCH, FSYNC_FILE, FSYNC_NONE, DiskWriter
+
+
+class _Sink:
+
+    def __init__(self, backend, key):
+        self._backend = backend
+        self._key = key
+
+    def write(self, chunk):
+        self._backend.gate.wait()
+        if self._backend.fail_writes:
+            raise OSError("disk full")
+        self._backend.calls.append(('write', self._key, chunk))
+
+    def sync(self):
+        self._backend.calls.append(('sync', self._key))
+
+    def commit(self):
+        self._backend.calls.append(('commit', self._key))
+
+    def abort(self):
+        self._backend.calls.append(('abort', self._key))
+
+
+class _Backend:
+    """Records what the writer does to each object, in order."""
+
+    def __init__(self):
+        self.calls = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.fail_writes = False
+
+    def open_sink(self, key, offset=0):
+        self.calls.append(('open', key, offset))
+        return _Sink(self, key)
+
+    def sync_directories(self, keys):
+        self.calls.append(('sync_directories', sorted(keys)))
+
+
+class DiskWriterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.backend = _Backend()
+
+    def _write(self, writer, key, data=b'data'):
+        handle = writer.open(self.backend, key)
+        handle.write(data)
+        return handle.commit()
+
+    def test_writer_blocks_when_the_buffer_is_full(self):
+        self.backend.gate.clear()
+        with DiskWriter(max_buffered_bytes=10) as writer:
+            handle = writer.open(self.backend, 'a.jpg')
+            handle.write(b'x' * 8)
+            producer = threading.Thread(target=handle.write, args=(b'y' * 8,))
+            producer.start()
+            producer.join(0.2)
+            self.assertTrue(producer.is_alive())
+
+            self.backend.gate.set()
+            producer.join(5)
+            self.assertFalse(producer.is_alive())
+            self.assertEqual(handle.commit().result(5), 16)
+
+    def test_none_never_syncs(self):
+        with DiskWriter(fsync=FSYNC_NONE) as writer:
+            self._write(writer, 'a.jpg').result(5)
+        self.assertEqual(
+            self.backend.calls,
+            [('open', 'a.jpg', 0), ('write', 'a.jpg', b'data'), ('commit', 'a.jpg')],
+        )
+
+    def test_file_syncs_each_file_before_publishing_it(self):
+        with DiskWriter(fsync=FSYNC_FILE) as writer:
+            self._write(writer, 'a.jpg').result(5)
+        self.assertEqual(self.backend.calls[2:], [
+            ('sync', 'a.jpg'), ('commit', 'a.jpg'), ('sync_directories', ['a.jpg']),
+        ])
+
+    def test_batch_syncs_once_the_batch_is_full(self):
+        with DiskWriter(fsync=FSYNC_BATCH, batch_files=2, batch_interval=60) as writer:
+            first = self._write(writer, 'a.jpg')
+            time.sleep(0.1)
+            self.assertFalse(first.done())
+            second = self._write(writer, 'b.jpg')
+            self.assertEqual((first.result(5), second.result(5)), (4, 4))
+        syncs = [call for call in self.backend.calls if call[0] in ('sync', 'commit', 'sync_directories')]
+        self.assertEqual(syncs, [
+            ('sync', 'a.jpg'), ('commit', 'a.jpg'), ('sync', 'b.jpg'), ('commit', 'b.jpg'),
+            ('sync_directories', ['a.jpg', 'b.jpg']),
+        ])
+
+    def test_batch_syncs_after_the_interval(self):
+        with DiskWriter(fsync=FSYNC_BATCH, batch_files=32, batch_interval=0.05) as writer:
+            self.assertEqual(self._write(writer, 'a.jpg').result(5), 4)
+        self.assertIn(('sync', 'a.jpg'), self.backend.calls)
+
+    def test_write_error_reaches_the_caller(self):
+        self.backend.fail_writes = True
+        with DiskWriter() as writer:
+            handle = writer.open(self.backend, 'a.jpg')
+            handle.write(b'data')
+            error = handle.close().exception(5)
+            self.assertIsInstance(error, OSError)
+            with self.assertRaises(OSError):
+                handle.write(b'more')
+            self.assertIsInstance(handle.commit().exception(5), OSError)
+        self.assertIn(('abort', 'a.jpg'), self.backend.calls)
+        self.assertNotIn(('commit', 'a.jpg'), self.backend.calls)
+
+
+if __name__ == '__main__':
+    unittest.main()